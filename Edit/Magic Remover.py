@@ -6,6 +6,8 @@ from GlyphsApp import Glyphs, GSNode, GSAnchor, GSHint, GSComponent
 from AppKit import NSEvent, NSEventModifierFlagCommand
 from operator import itemgetter
 
+COMPARE_STRINGS_KEY = "MagicRemoverCompareStrings"
+
 
 def hintID(h):
     return (h.name, h.origin, h.target, h.other1, h.other2)
@@ -18,6 +20,96 @@ def backupAllLayersOfGlyph(glyph):
             layer.background = layer.background.copyDecomposedLayer()
 
 
+def cachedCompareString(font, layer):
+    """compareString() of a layer, cached in the font until its glyph is edited."""
+    cache = font.tempData[COMPARE_STRINGS_KEY]
+    if cache is None:
+        cache = {}
+        font.tempData[COMPARE_STRINGS_KEY] = cache
+    key = (layer.parent.name, layer.layerId)
+    stamp = layer.parent.lastChange
+    if key not in cache or cache[key][0] != stamp:
+        cache[key] = (stamp, layer.compareString())
+    return cache[key][1]
+
+
+def collectSelectedItems(layer):
+    """Index paths of the selected nodes, names of the selected anchors,
+    indexes of the selected components and IDs of the selected corner hints."""
+    pathNodeIndexes = []
+    anchorNames = []
+    componentIndexes = []
+    hintIDs = set()
+
+    for thisItem in layer.selection:
+        if isinstance(thisItem, GSNode):
+            pathNodeIndexes.append(
+                layer.indexPathOfNode_(thisItem)
+            )
+        elif isinstance(thisItem, GSAnchor):
+            anchorNames.append(
+                thisItem.name
+            )
+        elif isinstance(thisItem, GSComponent):
+            componentIndexes.append(
+                thisItem.elementIndex()
+            )
+        elif isinstance(thisItem, GSHint):
+            if thisItem.isCorner:
+                hintIDs.add(
+                    hintID(thisItem)
+                )
+
+    # reverse-sort path and node indexes
+    # so deletion of nodes does not mess with the indexes of the next node to be deleted
+    pathNodeIndexes = sorted(
+        pathNodeIndexes,
+        key=itemgetter(0, 1),
+        reverse=True,
+    )
+    return pathNodeIndexes, anchorNames, sorted(componentIndexes, reverse=True), hintIDs
+
+
+def removeItemsOnLayers(thisGlyph, layers, pathNodeIndexes, anchorNames, componentIndexes, hintIDs):
+    thisGlyph.beginUndo()  # begin undo grouping
+    removePaths = list()
+    for thisLayer in layers:
+        removeNodes = [thisLayer.nodeAtIndexPath_(pathNodeIndex) for pathNodeIndex in pathNodeIndexes]
+        if len(removeNodes) == 1:
+            node = removeNodes[0]
+            path = node.parent
+            path.removeNodeCheckKeepShape_normalizeHandles_(node, True)
+            if len(path) == 0:
+                removePaths.append(path)
+        else:
+            for node in removeNodes:
+                path = node.parent
+                # can be removed already, also implicitly as a handle of a removed node
+                if path is None or node not in path.nodes:
+                    continue
+                path.removeNodeCheckKeepShape_normalizeHandles_(node, True)
+                if len(path.nodes) == 0:
+                    removePaths.append(path)
+        for anchorName in anchorNames:
+            thisLayer.removeAnchorWithName_(anchorName)
+        for componentIndex in componentIndexes:
+            if Glyphs.versionNumber >= 3:
+                # GLYPHS 3
+                del thisLayer.shapes[componentIndex]
+            else:
+                # GLYPHS 2
+                del thisLayer.components[componentIndex]
+
+        if hintIDs:
+            for hint in reversed(list(thisLayer.hints)):
+                if hintID(hint) in hintIDs:
+                    thisLayer.removeHint_(hint)
+    for path in removePaths:
+        path.parent.removeShape_(path)
+
+    thisGlyph.endUndo()   # end undo grouping
+
+
 def eraseSelectedItemsOnAllMasters():
     try:
         keysPressed = NSEvent.modifierFlags()
@@ -27,94 +119,40 @@ def eraseSelectedItemsOnAllMasters():
         font = Glyphs.font
         if font:
             # We’re in the Edit View
-            if font.currentTab and len(font.selectedLayers) == 1:
-                currentLayer = font.selectedLayers[0]
-                thisGlyph = currentLayer.parent
-                if shouldBackupFirst:
-                    backupAllLayersOfGlyph(thisGlyph)
+            if font.currentTab and font.selectedLayers:
+                # The layer with the selection is the template, e.g. the active one of several selected glyphs
+                currentLayer = font.currentTab.activeLayer() if len(font.selectedLayers) > 1 else font.selectedLayers[0]
+                if currentLayer is None or not currentLayer.selection:
+                    currentLayer = next((layer for layer in font.selectedLayers if layer.selection), font.selectedLayers[0])
 
                 # collect selected items:
-                pathNodeIndexes = []
-                anchorNames = []
-                componentIndexes = []
-                hintIDs = []
-
-                for thisItem in currentLayer.selection:
-                    if isinstance(thisItem, GSNode):
-                        pathNodeIndexes.append(
-                            currentLayer.indexPathOfNode_(thisItem)
-                        )
-                    elif isinstance(thisItem, GSAnchor):
-                        anchorNames.append(
-                            thisItem.name
-                        )
-                    elif isinstance(thisItem, GSComponent):
-                        componentIndexes.append(
-                            thisItem.elementIndex()
-                        )
-                    elif isinstance(thisItem, GSHint):
-                        if thisItem.isCorner:
-                            hintIDs.append(
-                                hintID(thisItem)
-                            )
-
-                # delete respective items on all (compatible) layers:
-                if pathNodeIndexes or anchorNames or componentIndexes or hintIDs:
+                pathNodeIndexes, anchorNames, componentIndexes, hintIDs = collectSelectedItems(currentLayer)
 
-                    # reverse-sort path and node indexes
-                    # so deletion of nodes does not mess with the indexes of the next node to be deleted
-                    pathNodeIndexes = sorted(
-                        pathNodeIndexes,
-                        key=itemgetter(0, 1),
-                        reverse=True,
-                    )
-
-                    currentCS = currentLayer.compareString()
-                    allCompatibleLayers = [
-                        layer for layer in thisGlyph.layers
-                        if (layer.isMasterLayer or layer.isSpecialLayer)
-                        and (layer.compareString() == currentCS)
-                    ]
-
-                    thisGlyph.beginUndo()  # begin undo grouping
-                    removePaths = list()
-                    for thisLayer in allCompatibleLayers:
-                        removeNodes = list()
-                        for pathNodeIndex in pathNodeIndexes:
-                            node = thisLayer.nodeAtIndexPath_(pathNodeIndex)
-                            removeNodes.append(node)
-                        if len(removeNodes) == 1:
-                            node = removeNodes[0]
-                            path = node.parent
-                            path.removeNodeCheckKeepShape_normalizeHandles_(node, True)
-                            if len(path) == 0:
-                                removePaths.append(path)
-                        else:
-                            for node in removeNodes:
-                                path = node.parent
-                                if path is None or node not in path.nodes:  # can be removed already
-                                    continue
-                                path.removeNodeCheckKeepShape_normalizeHandles_(node, True)
-                                if len(path.nodes) == 0:
-                                    removePaths.append(path)
-                        for anchorName in anchorNames:
-                            thisLayer.removeAnchorWithName_(anchorName)
-                        for componentIndex in sorted(componentIndexes, reverse=True):
-                            if Glyphs.versionNumber >= 3:
-                                # GLYPHS 3
-                                del thisLayer.shapes[componentIndex]
-                            else:
-                                # GLYPHS 2
-                                del thisLayer.components[componentIndex]
-
-                        if hintIDs:
-                            for hintIndex in sorted(range(len(thisLayer.hints)), reverse=True):
-                                if hintID(thisLayer.hints[hintIndex]) in hintIDs:
-                                    thisLayer.removeHint_(thisLayer.hints[hintIndex])
-                    for path in removePaths:
-                        path.parent.removeShape_(path)
-
-                    thisGlyph.endUndo()   # end undo grouping
+                # delete respective items on all (compatible) layers of all selected glyphs:
+                if pathNodeIndexes or anchorNames or componentIndexes or hintIDs:
+                    glyphs = []
+                    for layer in font.selectedLayers:
+                        if layer.parent and layer.parent not in glyphs:
+                            glyphs.append(layer.parent)
+
+                    currentCS = cachedCompareString(font, currentLayer)
+                    if len(glyphs) > 1:
+                        font.disableUpdateInterface()
+                    try:
+                        for thisGlyph in glyphs:
+                            allCompatibleLayers = [
+                                layer for layer in thisGlyph.layers
+                                if (layer.isMasterLayer or layer.isSpecialLayer)
+                                and (cachedCompareString(font, layer) == currentCS)
+                            ]
+                            if not allCompatibleLayers:
+                                continue
+                            if shouldBackupFirst:
+                                backupAllLayersOfGlyph(thisGlyph)
+                            removeItemsOnLayers(thisGlyph, allCompatibleLayers, pathNodeIndexes, anchorNames, componentIndexes, hintIDs)
+                    finally:
+                        if len(glyphs) > 1:
+                            font.enableUpdateInterface()
 
     except Exception as e:
         Glyphs.clearLog()  # clears macro window log
@@ -2,11 +2,26 @@
 # -*- coding: utf-8 -*-
 from __future__ import division, print_function, unicode_literals
 import os
+import csv
+import json
+import time
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from vanilla import FloatingWindow, Button
 from GlyphsApp import Glyphs, INSTANCETYPEVARIABLE
+from rbHelpers import replaceIfChanged
+
+try:
+    # Used to compare fonts table by table and to verify the exported files
+    from fontTools.ttLib import TTFont
+except ImportError:
+    TTFont = None
 
 __doc__ = """
 Always export to all formats.
+Writes a timing report (Export Report.json/.csv) into the export folder.
+Only files whose content changed are replaced, atomically; all exported files are verified afterwards, in parallel.
 """
 
 Glyphs.clearLog()
@@ -25,6 +40,10 @@ class ExportToAllFormats:
         self.w.runButton = Button((margin, 10, -margin, 20), "Export All Formats", callback=self.exportFonts)
 
         self.exportPath = self.getFontFilePath()
+        self.timings = []
+        self.folderTimings = []
+        self.writtenFiles = []
+        self.unchangedFiles = 0
 
         self.w.open()
 
@@ -36,11 +55,83 @@ class ExportToAllFormats:
 
     def createSubfolder(self, parentPath, subfolderName):
         """Create subfolder if it doesn't exist."""
+        started = time.perf_counter()
         folderPath = os.path.join(parentPath, subfolderName)
         if not os.path.exists(folderPath):
             os.makedirs(folderPath)
+        self.folderTimings.append({"path": folderPath, "seconds": round(time.perf_counter() - started, 6)})
         return folderPath
 
+    def replaceIfChanged(self, sourcePath, finalPath):
+        """Copy sourcePath over finalPath unless its content is the same, and record the file."""
+        if not replaceIfChanged(finalPath, lambda tempPath: shutil.copyfile(sourcePath, tempPath)):
+            self.unchangedFiles += 1
+        self.writtenFiles.append(finalPath)
+
+    def verifyFile(self, path):
+        """Reopen an exported file and check its table checksums. Returns the problem found, or None."""
+        try:
+            with TTFont(path, checkChecksums=2) as font:
+                font.ensureDecompiled()
+                if font["maxp"].numGlyphs != len(font.getGlyphOrder()):
+                    return f"{os.path.basename(path)}: maxp glyph count does not match the glyph order"
+        except Exception as e:
+            return f"{os.path.basename(path)} did not pass verification: {e}"
+        return None
+
+    def verifyFiles(self):
+        """Verify every exported file, on a thread per CPU (fontTools only). Returns the problems found, in file order."""
+        if not TTFont or not self.writtenFiles:
+            return []
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 2) as pool:
+            return [problem for problem in pool.map(self.verifyFile, self.writtenFiles) if problem]
+
+    def generate(self, instance, FontPath, **options):
+        """Call instance.generate() into a scratch folder, move the changed files into FontPath
+        and record the wall time, output size and options."""
+        started = time.perf_counter()
+        scratchFolder = tempfile.mkdtemp(prefix="ExportToAllFormats-")
+        exportedPaths = []
+        try:
+            result = instance.generate(FontPath=scratchFolder, **options)
+            seconds = time.perf_counter() - started
+            if result is True:
+                for fileName in sorted(os.listdir(scratchFolder)):
+                    exportedPaths.append(os.path.join(FontPath, fileName))
+                    self.replaceIfChanged(os.path.join(scratchFolder, fileName), exportedPaths[-1])
+        finally:
+            shutil.rmtree(scratchFolder, ignore_errors=True)
+
+        self.timings.append({
+            "instance": instance.name,
+            "format": options.get("Format"),
+            "containers": "+".join(options.get("Containers", [])),
+            "removeOverlaps": bool(options.get("RemoveOverlap")),
+            "autohint": bool(options.get("AutoHint")),
+            "result": "ok" if result is True else str(result),
+            "seconds": round(seconds, 4),
+            "bytes": sum(os.path.getsize(path) for path in exportedPaths),
+            "path": FontPath,
+        })
+        return result
+
+    def writeTimingReport(self, totalSeconds):
+        """Write the recorded timings as Export Report.json and Export Report.csv."""
+        reportPath = os.path.join(self.exportPath, "Export Report")
+        report = {
+            "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "totalSeconds": round(totalSeconds, 4),
+            "jobs": self.timings,
+            "subfolders": self.folderTimings,
+        }
+        with open(reportPath + ".json", "w", encoding="utf-8") as reportFile:
+            json.dump(report, reportFile, indent=1)
+        if self.timings:
+            with open(reportPath + ".csv", "w", encoding="utf-8", newline="") as reportFile:
+                writer = csv.DictWriter(reportFile, fieldnames=list(self.timings[0].keys()))
+                writer.writeheader()
+                writer.writerows(self.timings)
+
     def exportFonts(self, sender):
         # Ensure export path is set
         if not self.exportPath:
@@ -56,6 +147,11 @@ class ExportToAllFormats:
             return
 
         useSubfolders = True  # Always use separate subfolders
+        self.timings = []
+        self.folderTimings = []
+        self.writtenFiles = []
+        self.unchangedFiles = 0
+        exportStarted = time.perf_counter()
 
         fontExportPath = self.createSubfolder(self.exportPath, font.familyName)
 
@@ -70,7 +166,19 @@ class ExportToAllFormats:
         variablePathWOFF2 = self.createSubfolder(fontExportPath, "Variable/WOFF2") if useSubfolders else fontExportPath
         self.exportFontInstances(font, "Variable", fontExportPath, useSubfolders, variableOnly=True, variablePaths={"TTF": variablePathTTF, "WOFF": variablePathWOFF, "WOFF2": variablePathWOFF2})
 
-        Glyphs.showNotification("Export Complete", "The font was exported successfully.")
+        totalSeconds = time.perf_counter() - exportStarted
+        self.writeTimingReport(totalSeconds)
+        print(f"Exported in {totalSeconds:.1f} s.")
+        print(f"{len(self.writtenFiles) - self.unchangedFiles} files replaced, {self.unchangedFiles} files unchanged and left in place.")
+
+        problems = self.verifyFiles()
+        for problem in problems:
+            print(problem)
+
+        if problems:
+            Glyphs.showNotification("Export Finished With Errors", f"{len(problems)} files did not pass verification. See Macro window.")
+        else:
+            Glyphs.showNotification("Export Complete", "The font was exported successfully.")
 
     def exportFontInstances(self, font, formatType, exportPath, useSubfolders, woffPath=None, woff2Path=None, variableOnly=False, variablePaths=None):
         """Exports the instances of a font in a specific format."""
@@ -85,9 +193,9 @@ class ExportToAllFormats:
                     continue
                 # Export Variable as TTF, WOFF, and WOFF2
                 if variablePaths:
-                    instance.generate(Format="TTF", FontPath=variablePaths["TTF"], RemoveOverlap=True, AutoHint=False)
-                    instance.generate(Format="TTF", FontPath=variablePaths["WOFF"], Containers=["WOFF"], RemoveOverlap=True, AutoHint=False)
-                    instance.generate(Format="TTF", FontPath=variablePaths["WOFF2"], Containers=["WOFF2"], RemoveOverlap=True, AutoHint=False)
+                    self.generate(instance, Format="TTF", FontPath=variablePaths["TTF"], RemoveOverlap=True, AutoHint=False)
+                    self.generate(instance, Format="TTF", FontPath=variablePaths["WOFF"], Containers=["WOFF"], RemoveOverlap=True, AutoHint=False)
+                    self.generate(instance, Format="TTF", FontPath=variablePaths["WOFF2"], Containers=["WOFF2"], RemoveOverlap=True, AutoHint=False)
             elif formatType != "Variable" and instance.type == INSTANCETYPEVARIABLE:
                 continue
 
@@ -97,18 +205,18 @@ class ExportToAllFormats:
 
             # Export logic based on format type
             if formatType == "OTF":
-                instance.generate(Format="OTF", FontPath=instancePath, RemoveOverlap=True, AutoHint=False)
+                self.generate(instance, Format="OTF", FontPath=instancePath, RemoveOverlap=True, AutoHint=False)
             elif formatType == "TTF":
-                instance.generate(Format="TTF", FontPath=instancePath, RemoveOverlap=True, AutoHint=False)
+                self.generate(instance, Format="TTF", FontPath=instancePath, RemoveOverlap=True, AutoHint=False)
             elif formatType == "WEB":
                 # Export WOFF
                 if woffPath:
-                    instance.generate(Format="TTF", FontPath=woffPath, Containers=["WOFF"], RemoveOverlap=True, AutoHint=False)
+                    self.generate(instance, Format="TTF", FontPath=woffPath, Containers=["WOFF"], RemoveOverlap=True, AutoHint=False)
                 # Export WOFF2
                 if woff2Path:
-                    instance.generate(Format="TTF", FontPath=woff2Path, Containers=["WOFF2"], RemoveOverlap=True, AutoHint=False)
+                    self.generate(instance, Format="TTF", FontPath=woff2Path, Containers=["WOFF2"], RemoveOverlap=True, AutoHint=False)
             elif formatType == "Variable" and not variableOnly:
-                instance.generate(Format="TTF", FontPath=instancePath, RemoveOverlap=True, AutoHint=False)
+                self.generate(instance, Format="TTF", FontPath=instancePath, RemoveOverlap=True, AutoHint=False)
 
 
 # Run the script
@@ -2,22 +2,167 @@
 # -*- coding: utf-8 -*-
 from __future__ import division, print_function, unicode_literals
 import os
-from vanilla import FloatingWindow, CheckBox, Button, TextBox, ProgressBar
-from GlyphsApp import Glyphs, INSTANCETYPEVARIABLE
+import csv
+import json
+import time
+import hashlib
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from PyObjCTools.AppHelper import callAfter
+from vanilla import FloatingWindow, CheckBox, Button, TextBox, EditText, ProgressBar
+from GlyphsApp import Glyphs, GSGlyphsInfo, GSPath, GSNode, INSTANCETYPEVARIABLE
+from rbHelpers import replaceIfChanged
 from vanilla.dialogs import getFolder
 
+try:
+    # Used to wrap one compiled font as WOFF and WOFF2 instead of compiling it three times
+    import brotli  # needed by fontTools to write WOFF2
+    from fontTools.ttLib import TTFont
+    from fontTools.pens.areaPen import AreaPen
+    from fontTools.pens.boundsPen import BoundsPen
+except ImportError:
+    TTFont = None
+
+try:
+    # Used to cut static instances from the compiled variable font
+    from fontTools.varLib.instancer import instantiateVariableFont, OverlapMode
+except ImportError:
+    instantiateVariableFont = None
+
 __doc__ = """
 Export to all formats.
 If “PS outlines” is off, TT outlines will be exported for the web formats.
+With “Parallel jobs” on, the fontTools work of the jobs (WOFF/WOFF2, statics cut from the variable font, subsets, verification)
+runs on a pool of workers while Glyphs generates the next instance; Glyphs itself generates one instance at a time.
+With “Incremental” on, instances whose sources and options did not change since the last export are skipped.
+Every export writes a timing report (Export Report.json/.csv) into the export folder.
+“Benchmark” replays the export into a scratch folder and appends the timings to Export Benchmarks.jsonl.
+With “Statics from variable font” on, static TTF/WOFF/WOFF2 instances are cut from the variable font;
+“Verify” compares them with directly interpolated instances, within the given tolerance in units.
+Instances are generated one after the other on the main thread, the window stays responsive between them;
+“Cancel” stops before the next instance, files of instances already generated are still written.
+With “Cache overlap removal” on, overlaps of every interpolated glyph are removed once and reused by all static formats;
+“on disk” keeps that cache (Overlap Cache.json) in Glyphs’ Application Support folder for the next export.
+With “Subset WOFF2” on, every static WOFF2 is also split into the listed unicode-range profiles,
+together with a CSS file of @font-face rules.
+Files are written next to their destination first and only replace existing files whose content changed.
+With “Verify exported files” on, every written file is reopened and checked after the export.
 """
 
+# Unicode ranges of the usual web font subsets
+UNICODE_RANGE_PROFILES = {
+    "latin": "U+0000-00FF, U+0131, U+0152-0153, U+02BB-02BC, U+02C6, U+02DA, U+02DC, U+0304, U+0308, U+0329, U+2000-206F, U+20AC, U+2122, U+2191, U+2193, U+2212, U+2215, U+FEFF, U+FFFD",
+    "latin-ext": "U+0100-02BA, U+02BD-02C5, U+02C7-02CC, U+02CE-02D7, U+02DD-02FF, U+0304, U+0308, U+0329, U+1D00-1DBF, U+1E00-1E9F, U+1EF2-1EFF, U+2020, U+20A0-20AB, U+20AD-20C0, U+2113, U+2C60-2C7F, U+A720-A7FF",
+    "cyrillic": "U+0301, U+0400-045F, U+0490-0491, U+04B0-04B1, U+2116",
+    "cyrillic-ext": "U+0460-052F, U+1C80-1C8A, U+20B4, U+2DE0-2DFF, U+A640-A69F, U+FE2E-FE2F",
+    "greek": "U+0370-0377, U+037A-037F, U+0384-038A, U+038C, U+038E-03A1, U+03A3-03FF",
+    "greek-ext": "U+1F00-1FFF",
+    "vietnamese": "U+0102-0103, U+0110-0111, U+0128-0129, U+0168-0169, U+01A0-01A1, U+01AF-01B0, U+0300-0301, U+0303-0304, U+0308-0309, U+0323, U+0329, U+1EA0-1EF9, U+20AB",
+}
+
+# Instance custom parameters the cut statics honor; any other parameter or filter makes the instance export directly
+CUT_STATIC_PARAMETERS = {"Axis Location"}
+
+# CSS font-stretch of each OS/2 usWidthClass (instance.widthClass)
+FONT_STRETCH = {1: "50%", 2: "62.5%", 3: "75%", 4: "87.5%", 5: "100%", 6: "112.5%", 7: "125%", 8: "150%", 9: "200%"}
+
+
+def parseUnicodeRange(unicodeRange):
+    """Code points of a CSS unicode-range string like "U+0000-00FF, U+0131"."""
+    codePoints = set()
+    for part in unicodeRange.split(","):
+        part = part.strip()[2:]
+        start, _, end = part.partition("-")
+        codePoints.update(range(int(start, 16), int(end or start, 16) + 1))
+    return codePoints
+
+
+OVERLAP_CACHE_MAX_POINTS = 5000000  # about 200 MB in memory
+OVERLAP_CHECK_TOLERANCE = 1.0  # units a glyph exported through the overlap cache may differ from the direct export
+
+
+def overlapCachePath():
+    """The on-disk overlap cache, in Glyphs’ Application Support folder (never next to the exported fonts)."""
+    return os.path.join(GSGlyphsInfo.applicationSupportPath(), "Overlap Cache.json")
+
+
+class OverlapCache(object):
+    """LRU cache of overlap-removed, interpolated outlines keyed by (instance, glyph, content hash).
+    Shared by all jobs of one export, optionally loaded from and saved to disk as JSON.
+    The interpolated, overlap-removed font of each instance is also kept (in memory only) until the export finishes,
+    so the formats of one instance interpolate it once (once per outline flavor, CFF decomposes composites)."""
+
+    def __init__(self, path=None, maxPoints=OVERLAP_CACHE_MAX_POINTS):
+        self.path = path
+        self.maxPoints = maxPoints
+        self.entries = OrderedDict()
+        self.instanceFonts = {}  # (instance name, axis location, decomposed): interpolated font with overlaps removed
+        self.checkedFonts = set()  # id() of the fonts whose cached export was compared with a direct export
+        self.points = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as cacheFile:
+                    for key, paths in json.load(cacheFile):
+                        self.put(tuple(key), paths)
+            except (OSError, ValueError, TypeError) as e:
+                print(f"Could not read the overlap cache, starting a new one: {e}")
+            self.hits = self.misses = 0
+
+    def pointCount(self, paths):
+        return sum(len(nodes) for nodes, closed in paths)
+
+    def get(self, key):
+        with self.lock:
+            paths = self.entries.get(key)
+            if paths is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.entries.move_to_end(key)
+            return paths
+
+    def put(self, key, paths):
+        with self.lock:
+            if key in self.entries:
+                self.points -= self.pointCount(self.entries.pop(key))
+            self.entries[key] = paths
+            self.points += self.pointCount(paths)
+
+            # Evict the least recently used outlines
+            while self.points > self.maxPoints and len(self.entries) > 1:
+                evictedKey, evictedPaths = self.entries.popitem(last=False)
+                self.points -= self.pointCount(evictedPaths)
+
+    def save(self):
+        if not self.path:
+            return
+        with self.lock:
+            fileHandle, tempPath = tempfile.mkstemp(prefix=".", suffix=".partial", dir=os.path.dirname(self.path))
+            with os.fdopen(fileHandle, "w", encoding="utf-8") as cacheFile:
+                json.dump(list(self.entries.items()), cacheFile)
+            os.replace(tempPath, self.path)
+
+
 Glyphs.clearLog()
 
 
 class ExportToAllFormats:
     def __init__(self):
+        self.folderTimings = []
+        self.cancelEvent = threading.Event()
+        self.jobDurations = []
+        self.overlapCache = None
+        self.stylesheets = []
+
         # Window settings
-        window_width, window_height = 360, 215
+        window_width, window_height = 360, 415
         margin = 10
 
         # Create the window
@@ -42,9 +187,37 @@ class ExportToAllFormats:
         self.w.removeOverlaps = CheckBox((margin + 90, 100, 150, 20), "Remove overlaps", value=True)
         self.w.psOutlines = CheckBox((margin, 130, 150, 20), "PS Outlines for WEB", value=True)
 
-        # Run button and progress bar
-        self.w.runButton = Button((margin, 160, -margin, 20), "Export", callback=self.exportFonts)
-        self.w.progressBar = ProgressBar((margin + 5, 185, -margin - 5, 20))
+        # Parallel export
+        self.w.parallelJobs = CheckBox((margin, 160, 150, 20), "Parallel jobs", value=False)
+        self.w.workersLabel = TextBox((margin + 180, 162, 60, 20), "Workers:")
+        self.w.workers = EditText((margin + 240, 160, -margin, 20), str(os.cpu_count() or 2))
+
+        # Incremental export
+        self.w.incremental = CheckBox((margin, 190, 200, 20), "Incremental (skip unchanged)", value=False)
+
+        # Static instances from the variable font
+        self.w.staticsFromVariable = CheckBox((margin, 220, 200, 20), "Statics from variable font", value=False)
+        self.w.verifyStatics = CheckBox((margin + 200, 220, 70, 20), "Verify", value=False)
+        self.w.verifyTolerance = EditText((margin + 270, 220, -margin, 20), "1")
+
+        # Overlap removal cache
+        self.w.cacheOverlaps = CheckBox((margin, 250, 200, 20), "Cache overlap removal", value=False)
+        self.w.cacheOverlapsOnDisk = CheckBox((margin + 200, 250, -margin, 20), "on disk", value=False)
+
+        # Web font subsets
+        self.w.subsetWeb = CheckBox((margin, 280, 120, 20), "Subset WOFF2:", value=False)
+        self.w.subsetProfiles = EditText((margin + 120, 280, -margin, 20), "latin, latin-ext")
+
+        # Post-export verification
+        self.w.verifyFiles = CheckBox((margin, 310, 200, 20), "Verify exported files", value=True)
+
+        # Run, benchmark and cancel buttons, progress bar and status
+        self.w.runButton = Button((margin, 340, -220 - margin, 20), "Export", callback=self.exportFonts)
+        self.w.benchmarkButton = Button((-210 - margin, 340, -110 - margin, 20), "Benchmark", callback=self.benchmarkExport)
+        self.w.cancelButton = Button((-100 - margin, 340, -margin, 20), "Cancel", callback=self.cancelExport)
+        self.w.cancelButton.enable(False)
+        self.w.progressBar = ProgressBar((margin + 5, 365, -margin - 5, 20))
+        self.w.status = TextBox((margin + 5, 390, -margin - 5, 17), "", sizeStyle="small")
 
         # Set the export path to the font file location on initialization
         self.exportPath = self.getFontFilePath()
@@ -69,11 +242,18 @@ class ExportToAllFormats:
 
     def createSubfolder(self, parentPath, subfolderName):
         """Create subfolder if it doesn't exist."""
+        started = time.perf_counter()
         folderPath = os.path.join(parentPath, subfolderName)
         if not os.path.exists(folderPath):
             os.makedirs(folderPath)
+        self.folderTimings.append({"path": folderPath, "seconds": time.perf_counter() - started})
         return folderPath
 
+    def getExportFonts(self):
+        """Fonts to export: the current font, or all open fonts."""
+        fonts = Glyphs.fonts if self.w.exportAllFonts.get() else [Glyphs.font]
+        return [font for font in fonts if font]
+
     def exportFonts(self, sender):
         # Ensure export path is set
         if not self.exportPath:
@@ -83,11 +263,218 @@ class ExportToAllFormats:
         print(f"Exporting to path: {self.exportPath}")
 
         # Get selected fonts
-        fonts = Glyphs.fonts if self.w.exportAllFonts.get() else [Glyphs.font]
+        fonts = self.getExportFonts()
+        if not fonts:
+            print("No fonts available for export.")
+            return
+
+        self.startExport(fonts, self.exportPath, self.w.incremental.get(), self.exportFontsFinished)
+
+    def exportFontsFinished(self, jobs, results):
+        """Write the timing report and summarize the export, once all jobs ran."""
+        report = self.timingReport(jobs, results)
+        self.writeTimingReport(report, os.path.join(self.exportPath, "Export Report"))
+        print(f"Exported {len(jobs)} jobs in {report['totalSeconds']:.1f} s.")
+
+        # Report failures in job order, so parallel and serial runs print the same summary
+        failures = [(job, result) for job, result in zip(jobs, results) if result is not True]
+        for job, result in failures:
+            print(f"Failed: {job['instance'].name} ({job['label']}): {result}")
+
+        if self.cancelEvent.is_set():
+            Glyphs.showNotification("Export Cancelled", f"{len(jobs) - len(failures)} of {len(jobs)} exports finished.")
+        elif failures:
+            Glyphs.showNotification("Export Finished With Errors", f"{len(failures)} of {len(jobs)} exports failed. See Macro window.")
+        else:
+            Glyphs.showNotification("Export Complete", "All fonts were exported successfully.")
+
+    def cancelExport(self, sender):
+        """Stop the export after the jobs that are running now."""
+        self.cancelEvent.set()
+        self.w.cancelButton.enable(False)
+        self.w.status.set("Cancelling after the running jobs…")
+
+    def benchmarkExport(self, sender):
+        """Replay the export matrix of the window into a scratch folder and log the timings for comparing runs."""
+        if not self.exportPath:
+            print("No export path available. Please save the font first or select an export path.")
+            return
+
+        fonts = self.getExportFonts()
         if not fonts:
             print("No fonts available for export.")
             return
 
+        benchmarkFolder = tempfile.mkdtemp(prefix="ExportBenchmark-")
+
+        def benchmarkFinished(jobs, results):
+            report = self.timingReport(jobs, results)
+            shutil.rmtree(benchmarkFolder, ignore_errors=True)
+            if self.cancelEvent.is_set():
+                print("Benchmark cancelled, nothing logged.")
+                return
+            self.logBenchmark(jobs, report)
+
+        self.startExport(fonts, benchmarkFolder, False, benchmarkFinished)
+
+    def logBenchmark(self, jobs, report):
+        """Append a benchmark report to Export Benchmarks.jsonl and compare it with the previous run."""
+        benchmarkLogPath = os.path.join(self.exportPath, "Export Benchmarks.jsonl")
+        previousRuns = []
+        if os.path.exists(benchmarkLogPath):
+            with open(benchmarkLogPath, "r", encoding="utf-8") as benchmarkLog:
+                previousRuns = [json.loads(line) for line in benchmarkLog if line.strip()]
+        with open(benchmarkLogPath, "a", encoding="utf-8") as benchmarkLog:
+            benchmarkLog.write(json.dumps(report, sort_keys=True) + "\n")
+
+        print(f"Benchmark: {len(jobs)} jobs in {report['totalSeconds']:.1f} s.")
+        if previousRuns:
+            print(f"Previous run ({previousRuns[-1]['date']}): {previousRuns[-1]['totalSeconds']:.1f} s.")
+        for row in sorted(report["jobs"], key=lambda row: row["seconds"], reverse=True)[:10]:
+            print(f"{row['seconds']:8.2f} s  {row['instance']} ({row['job']})")
+        Glyphs.showNotification("Benchmark Complete", f"{len(jobs)} jobs in {report['totalSeconds']:.1f} s.")
+
+    def startExport(self, fonts, exportPath, incremental, onFinished):
+        """Collect the export jobs of the fonts and run them one by one on the main thread.
+        onFinished(jobs, results) is called on the main thread once all jobs ran or were cancelled."""
+        self.stylesheets = []
+        jobs, manifests, skippedJobs = self.collectExportJobs(fonts, exportPath, incremental)
+        workers = self.getWorkerCount() if self.w.parallelJobs.get() else 1
+
+        # One overlap cache for all formats of this export
+        self.overlapCache = None
+        if self.w.cacheOverlaps.get() and self.w.removeOverlaps.get():
+            cachePath = overlapCachePath() if self.w.cacheOverlapsOnDisk.get() else None
+            self.overlapCache = OverlapCache(cachePath)
+
+        self.cancelEvent.clear()
+        self.jobDurations = []
+        self.w.runButton.enable(False)
+        self.w.benchmarkButton.enable(False)
+        self.w.cancelButton.enable(True)
+        self.w.status.set(f"0/{len(jobs)} jobs")
+        self.w.progressBar.set(0)
+
+        run = {
+            "jobs": jobs,
+            "order": self.jobOrder(jobs),
+            "next": 0,
+            "futures": {},  # id(job): future of True or the error message
+            "finished": 0,
+            "pool": ThreadPoolExecutor(max_workers=workers),
+            "workers": workers,
+            "verify": self.w.verifyFiles.get() and TTFont,
+            "finish": (manifests, skippedJobs, incremental, onFinished),
+        }
+        callAfter(self.exportNextJob, run)
+
+    def jobOrder(self, jobs):
+        """Jobs in the order they can run: instances cut from a variable font come after
+        the variable font is compiled, subsets after their WOFF2."""
+        def jobPhase(job):
+            return 1 + jobPhase(job["dependsOn"]) if job.get("dependsOn") else 0
+
+        return sorted(jobs, key=jobPhase)
+
+    def exportNextJob(self, run):
+        """Run the Glyphs part of the next export job and schedule the one after it (on the main thread).
+        instance.generate() and the font reads must not run on another thread; going through callAfter
+        after every job lets the window handle events, e.g. the Cancel button, between jobs.
+        The fontTools part of each job goes to the worker pool."""
+        order, futures = run["order"], run["futures"]
+        try:
+            if run["next"] < len(order):
+                job = order[run["next"]]
+                run["next"] += 1
+                dependency = futures.get(id(job["dependsOn"])) if job.get("dependsOn") else None
+                future = self.startExportJob(job, run["pool"], dependency)
+                futures[id(job)] = future
+                future.add_done_callback(lambda future: callAfter(self.exportJobDone, run, job))
+                callAfter(self.exportNextJob, run)
+                return
+        except Exception as e:
+            # Unexpected errors end the export, the remaining jobs are reported as failed
+            for job in order:
+                if id(job) not in futures:
+                    futures[id(job)] = self.finishedFuture(str(e))
+        self.exportJobsFinished(run)
+
+    def exportJobDone(self, run, job):
+        if run.get("done"):
+            return  # the export finished before this progress update came through
+        run["finished"] += 1
+        self.jobFinished(job, run["finished"], len(run["jobs"]), 1)
+
+    def finishedFuture(self, result):
+        future = Future()
+        future.set_result(result)
+        return future
+
+    def exportJobsFinished(self, run):
+        """Wait for the fontTools work and verify the written files on the worker pool (no Glyphs objects),
+        then finish on the main thread."""
+        jobs = run["jobs"]
+        verify = run["verify"] and not self.cancelEvent.is_set()
+
+        def finishInBackground():
+            try:
+                wait(run["futures"].values())
+                results = [run["futures"][id(job)].result() for job in jobs]
+                if verify:
+                    try:
+                        results = self.verifyExportJobs(jobs, results, run["workers"])
+                    except Exception as e:
+                        results = [f"verification failed: {e}" if result is True else result for result in results]
+            finally:
+                run["pool"].shutdown(wait=False)
+            run["done"] = True
+            callAfter(self.exportFinished, jobs, results, *run["finish"])
+
+        threading.Thread(target=finishInBackground, daemon=True).start()
+
+    def exportFinished(self, jobs, results, manifests, skippedJobs, incremental, onFinished):
+        """Record the finished jobs in the manifests and restore the window (on the main thread).
+        The window is restored even if recording or reporting fails."""
+        try:
+            self.recordExport(jobs, results, manifests, skippedJobs, incremental)
+            onFinished(jobs, results)
+        finally:
+            self.overlapCache = None
+            self.w.runButton.enable(True)
+            self.w.benchmarkButton.enable(True)
+            self.w.cancelButton.enable(False)
+            self.w.status.set("Cancelled." if self.cancelEvent.is_set() else "Done.")
+
+    def recordExport(self, jobs, results, manifests, skippedJobs, incremental):
+        """Update the manifests, write the subset stylesheets and the overlap cache, and print a summary."""
+        # Record the successful jobs, so the next incremental export can skip them
+        resultsByJob = {id(job): result for job, result in zip(jobs, results)}
+        savedManifests = {}
+        for manifestPath, manifest, fontJobs in manifests:
+            for job in fontJobs:
+                if resultsByJob[id(job)] is True:
+                    manifest[self.manifestKey(job)] = {"hash": job["hash"], "files": job["outputs"]}
+            savedManifests[manifestPath] = manifest
+        for manifestPath, manifest in savedManifests.items():
+            self.saveManifest(manifestPath, manifest)
+
+        if incremental:
+            print(f"Incremental export: {skippedJobs} up to date (skipped), {len(jobs)} exported.")
+
+        writtenFiles = sum(len(job["outputs"]) for job in jobs)
+        unchangedFiles = sum(job.get("unchanged", 0) for job in jobs)
+        print(f"{writtenFiles - unchangedFiles} files replaced, {unchangedFiles} files unchanged and left in place.")
+
+        for stylesheetPath, subsetJobs in self.stylesheets:
+            self.writeSubsetStylesheet(stylesheetPath, subsetJobs)
+
+        if self.overlapCache:
+            print(f"Overlap cache: {self.overlapCache.hits} glyphs reused, {self.overlapCache.misses} glyphs computed.")
+            self.overlapCache.save()
+
+    def collectExportJobs(self, fonts, exportPath, incremental=False):
+        """Collect the jobs for the formats chosen in the window, for all fonts.
+        Returns the jobs to run, the manifests to update and the number of jobs skipped as up to date."""
         # Export formats
         exportOTF = self.w.exportOTF.get()
         exportTTF = self.w.exportTTF.get()
@@ -99,43 +486,757 @@ class ExportToAllFormats:
         removeOverlaps = self.w.removeOverlaps.get()
         psOutlines = self.w.psOutlines.get()
 
-        totalFonts = len(fonts)
-        progressStep = 100 / totalFonts
-        currentProgress = 0
+        self.folderTimings = []
+        self.exportStarted = time.perf_counter()
 
+        # Collect one job per instance and format, in a fixed order
+        jobs = []
+        manifests = []
+        skippedJobs = 0
+        if incremental:
+            # One manifest per export folder, its entries keyed by font file path
+            manifestPath = os.path.join(exportPath, "Export Manifest.json")
+            manifest = self.loadManifest(manifestPath)
         for font in fonts:
-            fontExportPath = self.createSubfolder(self.exportPath, font.familyName)
+            fontExportPath = self.createSubfolder(exportPath, font.familyName)
+            fontJobs = []
 
             # Export OTF
             if exportOTF:
-                self.exportFontInstances(font, "OTF", fontExportPath, useSubfolders, autohint, removeOverlaps)
+                fontJobs += self.exportFontInstances(font, "OTF", fontExportPath, useSubfolders, autohint, removeOverlaps)
 
             # Export TTF
             if exportTTF:
-                self.exportFontInstances(font, "TTF", fontExportPath, useSubfolders, autohint, removeOverlaps)
+                fontJobs += self.exportFontInstances(font, "TTF", fontExportPath, useSubfolders, autohint, removeOverlaps)
 
             # Export WEB (WOFF/WOFF2)
             if exportWEB:
                 woffPath = self.createSubfolder(fontExportPath, "WOFF") if useSubfolders else fontExportPath
                 woff2Path = self.createSubfolder(fontExportPath, "WOFF2") if useSubfolders else fontExportPath
-                self.exportFontInstances(font, "WEB", fontExportPath, useSubfolders, autohint, removeOverlaps, woffPath=woffPath, woff2Path=woff2Path, psOutlines=psOutlines)
+                fontJobs += self.exportFontInstances(font, "WEB", fontExportPath, useSubfolders, autohint, removeOverlaps, woffPath=woffPath, woff2Path=woff2Path, psOutlines=psOutlines)
 
             # Export Variable (as TTF, WOFF, and WOFF2)
             if exportVariable:
                 variablePathTTF = self.createSubfolder(fontExportPath, "Variable/TTF") if useSubfolders else fontExportPath
                 variablePathWOFF = self.createSubfolder(fontExportPath, "Variable/WOFF") if useSubfolders else fontExportPath
                 variablePathWOFF2 = self.createSubfolder(fontExportPath, "Variable/WOFF2") if useSubfolders else fontExportPath
-                self.exportFontInstances(font, "Variable", fontExportPath, useSubfolders, autohint, removeOverlaps, variableOnly=True, variablePaths={"TTF": variablePathTTF, "WOFF": variablePathWOFF, "WOFF2": variablePathWOFF2})
+                fontJobs += self.exportFontInstances(font, "Variable", fontExportPath, useSubfolders, autohint, removeOverlaps, variableOnly=True, variablePaths={"TTF": variablePathTTF, "WOFF": variablePathWOFF, "WOFF2": variablePathWOFF2})
+
+            # Cut static TT instances from the variable font instead of interpolating and compiling each
+            if self.w.staticsFromVariable.get():
+                fontJobs = self.deriveStaticJobs(font, fontJobs)
+
+            # Split the WOFF2 files into unicode-range subsets
+            if exportWEB and self.w.subsetWeb.get():
+                subsetPath = self.createSubfolder(woff2Path, "Subsets") if useSubfolders else woff2Path
+                subsetJobs = self.subsetJobs(fontJobs, subsetPath)
+                if subsetJobs:
+                    self.stylesheets.append((os.path.join(subsetPath, f"{font.familyName}.css"), subsetJobs))
+                    fontJobs += subsetJobs
+
+            # Skip the jobs whose inputs match the manifest of the last export
+            if incremental:
+                fontHash = self.fontInputHash(font)
+                pendingJobs = []
+                for job in fontJobs:
+                    job["hash"] = self.jobInputHash(job, fontHash)
+                    entry = manifest.get(self.manifestKey(job))
+                    if entry and entry["hash"] == job["hash"] and entry["files"] and all(os.path.exists(f) for f in entry["files"]):
+                        job["outputs"] = entry["files"]  # statics cut from this variable font still need its path
+                        skippedJobs += 1
+                    else:
+                        pendingJobs.append(job)
+                manifests.append((manifestPath, manifest, pendingJobs))
+                fontJobs = pendingJobs
 
-            # Update progress
-            currentProgress += progressStep
-            self.w.progressBar.set(currentProgress)
+            jobs += fontJobs
 
-        Glyphs.showNotification("Export Complete", "All fonts were exported successfully.")
+        return jobs, manifests, skippedJobs
+
+    def timingReport(self, jobs, results):
+        """Collect wall time, output size and options of every job and subfolder of the last export."""
+        rows = []
+        for job, result in zip(jobs, results):
+            timing = job["timing"]
+            rows.append({
+                "font": job["instance"].font.familyName,
+                "instance": job["instance"].name,
+                "job": job["label"],
+                "format": job["options"].get("Format"),
+                "containers": "+".join(job["options"].get("Containers", []) or job["webPaths"].keys()),
+                "removeOverlaps": bool(job["options"].get("RemoveOverlap")),
+                "autohint": bool(job["options"].get("AutoHint")),
+                "result": "ok" if result is True else str(result),
+                "seconds": round(timing.get("total", 0.0), 4),
+                "generateSeconds": round(timing.get("generate", 0.0), 4),
+                "woffSeconds": round(timing.get("WOFF", 0.0), 4),
+                "woff2Seconds": round(timing.get("WOFF2", 0.0), 4),
+                "instantiateSeconds": round(timing.get("instantiate", 0.0), 4),
+                "bytes": sum(os.path.getsize(path) for path in job["outputs"] if os.path.exists(path)),
+            })
+        return {
+            "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "totalSeconds": round(time.perf_counter() - self.exportStarted, 4),
+            "workers": self.getWorkerCount() if self.w.parallelJobs.get() else 1,
+            "jobs": rows,
+            "subfolders": [dict(timing, seconds=round(timing["seconds"], 6)) for timing in self.folderTimings],
+        }
+
+    def writeTimingReport(self, report, reportPath):
+        """Write the timing report as reportPath.json (everything) and reportPath.csv (one row per job)."""
+        with open(reportPath + ".json", "w", encoding="utf-8") as reportFile:
+            json.dump(report, reportFile, indent=1)
+        if report["jobs"]:
+            with open(reportPath + ".csv", "w", encoding="utf-8", newline="") as reportFile:
+                writer = csv.DictWriter(reportFile, fieldnames=list(report["jobs"][0].keys()))
+                writer.writeheader()
+                writer.writerows(report["jobs"])
+
+    def getWorkerCount(self):
+        """Read the worker count from the window, falling back to the number of CPUs."""
+        try:
+            return max(1, int(self.w.workers.get()))
+        except ValueError:
+            return os.cpu_count() or 2
+
+    def loadManifest(self, manifestPath):
+        """Load the export manifest of an export folder, or start an empty one."""
+        try:
+            with open(manifestPath, "r", encoding="utf-8") as manifestFile:
+                return json.load(manifestFile)
+        except (OSError, ValueError):
+            return {}
+
+    def saveManifest(self, manifestPath, manifest):
+        with open(manifestPath, "w", encoding="utf-8") as manifestFile:
+            json.dump(manifest, manifestFile, indent=1, sort_keys=True)
+
+    def manifestKey(self, job):
+        """Font file path, instance and format of a job; two families of the same name do not share entries."""
+        font = job["instance"].font
+        return f"{font.filepath or font.familyName}: {job['instance'].name} ({job['label']})"
+
+    def fontInfoText(self, properties):
+        """Keys and (localized) values of font info properties (GSFontInfoValue), as text."""
+        parts = []
+        for infoValue in properties:
+            localizedValues = getattr(infoValue, "values", None)
+            if localizedValues:
+                parts.append(f"{infoValue.key}{[(value.languageTag, value.value) for value in localizedValues]}")
+            else:
+                parts.append(f"{infoValue.key}{infoValue.value}")
+        return "|".join(parts)
+
+    def layerFingerprint(self, layer):
+        """Text describing the outlines, components, anchors and width of a layer."""
+        parts = [str(layer.width)]
+        for path in layer.paths:
+            parts.append(" ".join(f"{node.type[0]}{node.position.x},{node.position.y}" for node in path.nodes))
+        for component in layer.components:
+            parts.append(f"{component.name}{tuple(component.transform)}")
+        for anchor in layer.anchors:
+            parts.append(f"{anchor.name}{anchor.position.x},{anchor.position.y}")
+        for hint in layer.hints:
+            parts.append(f"{hint.type}{hint.name}{hint.horizontal}{hint.origin}{hint.target}{hint.other1}{hint.other2}{hint.options}{hint.stem}")
+        return "|".join(parts)
+
+    def fontInputHash(self, font):
+        """Hash everything the instances of a font are built from: font info, masters and their metrics,
+        all instances, the master (and brace/bracket) outlines with their hints, kerning and features."""
+        digest = hashlib.sha1()
+
+        # Font info: names, vendor, version, dates, units
+        digest.update(f"{font.familyName}{font.upm}{font.versionMajor}.{font.versionMinor}{font.date}{font.gridLength}".encode("utf-8"))
+        digest.update(self.fontInfoText(font.properties).encode("utf-8"))
+        digest.update(str([str(p) for p in font.customParameters]).encode("utf-8"))
+        digest.update(str([(axis.name, axis.axisTag, axis.hidden) for axis in font.axes]).encode("utf-8"))
+        digest.update(str([(metric.name, metric.type, metric.filter) for metric in font.metrics]).encode("utf-8"))
+        digest.update(str([(stem.name, stem.horizontal) for stem in font.stems]).encode("utf-8"))
+
+        # Masters: location, parameters, vertical metrics, zones and stems
+        for master in font.masters:
+            digest.update(f"{master.id}{master.name}{list(master.axes)}{[str(p) for p in master.customParameters]}".encode("utf-8"))
+            digest.update(self.fontInfoText(master.properties).encode("utf-8"))
+            digest.update(f"{[(metric.position, metric.overshoot) for metric in master.metrics]}{master.italicAngle}".encode("utf-8"))
+            digest.update(f"{[(zone.position, zone.size) for zone in master.alignmentZones]}{list(master.stems)}".encode("utf-8"))
+
+        # Instances: all of them, style linking and the STAT/name tables of one depend on the others
+        for instance in font.instances:
+            digest.update(f"{instance.name}{instance.type}{instance.active}{list(instance.axes)}{instance.weightClass}{instance.widthClass}".encode("utf-8"))
+            digest.update(f"{instance.isBold}{instance.isItalic}{instance.linkStyle}{[str(p) for p in instance.customParameters]}".encode("utf-8"))
+            digest.update(self.fontInfoText(instance.properties).encode("utf-8"))
+
+        for glyph in font.glyphs:
+            digest.update(f"{glyph.name}{glyph.productionName}{glyph.export}{glyph.unicodes}{glyph.leftKerningGroup}{glyph.rightKerningGroup}".encode("utf-8"))
+            for layer in glyph.layers:
+                if layer.isMasterLayer or layer.isSpecialLayer:
+                    digest.update(f"{layer.associatedMasterId}{layer.name}{self.layerFingerprint(layer)}".encode("utf-8"))
+        for masterId in sorted(font.kerning.keys()):
+            pairs = font.kerning[masterId]
+            for leftKey in sorted(pairs.keys()):
+                for rightKey in sorted(pairs[leftKey].keys()):
+                    digest.update(f"{masterId}{leftKey}{rightKey}{pairs[leftKey][rightKey]}".encode("utf-8"))
+        for featureClass in font.classes:
+            digest.update(f"{featureClass.name}{featureClass.active}{featureClass.automatic}{featureClass.code}".encode("utf-8"))
+        for prefix in font.featurePrefixes:
+            digest.update(f"{prefix.name}{prefix.active}{prefix.automatic}{prefix.code}".encode("utf-8"))
+        for feature in font.features:
+            digest.update(f"{feature.name}{feature.active}{feature.automatic}{feature.code}".encode("utf-8"))
+        return digest.hexdigest()
+
+    def jobInputHash(self, job, fontHash):
+        """Hash the font inputs (which include every instance) together with the job's instance, export options and destination."""
+        instance = job["instance"]
+        description = [
+            fontHash,
+            instance.name,
+            job["label"],
+            str(job["path"]),
+            str(sorted(job["webPaths"].items())),
+            str(sorted(job["options"].items())),
+            str(job.get("profiles")),
+        ]
+        return hashlib.sha1("|".join(description).encode("utf-8")).hexdigest()
+
+    def exportJob(self, instance, label, fontPath, webPaths=None, **options):
+        """Describe a single instance.generate() call.
+        With webPaths ({"WOFF": folder, "WOFF2": folder}), the compiled font is also wrapped in those containers."""
+        return {"instance": instance, "label": label, "path": fontPath, "webPaths": webPaths or {}, "options": options, "outputs": [], "timing": {}}
+
+    def deriveStaticJobs(self, font, jobs):
+        """Replace the static TTF and TT-flavored WEB jobs of a font with one job per instance
+        that cuts the instance from the compiled variable font. Other jobs are kept as they are,
+        and so are the jobs of instances with custom parameters or filters (renamed or removed glyphs,
+        features, outline filters), which the variable font does not carry."""
+        variableJobs = [job for job in jobs if job["instance"].type == INSTANCETYPEVARIABLE and job["path"] and job["webPaths"]]
+        if not (TTFont and instantiateVariableFont):
+            print("Statics from variable font: fontTools is not installed, exporting statics directly.")
+            return jobs
+        if len(variableJobs) != 1:
+            print(f"Statics from variable font: {font.familyName} needs exactly one exported variable instance, exporting statics directly.")
+            return jobs
+        if self.w.autohint.get():
+            print("Statics from variable font: instances cut from the variable font cannot be autohinted, exporting statics directly.")
+            return jobs
+        if self.w.removeOverlaps.get():
+            try:
+                import pathops  # needed by the instancer to remove overlaps
+            except ImportError:
+                print("Statics from variable font: skia-pathops is not installed, exporting statics directly.")
+                return jobs
+
+        try:
+            tolerance = float(self.w.verifyTolerance.get())
+        except ValueError:
+            tolerance = 1.0
+
+        derivedJobs = {}
+        remainingJobs = []
+        directInstances = []
+        for job in jobs:
+            derivable = job["label"] in ("TTF", "WOFF/WOFF2") and job["options"]["Format"] == "TTF"
+            if derivable and self.instanceParameters(job["instance"]):
+                derivable = False
+                if job["instance"].name not in directInstances:
+                    directInstances.append(job["instance"].name)
+            if not derivable:
+                remainingJobs.append(job)
+                continue
+
+            instance = job["instance"]
+            derivedJob = derivedJobs.get(id(instance))
+            if derivedJob is None:
+                derivedJob = self.exportJob(instance, "TTF from variable", None, **job["options"])
+                derivedJob["dependsOn"] = variableJobs[0]
+                derivedJob["location"] = self.instanceUserLocation(font, instance)
+                derivedJob["tolerance"] = tolerance if self.w.verifyStatics.get() else None
+                derivedJobs[id(instance)] = derivedJob
+                remainingJobs.append(derivedJob)
+            if job["path"]:
+                derivedJob["path"] = job["path"]
+            derivedJob["webPaths"].update(job["webPaths"])
+        if directInstances:
+            print(f"Statics from variable font: {', '.join(directInstances)} of {font.familyName} have custom parameters or filters, exported directly.")
+        return remainingJobs
+
+    def instanceParameters(self, instance):
+        """Names of the custom parameters and filters of an instance that a static cut from the variable font would lose."""
+        return [parameter.name for parameter in instance.customParameters if parameter.active and parameter.name not in CUT_STATIC_PARAMETERS]
+
+    def getSubsetProfiles(self):
+        """Profiles entered in the window, as {name: unicode-range}, in the order entered."""
+        profiles = {}
+        for name in self.w.subsetProfiles.get().split(","):
+            name = name.strip().lower()
+            if name in UNICODE_RANGE_PROFILES:
+                profiles[name] = UNICODE_RANGE_PROFILES[name]
+            elif name:
+                print(f"Unknown subset profile “{name}”, known profiles: {', '.join(UNICODE_RANGE_PROFILES)}")
+        return profiles
+
+    def subsetJobs(self, jobs, subsetPath):
+        """One subset job for every static job that writes a WOFF2."""
+        if not TTFont:
+            print("Subset WOFF2: fontTools is not installed, no subsets exported.")
+            return []
+        profiles = self.getSubsetProfiles()
+        if not profiles:
+            return []
+
+        subsetJobs = []
+        for job in jobs:
+            if "WOFF2" in job["webPaths"] and job["instance"].type != INSTANCETYPEVARIABLE:
+                subsetJob = self.exportJob(job["instance"], "WOFF2 subsets", subsetPath, **job["options"])
+                subsetJob["dependsOn"] = job
+                subsetJob["profiles"] = profiles
+                subsetJobs.append(subsetJob)
+        return subsetJobs
+
+    def subsetJob(self, job):
+        """Write one WOFF2 per unicode-range profile from the WOFF2 of the job it depends on.
+        Profiles without any glyph in the font are left out."""
+        from fontTools import subset
+
+        sourcePaths = [path for path in job["dependsOn"]["outputs"] if path.endswith(".woff2")]
+        if not sourcePaths:
+            return "the WOFF2 file was not exported"
+        sourcePath = sourcePaths[0]
+        baseName = os.path.splitext(os.path.basename(sourcePath))[0]
+
+        options = subset.Options()
+        options.flavor = "woff2"
+        options.layout_features = ["*"]
+        options.name_IDs = ["*"]
+        options.notdef_outline = True
+
+        job["subsets"] = []
+        for profileName, unicodeRange in job["profiles"].items():
+            started = time.perf_counter()
+            subsetFont = subset.load_font(sourcePath, options)
+            codePoints = parseUnicodeRange(unicodeRange) & set(subsetFont.getBestCmap())
+            if codePoints:
+                subsetter = subset.Subsetter(options)
+                subsetter.populate(unicodes=codePoints)
+                subsetter.subset(subsetFont)
+                subsetFontPath = os.path.join(job["path"], f"{baseName}-{profileName}.woff2")
+                self.writeIfChanged(job, subsetFontPath, lambda tempPath: subset.save_font(subsetFont, tempPath, options))
+                job["subsets"].append((profileName, os.path.basename(subsetFontPath)))
+            subsetFont.close()
+            job["timing"][profileName] = time.perf_counter() - started
+        return True
+
+    def writeSubsetStylesheet(self, stylesheetPath, subsetJobs):
+        """Write the @font-face rules for all subset WOFF2 files of a font, with their unicode-range.
+        Style, weight and stretch tell the instances of the family apart, e.g. “Condensed Bold” from “Bold”."""
+        rules = []
+        for job in subsetJobs:
+            instance = job["instance"]
+            subsets = job.get("subsets")
+            if subsets is None:
+                # skipped as up to date: the files are named after their profiles
+                subsets = [(profileName, os.path.basename(path)) for profileName in job["profiles"] for path in job["outputs"] if path.endswith(f"-{profileName}.woff2")]
+            for profileName, fileName in subsets:
+                rules.append(
+                    f"/* {instance.name}, {profileName} */\n"
+                    "@font-face {\n"
+                    f"  font-family: \"{instance.familyName}\";\n"
+                    f"  font-style: {'italic' if instance.isItalic else 'normal'};\n"
+                    f"  font-weight: {instance.weightClass};\n"
+                    f"  font-stretch: {FONT_STRETCH.get(instance.widthClass, '100%')};\n"
+                    "  font-display: swap;\n"
+                    f"  src: url(\"{fileName}\") format(\"woff2\");\n"
+                    f"  unicode-range: {job['profiles'][profileName]};\n"
+                    "}\n"
+                )
+        if rules:
+            with open(stylesheetPath, "w", encoding="utf-8") as stylesheet:
+                stylesheet.write("\n".join(rules))
+
+    def instanceUserLocation(self, font, instance):
+        """Location of an instance in user coordinates ({axis tag: value}), as the variable font’s fvar expects it.
+        Uses the “Axis Location” parameter of the instance, or maps its design location through the masters’ “Axis Location”."""
+        location = {}
+        instanceAxisLocation = {entry["Axis"]: entry["Location"] for entry in instance.customParameters["Axis Location"] or []}
+        for index, axis in enumerate(font.axes):
+            designValue = instance.axes[index]
+            if axis.name in instanceAxisLocation:
+                location[axis.axisTag] = float(instanceAxisLocation[axis.name])
+                continue
+
+            # design → user pairs of the masters, interpolated piecewise linearly
+            mapping = set()
+            for master in font.masters:
+                for entry in master.customParameters["Axis Location"] or []:
+                    if entry["Axis"] == axis.name:
+                        mapping.add((float(master.axes[index]), float(entry["Location"])))
+            mapping = sorted(mapping)
+            if len(mapping) < 2:
+                offset = mapping[0][1] - mapping[0][0] if mapping else 0.0
+                location[axis.axisTag] = designValue + offset
+                continue
+
+            for (design1, user1), (design2, user2) in zip(mapping, mapping[1:]):
+                if designValue <= design2 or (design2, user2) == mapping[-1]:
+                    if design1 == design2:
+                        location[axis.axisTag] = user1
+                    else:
+                        location[axis.axisTag] = user1 + (designValue - design1) * (user2 - user1) / (design2 - design1)
+                    break
+        return location
+
+    def instanceNames(self, instance):
+        """Names and style linking of a static instance, read on the main thread for setInstanceNames()."""
+        return {
+            "names": {
+                1: instance.windowsFamily,
+                2: instance.windowsStyle,
+                4: instance.fullName,
+                6: instance.fontName,
+                16: instance.preferredFamily,
+                17: instance.preferredSubfamilyName,
+            },
+            "fontName": instance.fontName,
+            "isBold": bool(instance.isBold),
+            "isItalic": bool(instance.isItalic),
+        }
+
+    def setInstanceNames(self, staticFont, instanceNames):
+        """Replace the variable font’s names and style bits with those of the static instance (from instanceNames())."""
+        nameTable = staticFont["name"]
+        names = dict(instanceNames["names"])
+        # Typographic names are only needed when they differ from the style-linked ones
+        if names[16] == names[1] and names[17] == names[2]:
+            del names[16], names[17]
+            nameTable.removeNames(nameID=16)
+            nameTable.removeNames(nameID=17)
+        nameTable.removeNames(nameID=25)  # variations PostScript name prefix
+        # Unique ID as Glyphs writes it: version;vendor;PostScript name
+        names[3] = f"{staticFont['head'].fontRevision:.3f};{staticFont['OS/2'].achVendID.strip()};{instanceNames['fontName']}"
+        # Windows names only, like the Glyphs export
+        nameTable.names = [record for record in nameTable.names if record.platformID == 3]
+        for nameID, string in names.items():
+            if string:
+                nameTable.setName(string, nameID, 3, 1, 0x409)
+
+        # Style linking bits: fsSelection ITALIC (0), BOLD (5), REGULAR (6); macStyle bold (0), italic (1)
+        isBold, isItalic = instanceNames["isBold"], instanceNames["isItalic"]
+        fsSelection = staticFont["OS/2"].fsSelection & ~((1 << 0) | (1 << 5) | (1 << 6))
+        if isItalic:
+            fsSelection |= 1 << 0
+        if isBold:
+            fsSelection |= 1 << 5
+        if not (isBold or isItalic):
+            fsSelection |= 1 << 6
+        staticFont["OS/2"].fsSelection = fsSelection
+        staticFont["head"].macStyle = (staticFont["head"].macStyle & ~0b11) | (isBold << 0) | (isItalic << 1)
+
+    def instantiateJob(self, job, referenceFolder=None):
+        """Cut a static instance from the compiled variable font and write it as TTF/WOFF/WOFF2.
+        With a tolerance, the result is compared with the directly interpolated instance in referenceFolder."""
+        variablePaths = [path for path in job["dependsOn"]["outputs"] if path.endswith(".ttf")]
+        if not variablePaths:
+            return "the variable font was not exported"
+        variablePath = variablePaths[0]
+        overlap = OverlapMode.REMOVE if job["options"].get("RemoveOverlap") else OverlapMode.KEEP_AND_SET_FLAGS
+
+        started = time.perf_counter()
+        staticFont = instantiateVariableFont(TTFont(variablePath), job["location"], overlap=overlap)
+        self.setInstanceNames(staticFont, job["names"])
+        job["timing"]["instantiate"] = time.perf_counter() - started
+
+        baseName = job["names"]["fontName"]
+        if job["path"]:
+            staticPath = os.path.join(job["path"], f"{baseName}.ttf")
+            self.writeIfChanged(job, staticPath, staticFont.save)
+        for container, folder in job["webPaths"].items():
+            started = time.perf_counter()
+            staticFont.flavor = container.lower()
+            webFontPath = os.path.join(folder, f"{baseName}.{staticFont.flavor}")
+            self.writeIfChanged(job, webFontPath, staticFont.save)
+            job["timing"][container] = time.perf_counter() - started
+        staticFont.flavor = None
+
+        if job["tolerance"] is not None:
+            differences = self.compareWithReference(referenceFolder, staticFont, job["tolerance"])
+            if differences:
+                return f"{len(differences)} glyphs differ from the interpolated instance by more than {job['tolerance']} units: " + ", ".join(differences[:10])
+        return True
+
+    def outlineMeasures(self, glyphSet, glyphName):
+        """Bounding box and absolute area of a glyph; None for both if it has no outlines."""
+        boundsPen = BoundsPen(glyphSet)
+        glyphSet[glyphName].draw(boundsPen)
+        areaPen = AreaPen(glyphSet)
+        glyphSet[glyphName].draw(areaPen)
+        return boundsPen.bounds, abs(areaPen.value)
+
+    def generateReference(self, job):
+        """Export the instance of a job directly into a scratch folder, to compare the cut or cached instance with (main thread)."""
+        scratchFolder = tempfile.mkdtemp(prefix="ExportToAllFormats-")
+        result = job["instance"].generate(FontPath=scratchFolder, **job["options"])
+        if result is not True:
+            shutil.rmtree(scratchFolder, ignore_errors=True)
+            raise RuntimeError(f"direct export for verification failed: {result}")
+        return scratchFolder
+
+    def compareWithReference(self, referenceFolder, staticFont, tolerance):
+        """Compare bounds, areas and advance widths of a cut or cached instance with the direct export in referenceFolder.
+        Points are not compared one by one, the two exports convert curves and remove overlaps differently.
+        Returns a description of every glyph that differs by more than the tolerance."""
+        interpolatedFont = TTFont(os.path.join(referenceFolder, os.listdir(referenceFolder)[0]))
+        try:
+            differences = []
+            staticGlyphs, interpolatedGlyphs = staticFont.getGlyphSet(), interpolatedFont.getGlyphSet()
+            staticMetrics, interpolatedMetrics = staticFont["hmtx"].metrics, interpolatedFont["hmtx"].metrics
+            for glyphName in interpolatedFont.getGlyphOrder():
+                if glyphName not in staticGlyphs:
+                    differences.append(f"{glyphName} (missing)")
+                    continue
+                if abs(staticMetrics[glyphName][0] - interpolatedMetrics[glyphName][0]) > tolerance:
+                    differences.append(f"{glyphName} (width)")
+                    continue
+                staticBounds, staticArea = self.outlineMeasures(staticGlyphs, glyphName)
+                interpolatedBounds, interpolatedArea = self.outlineMeasures(interpolatedGlyphs, glyphName)
+                if (staticBounds is None) != (interpolatedBounds is None):
+                    differences.append(f"{glyphName} (outlines)")
+                elif staticBounds is None:
+                    continue
+                elif any(abs(a - b) > tolerance for a, b in zip(staticBounds, interpolatedBounds)):
+                    differences.append(f"{glyphName} (bounds)")
+                else:
+                    # The area may differ by a band of the tolerance's width along the outline, estimated from the bounding box
+                    xMin, yMin, xMax, yMax = interpolatedBounds
+                    if abs(staticArea - interpolatedArea) > tolerance * 2 * ((xMax - xMin) + (yMax - yMin)):
+                        differences.append(f"{glyphName} (area)")
+            return differences
+        finally:
+            interpolatedFont.close()
+
+    def startExportJob(self, job, pool, dependency=None):
+        """Run the part of a job that needs Glyphs now (on the main thread): generate the instance,
+        or read what the fontTools part needs from it. The fontTools part is submitted to the pool and
+        waits there for the job it depends on. Returns a future of True or the error message."""
+        if self.cancelEvent.is_set():
+            return self.finishedFuture("cancelled")
+
+        started = time.perf_counter()
+        scratchFolder = None
+        try:
+            if job.get("location"):
+                job["names"] = self.instanceNames(job["instance"])
+                if job["tolerance"] is not None:
+                    scratchFolder = self.generateReference(job)
+            elif not job.get("profiles"):
+                if self.needsOverlapCheck(job):
+                    job["overlapReference"] = self.generateReference(job)
+                scratchFolder = tempfile.mkdtemp(prefix="ExportToAllFormats-")
+                result = self.generateInstance(job, scratchFolder)
+                job["timing"]["generate"] = time.perf_counter() - started
+                if result is not True:
+                    shutil.rmtree(scratchFolder, ignore_errors=True)
+                    if job.get("overlapReference"):
+                        shutil.rmtree(job.pop("overlapReference"), ignore_errors=True)
+                    return self.finishedFuture(result)
+        except Exception as e:
+            if scratchFolder:
+                shutil.rmtree(scratchFolder, ignore_errors=True)
+            if job.get("overlapReference"):
+                shutil.rmtree(job.pop("overlapReference"), ignore_errors=True)
+            return self.finishedFuture(str(e))
+        finally:
+            job["timing"]["total"] = time.perf_counter() - started
+        return pool.submit(self.finishExportJob, job, scratchFolder, dependency)
+
+    def finishExportJob(self, job, scratchFolder, dependency=None):
+        """The fontTools part of a job (on a worker thread, no Glyphs objects). Returns True or the error message."""
+        if dependency is not None:
+            dependency.result()  # its outputs are read below
+        started = time.perf_counter()
+        try:
+            if job.get("location"):
+                return self.instantiateJob(job, scratchFolder)
+            if job.get("profiles"):
+                return self.subsetJob(job)
+            result = self.writeCompiledJob(job, scratchFolder)
+            if job.get("overlapReference"):
+                result = self.checkOverlapCache(job, scratchFolder)
+            return result
+        except Exception as e:
+            return str(e)
+        finally:
+            if scratchFolder:
+                shutil.rmtree(scratchFolder, ignore_errors=True)
+            if job.get("overlapReference"):
+                shutil.rmtree(job["overlapReference"], ignore_errors=True)
+            job["timing"]["total"] += time.perf_counter() - started
+
+    def serializePaths(self, layer):
+        """Outlines of a layer as plain data: [(nodes, closed)], nodes as (x, y, type, smooth)."""
+        return [
+            ([(node.position.x, node.position.y, node.type, node.smooth) for node in path.nodes], path.closed)
+            for path in layer.paths
+        ]
+
+    def restorePaths(self, layer, paths):
+        """Replace the outlines of a layer with serialized ones."""
+        newPaths = []
+        for nodes, closed in paths:
+            path = GSPath()
+            for x, y, nodeType, smooth in nodes:
+                node = GSNode((x, y), nodeType)
+                node.smooth = smooth
+                path.nodes.append(node)
+            path.closed = closed
+            newPaths.append(path)
+        layer.shapes = newPaths
+
+    def removeOverlapCached(self, instance, layer, decompose=False):
+        """Remove the overlaps of an interpolated layer, or reuse the result from the overlap cache.
+        Component-only glyphs stay composites in TrueType exports; with decompose (CFF outlines)
+        they are decomposed and their overlaps removed like any other glyph."""
+        if layer.components and (layer.paths or decompose):
+            layer.decomposeComponents()  # mixed glyphs, and all composites in CFF, get decomposed on export anyway
+        if not layer.paths:
+            return
+
+        contentHash = hashlib.sha1(self.layerFingerprint(layer).encode("utf-8")).hexdigest()
+        key = (instance.name, layer.parent.name, contentHash)
+        paths = self.overlapCache.get(key)
+        if paths is None:
+            layer.removeOverlap()
+            self.overlapCache.put(key, self.serializePaths(layer))
+        else:
+            self.restorePaths(layer, paths)
+
+    def usesOverlapCache(self, job):
+        return bool(self.overlapCache and job["options"].get("RemoveOverlap") and job["instance"].type != INSTANCETYPEVARIABLE)
+
+    def needsOverlapCheck(self, job):
+        """Whether a job is also exported directly, to compare with its export through the overlap cache.
+        With file verification, the first cached OTF job of each font is checked."""
+        if not (TTFont and self.w.verifyFiles.get() and self.usesOverlapCache(job) and job["options"].get("Format") == "OTF"):
+            return False
+        fontKey = id(job["instance"].font)
+        if fontKey in self.overlapCache.checkedFonts:
+            return False
+        self.overlapCache.checkedFonts.add(fontKey)
+        return True
+
+    def checkOverlapCache(self, job, scratchFolder):
+        """Compare the instance exported through the overlap cache with its direct export. Returns True or the error message."""
+        compiledFont = TTFont(os.path.join(scratchFolder, sorted(os.listdir(scratchFolder))[0]))
+        try:
+            differences = self.compareWithReference(job["overlapReference"], compiledFont, OVERLAP_CHECK_TOLERANCE)
+        finally:
+            compiledFont.close()
+        if differences:
+            return f"{len(differences)} glyphs exported through the overlap cache differ from the direct export: " + ", ".join(differences[:10])
+        return True
+
+    def generateInstance(self, job, fontPath):
+        """Generate the instance of a job into fontPath.
+        With the overlap cache, the instance is interpolated, its overlaps are removed through the cache,
+        and the interpolated font is exported without removing overlaps again."""
+        instance = job["instance"]
+        options = job["options"]
+        if not self.usesOverlapCache(job):
+            return instance.generate(FontPath=fontPath, **options)
+
+        # Another format of this instance may have prepared it already
+        decompose = options.get("Format") == "OTF"  # CFF has no composites
+        instanceKey = (instance.name, tuple(instance.axes), decompose)
+        instanceFont = self.overlapCache.instanceFonts.get(instanceKey)
+        if instanceFont is None:
+            instanceFont = instance.interpolatedFont
+            for glyph in instanceFont.glyphs:
+                for layer in glyph.layers:
+                    if layer.isMasterLayer:
+                        self.removeOverlapCached(instance, layer, decompose)
+            self.overlapCache.instanceFonts[instanceKey] = instanceFont
+        return instanceFont.instances[0].generate(FontPath=fontPath, **dict(options, RemoveOverlap=False))
+
+    def writeCompiledJob(self, job, scratchFolder):
+        """Move the instance compiled into the scratch folder into the job’s folder.
+        With web paths, the WOFF/WOFF2 files are written from that compiled font;
+        the compiled font itself is then kept only if the job has a path.
+        The written files are recorded in job["outputs"]."""
+        for fileName in sorted(os.listdir(scratchFolder)):
+            compiledPath = os.path.join(scratchFolder, fileName)
+            baseName = os.path.splitext(fileName)[0]
+
+            if job["webPaths"]:
+                compiledFont = TTFont(compiledPath)
+                try:
+                    for container, folder in job["webPaths"].items():
+                        started = time.perf_counter()
+                        compiledFont.flavor = container.lower()
+                        webFontPath = os.path.join(folder, f"{baseName}.{compiledFont.flavor}")
+                        self.writeIfChanged(job, webFontPath, compiledFont.save)
+                        job["timing"][container] = time.perf_counter() - started
+                finally:
+                    compiledFont.close()
+
+            if job["path"]:
+                finalPath = os.path.join(job["path"], fileName)
+                self.writeIfChanged(job, finalPath, lambda tempPath: shutil.copyfile(compiledPath, tempPath))
+        return True
+
+    def writeIfChanged(self, job, finalPath, writeFile):
+        """Write a file through replaceIfChanged() and record it in job["outputs"]."""
+        if not replaceIfChanged(finalPath, writeFile):
+            job["unchanged"] = job.get("unchanged", 0) + 1
+        job["outputs"].append(finalPath)
+
+    def verifyJob(self, job):
+        """Check that every file of a finished job opens, decompiles, has matching table checksums,
+        and that all its full (not subset) files have the same glyph count."""
+        glyphCounts = {}
+        for path in job["outputs"]:
+            try:
+                with TTFont(path, checkChecksums=2) as font:
+                    font.ensureDecompiled()
+                    if font["maxp"].numGlyphs != len(font.getGlyphOrder()):
+                        return f"{os.path.basename(path)}: maxp glyph count does not match the glyph order"
+                    glyphCounts[os.path.basename(path)] = font["maxp"].numGlyphs
+            except Exception as e:
+                return f"{os.path.basename(path)} did not pass verification: {e}"
+
+        if not job.get("profiles") and len(set(glyphCounts.values())) > 1:
+            return "glyph counts differ: " + ", ".join(f"{fileName} {count}" for fileName, count in glyphCounts.items())
+        return True
+
+    def verifyExportJobs(self, jobs, results, workers=1):
+        """Verify the files of all successful jobs, in parallel. Returns the results with verification failures."""
+        toVerify = [job for job, result in zip(jobs, results) if result is True and job["outputs"]]
+        verified = {}
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for job, result in zip(toVerify, pool.map(self.verifyJob, toVerify)):
+                verified[id(job)] = result
+                callAfter(self.w.status.set, f"Verified {len(verified)}/{len(toVerify)} jobs")
+                callAfter(self.w.progressBar.set, 100 * len(verified) / len(toVerify))
+        return [verified.get(id(job), result) for job, result in zip(jobs, results)]
+
+    def jobFinished(self, job, finishedJobs, totalJobs, workers):
+        """Update progress and the time estimate after a job."""
+        if "total" in job["timing"]:
+            self.jobDurations.append(job["timing"]["total"])
+
+        status = f"{finishedJobs}/{totalJobs} jobs · {job['instance'].name} ({job['label']})"
+        if self.jobDurations and finishedJobs < totalJobs and not self.cancelEvent.is_set():
+            # Estimate from the average duration of the jobs so far, spread over the workers
+            averageDuration = sum(self.jobDurations) / len(self.jobDurations)
+            secondsLeft = averageDuration * (totalJobs - finishedJobs) / workers
+            status += f" · about {secondsLeft / 60:.0f} min left" if secondsLeft >= 90 else f" · about {secondsLeft:.0f} s left"
+
+        callAfter(self.w.progressBar.set, 100 * finishedJobs / totalJobs)
+        callAfter(self.w.status.set, status)
 
     def exportFontInstances(self, font, formatType, exportPath, useSubfolders, autohint=False, removeOverlaps=True, woffPath=None, woff2Path=None, psOutlines=False, variableOnly=False, variablePaths=None):
-        """Exports the instances of a font in a specific format."""
+        """Returns the export jobs for the instances of a font in a specific format."""
         activeInstances = [inst for inst in font.instances if inst.active]
+        options = {"RemoveOverlap": removeOverlaps, "AutoHint": autohint}
+        webFormat = "OTF" if psOutlines else "TTF"
+        jobs = []
 
         for instance in activeInstances:
             instancePath = exportPath
@@ -145,10 +1246,14 @@ class ExportToAllFormats:
                 if instance.type != INSTANCETYPEVARIABLE:
                     continue
                 # Export Variable as TTF, WOFF, and WOFF2
-                if variablePaths:
-                    instance.generate(Format="TTF", FontPath=variablePaths["TTF"], RemoveOverlap=removeOverlaps, AutoHint=autohint)
-                    instance.generate(Format="TTF", FontPath=variablePaths["WOFF"], Containers=["WOFF"], RemoveOverlap=removeOverlaps, AutoHint=autohint)
-                    instance.generate(Format="TTF", FontPath=variablePaths["WOFF2"], Containers=["WOFF2"], RemoveOverlap=removeOverlaps, AutoHint=autohint)
+                if variablePaths and TTFont:
+                    # Compile once, wrap the same font as WOFF and WOFF2
+                    webPaths = {"WOFF": variablePaths["WOFF"], "WOFF2": variablePaths["WOFF2"]}
+                    jobs.append(self.exportJob(instance, "Variable TTF/WOFF/WOFF2", variablePaths["TTF"], webPaths=webPaths, Format="TTF", **options))
+                elif variablePaths:
+                    jobs.append(self.exportJob(instance, "Variable TTF", variablePaths["TTF"], Format="TTF", **options))
+                    jobs.append(self.exportJob(instance, "Variable WOFF", variablePaths["WOFF"], Format="TTF", Containers=["WOFF"], **options))
+                    jobs.append(self.exportJob(instance, "Variable WOFF2", variablePaths["WOFF2"], Format="TTF", Containers=["WOFF2"], **options))
             elif formatType != "Variable" and instance.type == INSTANCETYPEVARIABLE:
                 continue
 
@@ -158,18 +1263,25 @@ class ExportToAllFormats:
 
             # Export logic based on format type
             if formatType == "OTF":
-                instance.generate(Format="OTF", FontPath=instancePath, RemoveOverlap=removeOverlaps, AutoHint=autohint)
+                jobs.append(self.exportJob(instance, "OTF", instancePath, Format="OTF", **options))
             elif formatType == "TTF":
-                instance.generate(Format="TTF", FontPath=instancePath, RemoveOverlap=removeOverlaps, AutoHint=autohint)
+                jobs.append(self.exportJob(instance, "TTF", instancePath, Format="TTF", **options))
             elif formatType == "WEB":
-                # Export WOFF
-                if woffPath:
-                    instance.generate(Format="TTF", FontPath=woffPath, Containers=["WOFF"], RemoveOverlap=removeOverlaps, AutoHint=autohint)
-                # Export WOFF2
-                if woff2Path:
-                    instance.generate(Format="TTF", FontPath=woff2Path, Containers=["WOFF2"], RemoveOverlap=removeOverlaps, AutoHint=autohint)
+                webPaths = {container: path for container, path in (("WOFF", woffPath), ("WOFF2", woff2Path)) if path}
+                if webPaths and TTFont:
+                    # Compile once in the chosen outline flavor, wrap it as WOFF and WOFF2
+                    jobs.append(self.exportJob(instance, "WOFF/WOFF2", None, webPaths=webPaths, Format=webFormat, **options))
+                else:
+                    # Export WOFF
+                    if woffPath:
+                        jobs.append(self.exportJob(instance, "WOFF", woffPath, Format=webFormat, Containers=["WOFF"], **options))
+                    # Export WOFF2
+                    if woff2Path:
+                        jobs.append(self.exportJob(instance, "WOFF2", woff2Path, Format=webFormat, Containers=["WOFF2"], **options))
             elif formatType == "Variable" and not variableOnly:
-                instance.generate(Format="TTF", FontPath=instancePath, RemoveOverlap=removeOverlaps, AutoHint=autohint)
+                jobs.append(self.exportJob(instance, "Variable", instancePath, Format="TTF", **options))
+
+        return jobs
 
 
 # Run the script
@@ -2,66 +2,297 @@
 # -*- coding: utf-8 -*-
 
 
+import itertools
+from collections import defaultdict
 from GlyphsApp import Glyphs
 import vanilla
 
+try:
+    # Used to interpolate all points of a glyph at once; without them every layer is reinterpolated by Glyphs
+    import numpy
+    from fontTools.varLib.models import VariationModel
+except ImportError:
+    numpy = None
+
 __doc__ = """
 Set Intermediate Layer.
+Adds intermediate (brace) layers to the selected glyphs, at one or many locations on any axes of the font.
+One location per line, e.g. “wght=800, wdth=75”; several values for an axis make a grid,
+e.g. “wght=300 500 700, wdth=75 100”. A bare number sets the first axis.
+Axes that are left out keep the location of the layer’s master.
+Compatible glyphs are interpolated all at once and rounded to the grid; every new location is checked once
+against Glyphs’ own interpolation, and locations outside the masters are always left to Glyphs.
 """
 
+INTERPOLATION_TOLERANCE = 1.0  # units a vectorized layer may differ from Glyphs’ reinterpolate() (grid rounding)
+
+
+def parseLocations(text, axes):
+    """List of {axis ID: value} locations from the dialog text, and the lines that could not be read."""
+    axisIds = {}
+    for axis in axes:
+        axisIds[axis.axisTag.lower()] = axis.axisId
+        axisIds[axis.name.lower()] = axis.axisId
+
+    locations = []
+    invalidLines = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            if "=" not in line:
+                locations.append({axes[0].axisId: float(line)})
+                continue
+            axisValues = []
+            for part in line.split(","):
+                axisName, values = part.split("=")
+                axisValues.append([(axisIds[axisName.strip().lower()], float(value)) for value in values.split()])
+            locations.extend(dict(combination) for combination in itertools.product(*axisValues))
+        except (ValueError, KeyError, IndexError):
+            invalidLines.append(line)
+    return locations, invalidLines
+
+
+def masterLocation(master, font):
+    """Design location of a master as {axis ID: value}."""
+    return {axis.axisId: value for axis, value in zip(font.axes, master.axes)}
+
+
+def isBraceLayer(layer):
+    return layer.isSpecialLayer and bool(layer.attributes["coordinates"])
+
+
+def layerLocation(layer, font):
+    """Design location of a master or brace layer as {axis ID: value}."""
+    location = masterLocation(font.masters[layer.associatedMasterId], font)
+    if not layer.isMasterLayer:
+        location.update(layer.attributes["coordinates"] or {})
+    return location
+
+
+def layerStructure(layer):
+    """Everything that has to match for two layers to be interpolated point by point."""
+    return (
+        tuple(tuple(node.type for node in path.nodes) for path in layer.paths),
+        tuple(sorted(anchor.name for anchor in layer.anchors)),
+        tuple(component.name for component in layer.components),
+    )
+
+
+def layerValues(layer):
+    """All interpolatable coordinates of a layer as one flat array."""
+    values = [value for path in layer.paths for node in path.nodes for value in (node.position.x, node.position.y)]
+    for anchor in sorted(layer.anchors, key=lambda anchor: anchor.name):
+        values.extend((anchor.position.x, anchor.position.y))
+    for component in layer.components:
+        values.extend(tuple(component.transform))
+    values.append(layer.width)
+    return numpy.array(values, dtype=numpy.float64)
+
+
+def roundToGrid(values, structure, gridLength):
+    """A layerValues() array of a layer with the given structure, rounded to the grid like Glyphs’ own interpolation:
+    points, anchors, component offsets and the width. Component scales are kept; a grid of 0 rounds nothing."""
+    if not gridLength:
+        return values
+    pointValues = 2 * (sum(len(nodeTypes) for nodeTypes in structure[0]) + len(structure[1]))
+    indexes = list(range(pointValues))
+    for i in range(len(structure[2])):
+        indexes.extend((pointValues + 6 * i + 4, pointValues + 6 * i + 5))
+    indexes.append(len(values) - 1)
+    rounded = values.copy()
+    rounded[indexes] = numpy.round(values[indexes] / gridLength) * gridLength
+    return rounded
+
+
+def setLayerValues(layer, values):
+    """Write an array made by layerValues back into a layer of the same structure."""
+    offset = 2 * (sum(len(path.nodes) for path in layer.paths) + len(layer.anchors))
+    points = iter(values[:offset].reshape(-1, 2).tolist())
+    for path in layer.paths:
+        for node in path.nodes:
+            node.position = tuple(next(points))
+    for anchor in sorted(layer.anchors, key=lambda anchor: anchor.name):
+        anchor.position = tuple(next(points))
+    for component in layer.components:
+        component.transform = tuple(values[offset:offset + 6].tolist())
+        offset += 6
+    layer.width = float(values[-1])
+
+
+class GlyphInterpolator(object):
+    """Interpolates all layers of one glyph from its compatible master and brace layers."""
+
+    def __init__(self, glyph, font, axisRanges):
+        self.axisRanges = axisRanges
+        self.structure = None
+        self.model = None
+        sources = [layer for layer in glyph.layers if layer.isMasterLayer or isBraceLayer(layer)]
+        structures = {layerStructure(layer) for layer in sources}
+        if len(structures) != 1:
+            return
+        self.structure = structures.pop()
+        locations = [self.normalize(layerLocation(layer, font)) for layer in sources]
+        if len(set(tuple(sorted(location.items())) for location in locations)) != len(locations):
+            return
+        self.model = VariationModel(locations)
+        self.deltas = self.model.getDeltas([layerValues(layer) for layer in sources])
+        # Glyphs with sources at the same locations share the interpolation weights at every location
+        self.sourcesKey = tuple(sorted(tuple(sorted(location.items())) for location in locations))
+        self.isStatic = not any(numpy.any(delta) for delta in self.deltas[1:])  # looks the same everywhere
+
+    def normalize(self, location):
+        """Location mapped to -1…1 per axis (master minimum, default, maximum), clamped to that range."""
+        normalized = {}
+        for axisId, value in location.items():
+            minimum, default, maximum = self.axisRanges[axisId]
+            if value < default:
+                value = (value - default) / (default - minimum) if default != minimum else 0.0
+            else:
+                value = (value - default) / (maximum - default) if maximum != default else 0.0
+            normalized[axisId] = max(-1.0, min(1.0, value))
+        return normalized
+
+    def inRange(self, location):
+        """True if the location lies within the masters on every axis; outside, Glyphs extrapolates and the model would not."""
+        return all(self.axisRanges[axisId][0] <= value <= self.axisRanges[axisId][2] for axisId, value in location.items())
+
+    def canInterpolate(self, layer, location):
+        return bool(self.model) and self.inRange(location) and layerStructure(layer) == self.structure
+
+    def checkKey(self, location):
+        """Key under which a location is compared with Glyphs’ interpolation once for all glyphs with the same sources."""
+        return self.sourcesKey, tuple(sorted(self.normalize(location).items()))
+
+    def interpolate(self, location, gridLength=0):
+        return roundToGrid(self.model.interpolateFromDeltas(self.normalize(location), self.deltas), self.structure, gridLength)
+
 
 class UserInputDialog(object):
     def __init__(self):
-        self.w = vanilla.FloatingWindow((200, 70), "Input Value")
-        self.w.textBox = vanilla.EditText((10, 10, -10, 20), "800")
-        self.w.okButton = vanilla.Button((10, 40, -10, 20), "OK", callback=self.okCallback)
+        self.w = vanilla.FloatingWindow((300, 170), "Intermediate Layers")
+        self.w.textBox = vanilla.TextEditor((10, 10, -10, 80), "800")
+        self.w.helpText = vanilla.TextBox((10, 95, -10, 34), "One location per line: wght=800, wdth=75\nGrid: wght=300 500 700, wdth=75 100", sizeStyle="small")
+        self.w.okButton = vanilla.Button((10, 140, -10, 20), "OK", callback=self.okCallback)
         self.w.open()
 
     def okCallback(self, sender):
-        try:
-            self.user_input = int(self.w.textBox.get())
-        except ValueError:
-            self.user_input = 700  # Default to 700 if invalid input
+        font = Glyphs.font
+        self.locations, invalidLines = parseLocations(self.w.textBox.get(), font.axes)
+        for line in invalidLines:
+            print(f"Set Intermediate Layer: could not read “{line}”")
         self.w.close()
 
         # Now, run the rest of your script with the user input
-        self.runScript()
+        if self.locations:
+            self.runScript()
+
+    def axisRanges(self, font):
+        """(minimum, default, maximum) per axis ID; the first master is the default."""
+        axisRanges = {}
+        for i, axis in enumerate(font.axes):
+            values = [master.axes[i] for master in font.masters]
+            axisRanges[axis.axisId] = (min(values), font.masters[0].axes[i], max(values))
+        return axisRanges
+
+    def newLayers(self, layer, font, interpolator):
+        """New brace layers for all locations, interpolated at once if the glyph is compatible."""
+        glyph = layer.parent
+        baseLocation = masterLocation(font.masters[layer.associatedMasterId], font)
+        existing = {tuple(sorted(layerLocation(otherLayer, font).items())) for otherLayer in glyph.layers if otherLayer.isMasterLayer or isBraceLayer(otherLayer)}
+        newLayers = []
+        for location in self.locations:
+            fullLocation = dict(baseLocation, **location)
+            key = tuple(sorted(fullLocation.items()))
+            if key in existing:
+                continue  # a master or brace layer is already there
+            existing.add(key)
+
+            # Duplicate the selected layer
+            newLayer = layer.copy()
+            newLayer.name = "{%s}" % ", ".join("%g" % value for value in fullLocation.values())
+
+            # Set the custom attribute "coordinates" with the user input
+            newLayer.attributes["coordinates"] = fullLocation
+            newLayers.append((newLayer, fullLocation))
+
+        # Add the new layers to the glyph's layers, interpolated in one undo step
+        glyph.beginUndo()
+        for newLayer, fullLocation in newLayers:
+            glyph.layers.append(newLayer)
+            if interpolator and interpolator.canInterpolate(newLayer, fullLocation):
+                checkKey = interpolator.checkKey(fullLocation)
+                agrees = self.checkedLocations.get(checkKey)
+                if agrees is None and not interpolator.isStatic:
+                    # The first glyph at each location is also interpolated by Glyphs, and keeps that result;
+                    # where the two disagree, Glyphs interpolates that location for every glyph with the same sources
+                    newLayer.reinterpolate()
+                    values = interpolator.interpolate(fullLocation, font.gridLength)
+                    agrees = numpy.abs(layerValues(newLayer) - values).max() <= INTERPOLATION_TOLERANCE
+                    self.checkedLocations[checkKey] = agrees
+                    if not agrees:
+                        self.differentLocations.setdefault(checkKey[1], (fullLocation, []))[1].append(glyph.name)
+                    continue
+                if agrees is False:
+                    self.differentLocations.setdefault(checkKey[1], (fullLocation, []))[1].append(glyph.name)
+                    newLayer.reinterpolate()
+                    continue
+                setLayerValues(newLayer, interpolator.interpolate(fullLocation, font.gridLength))
+            else:
+                # Re-interpolate the new layer
+                newLayer.reinterpolate()
+        glyph.endUndo()
+        return [newLayer for newLayer, fullLocation in newLayers]
 
     def runScript(self):
         font = Glyphs.font
         currentTab = font.currentTab
+        axisRanges = self.axisRanges(font)
+        self.checkedLocations = {}  # GlyphInterpolator.checkKey(): True if the model agrees with Glyphs’ interpolation
+        self.differentLocations = {}  # normalized location: (design location, glyphs Glyphs interpolated there because the model differs)
 
         # Store the existing layers in the current tab (to keep the view)
         if currentTab:
             existingLayers = list(currentTab.layers)  # Copy the existing layers
 
-        # Loop through each selected glyph
-        for i, layer in enumerate(font.selectedLayers):
-            glyph = layer.parent
-
-            # Duplicate the selected layer
-            newLayer = layer.copy()
-
-            # Add the new layer to the glyph's layers
-            glyph.layers.append(newLayer)
-
-            # Name the new layer "New Layer"
-            newLayer.name = "New Layer"
+        font.disableUpdateInterface()
+        try:
+            # Loop through each selected glyph
+            interpolators = {}
+            incompatibleGlyphs = []
+            replacements = {}  # glyph name: new layer shown in the tab
+            for i, layer in enumerate(font.selectedLayers):
+                glyph = layer.parent
+                if numpy is not None and glyph.name not in interpolators:
+                    interpolators[glyph.name] = GlyphInterpolator(glyph, font, axisRanges)
+                    if not interpolators[glyph.name].model:
+                        incompatibleGlyphs.append(glyph.name)
+                newLayers = self.newLayers(layer, font, interpolators.get(glyph.name))
 
-            # Set the custom attribute "coordinates" with the user input
-            newLayer.attributes["coordinates"] = {"a01": self.user_input}
+                if newLayers:
+                    replacements[glyph.name] = newLayers[-1]
+        finally:
+            font.enableUpdateInterface()
 
-            # Re-interpolate the new layer
-            newLayer.reinterpolate()
+        if incompatibleGlyphs:
+            print("Set Intermediate Layer: reinterpolated by Glyphs (incompatible masters): " + ", ".join(incompatibleGlyphs))
+        axisNames = {axis.axisId: axis.name for axis in font.axes}
+        for location, glyphNames in self.differentLocations.values():
+            locationText = ", ".join("%s=%g" % (axisNames[axisId], value) for axisId, value in location.items())
+            print(f"Set Intermediate Layer: reinterpolated by Glyphs at {locationText} (its interpolation differs): " + ", ".join(glyphNames))
 
-            # Update the existing layer in its original position
-            if currentTab:
-                for j, existingLayer in enumerate(existingLayers):
-                    if existingLayer.parent == glyph:
-                        existingLayers[j] = newLayer  # Replace the original layer with the new one
+        # Update the existing layers in their original positions, found through a glyph → positions index
+        if currentTab and replacements:
+            positions = defaultdict(list)
+            for j, existingLayer in enumerate(existingLayers):
+                if existingLayer.parent:  # newlines and other control layers have no glyph
+                    positions[existingLayer.parent.name].append(j)
+            for glyphName, newLayer in replacements.items():
+                for j in positions.get(glyphName, ()):
+                    existingLayers[j] = newLayer  # Replace the original layer with the new one
 
-        # Reassign the modified list back to the current tab to keep the original order
-        if currentTab:
+            # Reassign the modified list back to the current tab to keep the original order
             currentTab.layers = existingLayers
 
         # Update the UI to reflect the change
@@ -0,0 +1,216 @@
+# MenuTitle: Kerning Group Audit
+# -*- coding: utf-8 -*-
+from __future__ import division, print_function, unicode_literals
+
+__doc__ = """
+Audits the kerning groups and kerning of the frontmost font, reported in the Macro Window.
+Lists exported glyphs without a kerning group, groups with a single member,
+exceptions that repeat their class kerning or could be folded into one class pair,
+and estimates the size of the compiled GPOS pair kerning (PairPos subtables) of every master.
+"""
+
+from collections import defaultdict
+from GlyphsApp import Glyphs
+
+LEFT_PREFIX, RIGHT_PREFIX = "@MMK_L_", "@MMK_R_"
+SUBTABLE_LIMIT = 0xFFFF  # PairPos offsets are 16 bit, larger subtables have to be split
+VALUE_RECORD_SIZE = 2  # XAdvance only
+MAX_LISTED = 30  # longest list printed per finding
+
+
+def glyphForKey(font, key):
+    """The glyph of a kerning key that is not a group (a glyph ID in Glyphs 3, a glyph name before)."""
+    glyph = font.glyphForId_(key) if hasattr(font, "glyphForId_") else None
+    return glyph or font.glyphs[key]
+
+
+def kerningMatrix(font, master):
+    """Sparse kerning matrix of a master: (left key, right key) → value.
+    Group keys are kept as @MMK_L_/@MMK_R_ names, glyph keys are resolved to glyph names."""
+    matrix = {}
+    names = {}
+    for leftKey, pairs in (font.kerning.get(master.id) or {}).items():
+        for rightKey, value in pairs.items():
+            keys = []
+            for key in (leftKey, rightKey):
+                if not key.startswith("@"):
+                    if key not in names:
+                        glyph = glyphForKey(font, key)
+                        names[key] = glyph.name if glyph else None
+                    key = names[key]
+                keys.append(key)
+            if None not in keys:
+                matrix[tuple(keys)] = value
+    return matrix
+
+
+def kerningGroups(glyphs):
+    """Group members per kerning key: @MMK_L_ keys are right-side groups, @MMK_R_ keys left-side groups."""
+    groups = defaultdict(list)
+    for glyph in glyphs:
+        if glyph.rightKerningGroup:
+            groups[LEFT_PREFIX + glyph.rightKerningGroup].append(glyph.name)
+        if glyph.leftKerningGroup:
+            groups[RIGHT_PREFIX + glyph.leftKerningGroup].append(glyph.name)
+    return groups
+
+
+def classKey(glyph, prefix):
+    """Group kerning key a glyph falls back to on one side of a pair, or None."""
+    group = glyph.rightKerningGroup if prefix == LEFT_PREFIX else glyph.leftKerningGroup
+    return prefix + group if group else None
+
+
+def classValue(matrix, glyphs, leftKey, rightKey):
+    """Value a pair gets from class kerning alone, 0 if there is no class pair."""
+    leftClass = leftKey if leftKey.startswith("@") else classKey(glyphs[leftKey], LEFT_PREFIX)
+    rightClass = rightKey if rightKey.startswith("@") else classKey(glyphs[rightKey], RIGHT_PREFIX)
+    if leftClass and rightClass:
+        return matrix.get((leftClass, rightClass), 0)
+    return 0
+
+
+def auditExceptions(matrices, glyphs, groups):
+    """Exceptions that equal their class value in every master (redundant), and exceptions
+    that every member of a group shares with the same value in every master (foldable into one class pair)."""
+    exceptions = set()
+    for matrix in matrices.values():
+        exceptions.update(pair for pair in matrix if not (pair[0].startswith("@") and pair[1].startswith("@")))
+
+    redundant = []
+    for pair in sorted(exceptions):
+        if all(matrix[pair] == classValue(matrix, glyphs, *pair) for matrix in matrices.values() if pair in matrix):
+            redundant.append(pair)
+
+    foldable = []
+    for side, prefix in ((0, LEFT_PREFIX), (1, RIGHT_PREFIX)):
+        candidates = defaultdict(set)
+        for pair in exceptions:
+            if pair[side].startswith("@"):
+                continue
+            key = classKey(glyphs[pair[side]], prefix)
+            if key and len(groups[key]) > 1:
+                otherKey = pair[1 - side]
+                candidates[(key, otherKey)].add(pair[side])
+        for (key, otherKey), members in sorted(candidates.items()):
+            if len(members) != len(groups[key]):
+                continue
+            pairs = [(member, otherKey) if side == 0 else (otherKey, member) for member in members]
+            if all(len({matrix.get(pair) for pair in pairs}) == 1 for matrix in matrices.values()):
+                foldable.append(((key, otherKey) if side == 0 else (otherKey, key), len(members)))
+    return redundant, foldable
+
+
+def coverageSize(glyphIDs):
+    """Bytes of the smaller of the two Coverage table formats."""
+    glyphIDs = sorted(glyphIDs)
+    ranges = sum(1 for i, glyphID in enumerate(glyphIDs) if i == 0 or glyphID != glyphIDs[i - 1] + 1)
+    return min(4 + 2 * len(glyphIDs), 4 + 6 * ranges)
+
+
+def classDefSize(glyphClasses):
+    """Bytes of the smaller of the two ClassDef table formats, for glyph ID → class (class 0 is left out)."""
+    glyphIDs = sorted(glyphID for glyphID, glyphClass in glyphClasses.items() if glyphClass)
+    if not glyphIDs:
+        return 4
+    ranges = sum(1 for i, glyphID in enumerate(glyphIDs) if i == 0 or glyphID != glyphIDs[i - 1] + 1 or glyphClasses[glyphID] != glyphClasses[glyphIDs[i - 1]])
+    return min(6 + 2 * (glyphIDs[-1] - glyphIDs[0] + 1), 4 + 6 * ranges)
+
+
+def pairPosSize(matrix, groups, glyphOrder):
+    """Estimated bytes and subtable count of the PairPos lookup compiled from a kerning matrix:
+    glyph pairs go into format 1 subtables, class pairs into format 2 subtables,
+    both split whenever a subtable would overflow its 16 bit offsets."""
+    glyphPairs = defaultdict(set)
+    classPairs = defaultdict(set)
+    for leftKey, rightKey in matrix:
+        if leftKey.startswith("@") and rightKey.startswith("@"):
+            classPairs[leftKey].add(rightKey)
+        else:
+            # Pairs with one group side are written out for every member of the group
+            for leftName in groups.get(leftKey, ()) if leftKey.startswith("@") else (leftKey,):
+                for rightName in groups.get(rightKey, ()) if rightKey.startswith("@") else (rightKey,):
+                    if leftName in glyphOrder and rightName in glyphOrder:
+                        glyphPairs[leftName].add(rightName)
+
+    # Format 1: one pair set per left glyph, in glyph order; split on the size with a glyph list coverage
+    # (an upper bound of the coverage), exact sizes once a subtable is closed
+    subtables = []
+    currentGlyphs, pairSets = [], 0
+    for leftName in sorted(glyphPairs, key=glyphOrder.get):
+        pairSet = 2 + 2 + len(glyphPairs[leftName]) * (2 + VALUE_RECORD_SIZE)
+        if currentGlyphs and 10 + pairSets + pairSet + 4 + 2 * (len(currentGlyphs) + 1) > SUBTABLE_LIMIT:
+            subtables.append(10 + pairSets + coverageSize(glyphOrder[name] for name in currentGlyphs))
+            currentGlyphs, pairSets = [], 0
+        currentGlyphs.append(leftName)
+        pairSets += pairSet
+    if currentGlyphs:
+        subtables.append(10 + pairSets + coverageSize(glyphOrder[name] for name in currentGlyphs))
+
+    def classSubtableSize(leftKeys):
+        rightKeys = set().union(*(classPairs[key] for key in leftKeys))
+        leftClasses = {glyphOrder[name]: i + 1 for i, key in enumerate(leftKeys) for name in groups.get(key, ()) if name in glyphOrder}
+        rightClasses = {glyphOrder[name]: i + 1 for i, key in enumerate(sorted(rightKeys)) for name in groups.get(key, ()) if name in glyphOrder}
+        records = (len(leftKeys) + 1) * (len(rightKeys) + 1) * VALUE_RECORD_SIZE
+        return 16 + records + coverageSize(leftClasses) + classDefSize(leftClasses) + classDefSize(rightClasses)
+
+    # Greedy split on an upper bound that is cheap to update, exact sizes once a subtable is closed
+    currentKeys, rightKeys, leftGlyphs = [], set(), 0
+    for leftKey in sorted(classPairs):
+        newRightKeys = rightKeys | classPairs[leftKey]
+        newLeftGlyphs = leftGlyphs + len(groups.get(leftKey, ()))
+        rightGlyphs = sum(len(groups.get(key, ())) for key in newRightKeys)
+        bound = 16 + (len(currentKeys) + 2) * (len(newRightKeys) + 1) * VALUE_RECORD_SIZE + 8 * newLeftGlyphs + 6 * rightGlyphs + 12
+        if currentKeys and bound > SUBTABLE_LIMIT:
+            subtables.append(classSubtableSize(currentKeys))
+            currentKeys, newRightKeys, newLeftGlyphs = [], set(classPairs[leftKey]), len(groups.get(leftKey, ()))
+        currentKeys.append(leftKey)
+        rightKeys, leftGlyphs = newRightKeys, newLeftGlyphs
+    if currentKeys:
+        subtables.append(classSubtableSize(currentKeys))
+
+    # Lookup table with its subtable offsets
+    return 6 + 2 * len(subtables) + sum(subtables), len(subtables)
+
+
+def printList(title, items):
+    print("%s: %i" % (title, len(items)))
+    for item in items[:MAX_LISTED]:
+        print("    %s" % item)
+    if len(items) > MAX_LISTED:
+        print("    … %i more" % (len(items) - MAX_LISTED))
+
+
+def auditKerning(font):
+    exportGlyphs = [glyph for glyph in font.glyphs if glyph.export]
+    glyphs = {glyph.name: glyph for glyph in font.glyphs}
+    glyphOrder = {glyph.name: glyphID for glyphID, glyph in enumerate(exportGlyphs)}
+    groups = kerningGroups(exportGlyphs)
+    matrices = {master.name: kerningMatrix(font, master) for master in font.masters}
+
+    print("Kerning Group Audit: %s\n" % font.familyName)
+
+    # Glyphs and groups
+    printList("Glyphs without left group", [glyph.name for glyph in exportGlyphs if not glyph.leftKerningGroup])
+    printList("Glyphs without right group", [glyph.name for glyph in exportGlyphs if not glyph.rightKerningGroup])
+    singletons = sorted("%s (%s)" % (key[len(LEFT_PREFIX):], "right side" if key.startswith(LEFT_PREFIX) else "left side") for key, members in groups.items() if len(members) == 1)
+    printList("Single-member groups", singletons)
+
+    # Exceptions
+    redundant, foldable = auditExceptions(matrices, glyphs, groups)
+    printList("Exceptions equal to their class kerning in all masters", ["%s %s" % pair for pair in redundant])
+    printList("Exceptions shared by a whole group (fold into one class pair)", ["%s %s (%i exceptions)" % (pair[0], pair[1], count) for pair, count in foldable])
+
+    # Compiled size
+    print("\nEstimated GPOS pair kerning size per master:")
+    for masterName, matrix in matrices.items():
+        classPairs = sum(1 for left, right in matrix if left.startswith("@") and right.startswith("@"))
+        size, subtables = pairPosSize(matrix, groups, glyphOrder)
+        print("    %s: %i class pairs, %i exceptions, ~%.1f KB in %i subtables" % (masterName, classPairs, len(matrix) - classPairs, size / 1024, subtables))
+
+
+Glyphs.clearLog()
+thisFont = Glyphs.font  # frontmost font
+if thisFont:
+    Glyphs.showMacroWindow()
+    auditKerning(thisFont)
@@ -3,45 +3,72 @@
 from __future__ import division, print_function, unicode_literals
 
 __doc__ = """
-Opens a new tab containing all members of the left and right kerning groups of the current glyph.
+Opens a new tab containing all members of the left and right kerning groups of the selected glyphs.
+The group members of all selected glyphs are looked up in one index, kept on the font until a glyph or a group changes.
 """
 
 from GlyphsApp import Glyphs, Message
 
+INDEX_KEY = "SameKerningGroupsIndex"
+
+
+def buildGroupIndex(names, leftGroups, rightGroups):
+    """Group name → member names, per side, from the glyph names and their groups in glyph order.
+    Glyphs without a group have None (or NSNull) there."""
+    index = {"left": {}, "right": {}}
+    for name, leftGroup, rightGroup in zip(names, leftGroups, rightGroups):
+        if isinstance(leftGroup, str) and leftGroup:
+            index["left"].setdefault(leftGroup, []).append(name)
+        if isinstance(rightGroup, str) and rightGroup:
+            index["right"].setdefault(rightGroup, []).append(name)
+    return index
+
+
+def groupIndex(font):
+    """The group index of a font, cached in its tempData.
+    The font has no change count for kerning groups, so the cache is keyed by its inputs: the names and both groups
+    of all glyphs, each collected as one array and compared with the cached one on the Objective-C side
+    (valueForKey_, isEqualToArray_), without reading the glyphs one by one through the bridge.
+    The index is only built again when one of them changed."""
+    glyphs = font.pyobjc_instanceMethods.glyphs()
+    key = [glyphs.valueForKey_(attribute) for attribute in ("name", "leftKerningGroup", "rightKerningGroup")]
+    cached = font.tempData[INDEX_KEY]
+    if cached is not None and all(array.isEqualToArray_(cachedArray) for array, cachedArray in zip(key, cached[0])):
+        return cached[1]
+    index = buildGroupIndex(*key)
+    font.tempData[INDEX_KEY] = (key, index)
+    return index
+
+
 thisFont = Glyphs.font  # frontmost font
-thisGlyph = thisFont.selectedLayers[0].parent
-
-if thisGlyph:
-    leftGroup = thisGlyph.leftKerningGroup
-    rightGroup = thisGlyph.rightKerningGroup
-
-    leftGroupText = ""
-    rightGroupText = ""
-
-    # Check if the left kerning group is not empty
-    if leftGroup:
-        leftGroupText = "L: "
-        for g in thisFont.glyphs:
-            if g.leftKerningGroup == leftGroup and g != thisGlyph:
-                leftGroupText += "/%s " % g.name
-
-    # Check if the right kerning group is not empty
-    if rightGroup:
-        rightGroupText = "R: "
-        for g in thisFont.glyphs:
-            if g.rightKerningGroup == rightGroup and g != thisGlyph:
-                rightGroupText += "/%s " % g.name
-
-    # Create the new tab content
-    tabText = "/%s\n" % thisGlyph.name
-    if leftGroupText.strip() != "L:":
-        tabText += leftGroupText.strip() + "\n"
-    if rightGroupText.strip() != "R:":
-        tabText += rightGroupText.strip() + "\n"
-
-    if tabText.strip() != "/%s" % thisGlyph.name:
-        thisFont.newTab(tabText)
-    else:
+selectedGlyphs = {}  # glyph name: glyph, in selection order
+for selectedLayer in thisFont.selectedLayers if thisFont else ():
+    if selectedLayer.parent:
+        selectedGlyphs.setdefault(selectedLayer.parent.name, selectedLayer.parent)
+
+if selectedGlyphs:
+    index = groupIndex(thisFont)
+
+    # Create the new tab content, one block per selected glyph
+    lines = []
+    for thisGlyph in selectedGlyphs.values():
+        glyphLines = []
+        for side, prefix in (("left", "L: "), ("right", "R: ")):
+            groupName = getattr(thisGlyph, side + "KerningGroup")
+            if not groupName:
+                continue
+            members = [name for name in index[side].get(groupName, ()) if name != thisGlyph.name]
+            if members:
+                glyphLines.append(prefix + " ".join("/%s" % name for name in members))
+        if glyphLines:
+            lines.append("/%s" % thisGlyph.name)
+            lines.extend(glyphLines)
+
+    if lines:
+        thisFont.newTab("\n".join(lines) + "\n")
+    elif len(selectedGlyphs) == 1:
         Message(title="No Kerning Groups", message="The selected glyph does not belong to any kerning group.", OKButton=None)
+    else:
+        Message(title="No Kerning Groups", message="None of the selected glyphs belongs to a kerning group.", OKButton=None)
 else:
     Message(title="Script Error", message="No glyph currently selected.", OKButton=None)
@@ -3,49 +3,396 @@
 
 __doc__ = """
 Point Counter.
+Counts paths, nodes, handles and lines of the master layers of the selected glyphs, or of the whole font.
+Click a column header to sort, export the table as CSV or JSON.
+The counts stay open as a live panel: edited glyphs are recounted as you draw.
+With “Compiled bytes” on, every glyph is also compiled to a TrueType glyf entry and a CFF charstring,
+for the masters or for the interpolated instances; the heaviest glyphs are flagged.
+Master outlines are read from a font snapshot kept between runs, so only edited glyphs are read again.
 """
 
-from GlyphsApp import Glyphs
+import os
+import csv
+import json
+import math
+import bisect
+import statistics
+from GlyphsApp import Glyphs, UPDATEINTERFACE, INSTANCETYPEVARIABLE
+from rbHelpers import componentGraph
+from rbHelpers.fontSnapshot import LayerRecord, fontSnapshot, nodeTypes
+from vanilla.dialogs import putFile
 import vanilla
 
-font = Glyphs.font
-
-# Initialize a list to store the results
-results = []
-
-# Iterate through selected layers in the font
-for selection in font.selectedLayers:
-    # Iterate through layers of the selected glyph
-    for layer in selection.parent.layers:
-        # Process only master layers
-        if not layer.isMasterLayer:
-            continue
-
-        # Initialize counters
-        countPaths = len(layer.paths)
-        countOffcurves = 0
-        countCurves = 0
-        countLines = 0
-
-        # Iterate through paths in the layer
-        for path in layer.paths:
-            for node in path.nodes:
-                if node.type == "offcurve":
-                    countOffcurves += 1
-                elif node.type == "curve":
-                    countCurves += 1
-                elif node.type == "line":
-                    countLines += 1
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    # Used to compile outlines in memory for the byte cost columns
+    from fontTools.pens.recordingPen import RecordingPen
+    from fontTools.pens.ttGlyphPen import TTGlyphPen
+    from fontTools.pens.t2CharStringPen import T2CharStringPen
+    from fontTools.pens.cu2quPen import Cu2QuPen
+except ImportError:
+    RecordingPen = None
+
+# Node types as stored by nodeTypes()
+LINE, CURVE, OFFCURVE = 1, 2, 3
+
+COLUMNS = ["Glyph", "Layer", "Paths", "Points", "Handles", "Nodes", "Lines", "Curves", "glyf bytes", "CFF bytes", "Heavy"]
+TOTALS = ["Paths", "Points", "Handles", "Nodes", "Lines", "Curves"]
+BYTE_COLUMNS = ["glyf bytes", "CFF bytes"]
+HEAVY_DEVIATIONS = 3  # glyphs this many standard deviations above the mean byte cost are flagged
+
+
+def countNodeTypes(types):
+    """Counts of lines, curves and handles in a node type array."""
+    if numpy is None:
+        return types.count(LINE), types.count(CURVE), types.count(OFFCURVE)
+    counts = numpy.bincount(types, minlength=4)
+    return int(counts[LINE]), int(counts[CURVE]), int(counts[OFFCURVE])
+
+
+def compiledSizes(layer):
+    """Bytes of the layer compiled as a TrueType glyf entry and as an (unsubroutinized) CFF charstring.
+    Component-only glyphs are measured as TrueType composites; CFF has no composites, so they are decomposed there."""
+    decomposedLayer = layer.copyDecomposedLayer() if layer.components else layer
+    recording = RecordingPen()
+    decomposedLayer.draw(recording)
+
+    # CFF: cubic outlines as a Type 2 charstring
+    charStringPen = T2CharStringPen(layer.width, None)
+    recording.replay(charStringPen)
+    charString = charStringPen.getCharString()
+    charString.compile()
+    cffBytes = len(charString.bytecode)
+
+    # TrueType: composite record per component, or quadratic outlines
+    if layer.components and not layer.paths:
+        glyfBytes = 10
+        for component in layer.components:
+            a, b, c, d, x, y = tuple(component.transform)
+            scaleBytes = 0 if (a, b, c, d) == (1, 0, 0, 1) else (2 if a == d and b == c == 0 else (4 if b == c == 0 else 8))
+            glyfBytes += 8 + scaleBytes
+    else:
+        glyphPen = TTGlyphPen(None)
+        recording.replay(Cu2QuPen(glyphPen, max_err=1.0, reverse_direction=True))
+        glyph = glyphPen.glyph()
+        glyfBytes = len(glyph.compile(None)) if glyph.numberOfContours else 0
+    glyfBytes += -glyfBytes % 4  # glyf entries are padded to 4 bytes
+    return glyfBytes, cffBytes
+
+
+def heavyThreshold(values):
+    """Byte cost above which a glyph counts as one of the heaviest outliers."""
+    if len(values) < 2:
+        return None
+    if numpy is not None:
+        values = numpy.asarray(values, dtype=numpy.float64)
+        return float(values.mean() + HEAVY_DEVIATIONS * values.std())
+    return statistics.mean(values) + HEAVY_DEVIATIONS * statistics.pstdev(values)
+
+
+def runningThreshold(count, total, squares):
+    """heavyThreshold() from the count, sum and sum of squares of the values, kept up to date as rows change."""
+    if count < 2:
+        return None
+    mean = total / count
+    return mean + HEAVY_DEVIATIONS * math.sqrt(max(0.0, squares / count - mean * mean))
+
+
+def heavyIndex(values, threshold):
+    """Index of the first (byte count, key) in a sorted list that is above the threshold."""
+    if threshold is None:
+        return len(values)
+    return bisect.bisect_left(values, (math.floor(threshold) + 1,))
+
+
+class PointCounter(object):
+    def __init__(self):
+        self.font = Glyphs.font
+        self.snapshot = fontSnapshot(self.font, complete=False) if self.font else None
+        self.graph = componentGraph(self.font) if self.font else None
+        self.glyphStamps = {}  # glyph name: str(lastChange) when the glyph was last seen
+        self.cache = {}  # glyph name: {layer key: (change stamp, row)}
+        self.instanceFonts = {}  # instance properties: ({glyph name: change stamp}, interpolated font)
+        self.rows = []
+        self.rowIndex = {}  # (glyph name, layer key): index in self.rows
+        self.rowKeys = {}  # glyph name: its keys in self.rowIndex
+        self.totals = dict.fromkeys(TOTALS, 0)  # and the byte columns while they are shown
+        self.squares = {}  # byte column: sum of the squared byte counts
+        self.byteValues = {}  # byte column: sorted (byte count, key) of all rows, while the byte columns are shown
+        self.thresholds = {}  # byte column: heavy threshold
+        self.heavyCount = 0
+
+        self.w = vanilla.Window((700, 400), "Point Counter", minSize=(600, 250))
+        self.w.scope = vanilla.PopUpButton((10, 10, 140, 20), ["Selected glyphs", "All glyphs"], callback=self.countCallback)
+        self.w.source = vanilla.PopUpButton((160, 10, 100, 20), ["Masters", "Instances"], callback=self.countCallback)
+        self.w.profileBytes = vanilla.CheckBox((270, 10, 140, 20), "Compiled bytes", value=False, callback=self.countCallback)
+        self.w.profileBytes.enable(RecordingPen is not None)
+        self.w.exportCSV = vanilla.Button((-200, 10, 90, 20), "Export CSV", callback=self.exportCSV)
+        self.w.exportJSON = vanilla.Button((-100, 10, -10, 20), "Export JSON", callback=self.exportJSON)
+        self.w.table = vanilla.List(
+            (10, 40, -10, -35),
+            [],
+            columnDescriptions=[{"title": title, "key": title} for title in COLUMNS],
+            allowsSorting=True,
+        )
+        self.w.total = vanilla.TextBox((10, -27, -10, 17), "", sizeStyle="small")
+
+        self.countCallback(None)
+        self.w.bind("close", self.windowClosed)
+        self.w.open()
+        Glyphs.addCallback(self.layersChanged, UPDATEINTERFACE)
+
+    def windowClosed(self, sender):
+        Glyphs.removeCallback(self.layersChanged)
+        self.saveSnapshot()
+
+    def changeStamp(self, glyph):
+        """Changes whenever the glyph is edited or the byte columns are switched."""
+        return (str(glyph.lastChange), bool(self.w.profileBytes.get()))
+
+    def instanceProperties(self, instance):
+        """Everything about an instance that changes its interpolated outlines or its rows."""
+        return (instance.name, tuple(instance.axes), bool(instance.active), instance.type)
+
+    def interpolatedFont(self, instance, properties, glyphStamps):
+        """The interpolated font of an instance, built again only if the instance or one of the glyphs
+        (the counted glyphs and their components) changed since."""
+        cached = self.instanceFonts.get(properties)
+        if cached is None or any(cached[0].get(name) != stamp for name, stamp in glyphStamps.items()):
+            cached = (glyphStamps, instance.interpolatedFont)
+            self.instanceFonts[properties] = cached
+        return cached[1]
+
+    def saveSnapshot(self):
+        """Write the snapshot once, when the panel closes; it rewrites every glyph."""
+        try:
+            self.snapshot.save()
+        except OSError as e:
+            print(f"Point Counter: could not save the font snapshot: {e}")
+
+    def glyphsChanged(self, glyphs):
+        """Note the glyphs edited since they were last seen and drop the cached rows of every glyph affected:
+        the edited glyphs and all glyphs using them as components, whose compiled bytes measure the decomposed outlines.
+        Returns the names of the affected glyphs."""
+        changedNames = set()
+        for glyph in glyphs:
+            stamp = str(glyph.lastChange)
+            if self.graph.stamps.get(glyph.name) != stamp:
+                self.graph.glyphChanged(glyph)
+            if self.glyphStamps.setdefault(glyph.name, stamp) != stamp:
+                self.glyphStamps[glyph.name] = stamp
+                changedNames.add(glyph.name)
+        affectedNames = self.graph.affectedGlyphs(changedNames) if changedNames else set()
+        for name in affectedNames:
+            self.cache.pop(name, None)
+        return affectedNames
+
+    def countLayer(self, layer, key, stamp, layerName):
+        """Row with the counts of a layer, recounted only if the stamp changed since the last count
+        (or glyphsChanged() dropped it). The layer is a live layer, or the snapshot record of a master layer."""
+        cached = self.cache.get(key[0], {}).get(key[1])
+        if cached and cached[0] == stamp:
+            return cached[1]
+
+        if isinstance(layer, LayerRecord):
+            types, pathCount = layer.types, layer.pathCount
+        else:
+            types = nodeTypes(layer)
+            pathCount = len(layer.paths)
+        countLines, countCurves, countOffcurves = countNodeTypes(types)
 
         # Calculate total points and nodes
-        countPoints = countCurves + countOffcurves + countLines
-        countNodes = countPoints - countOffcurves
+        countPoints = countLines + countCurves + countOffcurves
+        row = {
+            "Glyph": key[0],
+            "Layer": layerName,
+            "Paths": pathCount,
+            "Points": countPoints,
+            "Handles": countOffcurves,
+            "Nodes": countPoints - countOffcurves,
+            "Lines": countLines,
+            "Curves": countCurves,
+            "glyf bytes": "",
+            "CFF bytes": "",
+            "Heavy": "",
+        }
+        if stamp[1]:
+            if isinstance(layer, LayerRecord):
+                layer = self.font.glyphs[key[0]].layers[key[1]]
+            row["glyf bytes"], row["CFF bytes"] = compiledSizes(layer)
+        self.cache.setdefault(key[0], {})[key[1]] = (stamp, row)
+        return row
+
+    def selectedGlyphs(self):
+        """The selected glyphs, or all glyphs."""
+        if self.w.scope.get() == 1:
+            return list(self.font.glyphs)
+        glyphs = {}  # glyph name: glyph, in selection order
+        for selection in self.font.selectedLayers:
+            if selection.parent:
+                glyphs.setdefault(selection.parent.name, selection.parent)
+        return list(glyphs.values())
+
+    def layersToCount(self):
+        """(layer, key, stamp, layer name) of the master layers, or of the interpolated instances."""
+        glyphs = self.selectedGlyphs()
+        self.glyphsChanged(glyphs)
+        baseNames = self.graph.components(*(glyph.name for glyph in glyphs))
+        self.glyphsChanged(self.font.glyphs[name] for name in baseNames if self.font.glyphs[name])
+        if self.w.source.get() == 0:
+            # Master layers come from the font snapshot, only glyphs edited since it was taken are read again
+            layers = []
+            for glyph in glyphs:
+                record = self.snapshot.glyphRecord(glyph)
+                stamp = (record.lastChange, bool(self.w.profileBytes.get()))
+                layers.extend((layer, (glyph.name, layerId), stamp, layer.name) for layerId, layer in record.layers.items() if layer.isMaster)
+            return layers
+
+        layers = []
+        instanceFonts = self.instanceFonts
+        self.instanceFonts = {}  # only the fonts of the current instances are kept
+        for instance in self.font.instances:
+            if not instance.active or instance.type == INSTANCETYPEVARIABLE:
+                continue
+            properties = self.instanceProperties(instance)
+            if properties in instanceFonts:
+                self.instanceFonts[properties] = instanceFonts[properties]
+            glyphStamps = {name: self.glyphStamps.get(name) for name in baseNames.union(glyph.name for glyph in glyphs)}
+            instanceFont = self.interpolatedFont(instance, properties, glyphStamps)
+            for glyph in glyphs:
+                instanceGlyph = instanceFont.glyphs[glyph.name]
+                if instanceGlyph:
+                    stamp = self.changeStamp(glyph) + (properties,)
+                    layers.append((instanceGlyph.layers[0], (glyph.name, "instance " + instance.name), stamp, instance.name))
+        return layers
+
+    def countCallback(self, sender):
+        if not self.font:
+            return
+        layers = self.layersToCount()
+        self.rows = [self.countLayer(*layer) for layer in layers]
+        self.rowIndex = {key: index for index, (layer, key, stamp, layerName) in enumerate(layers)}
+        self.rowKeys = {}
+        for key in self.rowIndex:
+            self.rowKeys.setdefault(key[0], []).append(key)
+        self.totals = {key: sum(row[key] for row in self.rows) for key in TOTALS}
+        self.flagHeavyGlyphs()
+        self.w.table.set(self.rows)
+        self.showTotals()
+
+    def flagHeavyGlyphs(self):
+        """Mark the rows whose glyf or CFF bytes are far above the rest, and start the running byte totals
+        and sorted byte counts that live updates keep up to date."""
+        self.byteValues = {}
+        self.heavyCount = 0
+        if not self.w.profileBytes.get():
+            return
+        for column in BYTE_COLUMNS:
+            values = sorted((row[column], key) for key, row in zip(self.rowIndex, self.rows))
+            self.byteValues[column] = values
+            self.totals[column] = sum(value for value, key in values)
+            self.squares[column] = sum(value * value for value, key in values)
+            self.thresholds[column] = heavyThreshold([value for value, key in values])
+        for row in self.rows:
+            row["Heavy"] = ""
+            self.flagRow(row)
+
+    def flagRow(self, row):
+        """Set the Heavy column of a row from the current thresholds; returns True if it changed."""
+        heavy = "+".join(
+            column.split()[0] for column, threshold in self.thresholds.items()
+            if column in self.byteValues and threshold is not None and row[column] > threshold
+        )
+        if heavy == row["Heavy"]:
+            return False
+        self.heavyCount += bool(heavy) - bool(row["Heavy"])
+        row["Heavy"] = heavy
+        return True
+
+    def updateByteColumns(self, changedRows):
+        """Move the byte counts of the changed rows ((key, old row, new row)) in the sorted columns,
+        update the running totals and thresholds. Returns the keys of the rows whose Heavy flag may have changed:
+        the changed rows and the rows between the old and the new threshold."""
+        keys = {key for key, oldRow, newRow in changedRows}
+        for column, values in self.byteValues.items():
+            for key, oldRow, newRow in changedRows:
+                del values[bisect.bisect_left(values, (oldRow[column], key))]
+                bisect.insort(values, (newRow[column], key))
+                self.totals[column] += newRow[column] - oldRow[column]
+                self.squares[column] += newRow[column] * newRow[column] - oldRow[column] * oldRow[column]
+            oldThreshold = self.thresholds[column]
+            self.thresholds[column] = runningThreshold(len(values), self.totals[column], self.squares[column])
+            start, end = sorted((heavyIndex(values, oldThreshold), heavyIndex(values, self.thresholds[column])))
+            keys.update(key for value, key in values[start:end])
+        return keys
+
+    def layersChanged(self, sender):
+        """Recount the rows of the edited glyphs and of the glyphs using them; totals are updated from the cached counts."""
+        if not self.font or Glyphs.font != self.font or self.w.source.get() != 0:
+            return
+        glyphs = {layer.parent.name: layer.parent for layer in self.font.selectedLayers if layer.parent}
+        affectedNames = self.glyphsChanged(glyphs.values())
+        changedRows = []
+        for name in affectedNames.intersection(self.rowKeys):
+            glyph = glyphs.get(name) or self.font.glyphs[name]
+            record = self.snapshot.glyphRecord(glyph)
+            stamp = (record.lastChange, bool(self.w.profileBytes.get()))
+            for layerId, layer in record.layers.items():
+                key = (glyph.name, layerId)
+                if key not in self.rowIndex:
+                    continue
+                index = self.rowIndex[key]
+                oldRow = self.rows[index]
+                newRow = self.countLayer(layer, key, stamp, layer.name)
+                if newRow is oldRow:
+                    continue
+                for total in TOTALS:
+                    self.totals[total] += newRow[total] - oldRow[total]
+                self.heavyCount -= bool(oldRow["Heavy"])
+                newRow["Heavy"] = ""
+                self.rows[index] = newRow
+                changedRows.append((key, oldRow, newRow))
+        if not changedRows:
+            return
+
+        changedKeys = {key for key, oldRow, newRow in changedRows}
+        for key in self.updateByteColumns(changedRows):
+            index = self.rowIndex[key]
+            row = self.rows[index]
+            if self.flagRow(row) or key in changedKeys:
+                # the table's items are in count order like self.rows, whatever the sort the user chose
+                self.w.table[index] = row
+        self.showTotals()
+
+    def showTotals(self):
+        totals = self.totals
+        text = f"{len(self.rows)} layers — Total: {totals['Points']} Points - {totals['Handles']} Handles, {totals['Nodes']} Nodes, {totals['Paths']} Paths"
+        if self.byteValues:
+            text += f" — {totals['glyf bytes']} glyf bytes, {totals['CFF bytes']} CFF bytes, {self.heavyCount} heavy"
+        self.w.total.set(text)
+
+    def exportPath(self, extension):
+        fileName = f"{self.font.familyName} Point Count.{extension}"
+        directory = os.path.dirname(self.font.filepath) if self.font.filepath else None
+        return putFile(title=f"Export {extension.upper()}", fileName=fileName, directory=directory, fileTypes=[extension])
+
+    def exportCSV(self, sender):
+        path = self.exportPath("csv")
+        if path:
+            with open(path, "w", encoding="utf-8", newline="") as csvFile:
+                writer = csv.DictWriter(csvFile, fieldnames=COLUMNS)
+                writer.writeheader()
+                writer.writerows(self.rows)
 
-        # Append the result to the list
-        results.append(f"Layer: {layer.name}\nTotal: {countPoints} Points - {countOffcurves} Handles, {countNodes} Nodes, {countPaths} Paths\n")
+    def exportJSON(self, sender):
+        path = self.exportPath("json")
+        if path:
+            with open(path, "w", encoding="utf-8") as jsonFile:
+                json.dump(self.rows, jsonFile, indent=1)
 
 
-# Open the window
-w = vanilla.Window((400, 300), "Point Counter")
-w.textBox = vanilla.TextEditor((10, 10, -10, -10), "\n".join(results), readOnly=True)
-w.open()
+PointCounter()
@@ -8,15 +8,307 @@ Text holder.
 # Text holder.
 
 import os
+import objc
+import sqlite3
+import tempfile
+import threading
+from bisect import bisect_left
 from GlyphsApp import *
 from vanilla import *
 from AppKit import NSWindow, NSFloatingWindowLevel  # Import necessary modules for window level control
+from AppKit import NSColor, NSBackgroundColorAttributeName, NSTextStorageEditedCharacters
+from Foundation import NSObject, NSRegularExpression, NSValue, NSMatchingWithTransparentBounds, NSMatchingWithoutAnchoringBounds
+from PyObjCTools.AppHelper import callAfter
 
 # Define the file path
 file_path = os.path.join(GSGlyphsInfo.applicationSupportPath(), "Text holder.txt")
+snippets_path = os.path.join(GSGlyphsInfo.applicationSupportPath(), "Text holder snippets.sqlite")
+
+LOAD_CHUNK_SIZE = 256 * 1024  # characters shown at once, the rest of a large file follows in chunks of this size
+AUTOSAVE_DELAY = 2.0  # seconds without typing before an autosave
+SEARCH_CONTEXT = 256  # characters around an edit that are searched again to update the occurrence index
+SNIPPET_LIST_LIMIT = 500  # snippets listed per lookup
+SNIPPET_TITLE_LENGTH = 80
+
+
+def write_atomically(path, content):
+    """Write to a temporary file next to the target and rename it into place, so the file is never half written."""
+    folder = os.path.dirname(path)
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=folder, prefix=".Text holder-", suffix=".tmp", delete=False) as file:
+        temp_path = file.name
+        try:
+            file.write(content)
+            file.flush()
+            os.fsync(file.fileno())
+        except BaseException:
+            file.close()
+            os.remove(temp_path)
+            raise
+    os.replace(temp_path, path)
+
+
+class BackgroundWriter:
+    """Writes the file on a background thread; while a write is running, only the newest content is kept for the next one."""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.idle = threading.Condition(self.lock)
+        self.pending = None
+        self.running = False
+
+    def write(self, content):
+        with self.lock:
+            self.pending = content
+            if self.running:
+                return
+            self.running = True
+        threading.Thread(target=self.run).start()
+
+    def run(self):
+        while True:
+            with self.lock:
+                content, self.pending = self.pending, None
+                if content is None:
+                    self.running = False
+                    self.idle.notify_all()
+                    return
+            try:
+                write_atomically(self.path, content)
+                callAfter(print, "Content saved.")
+            except OSError as e:
+                callAfter(print, f"Text holder could not be saved: {e}")
+
+    def flush(self):
+        """Wait until the running write and the pending content are on disk."""
+        with self.idle:
+            while self.running:
+                self.idle.wait()
+
+
+class SnippetStore:
+    """Proof strings in an SQLite database, with a full-text index (FTS5) for prefix and word lookup.
+    Falls back to LIKE queries if the SQLite build has no FTS5."""
+
+    def __init__(self, path):
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("CREATE TABLE IF NOT EXISTS snippets (id INTEGER PRIMARY KEY, title TEXT NOT NULL, body TEXT NOT NULL)")
+        try:
+            with self.connection:
+                self.connection.execute("CREATE VIRTUAL TABLE IF NOT EXISTS snippets_fts USING fts5(title, body, content='snippets', content_rowid='id', prefix='2 3')")
+                # Keep the index in sync with the table
+                self.connection.execute("CREATE TRIGGER IF NOT EXISTS snippets_insert AFTER INSERT ON snippets BEGIN INSERT INTO snippets_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END")
+                self.connection.execute("CREATE TRIGGER IF NOT EXISTS snippets_delete AFTER DELETE ON snippets BEGIN INSERT INTO snippets_fts(snippets_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); END")
+            self.full_text = True
+        except sqlite3.OperationalError:
+            self.full_text = False
+
+    def search(self, query):
+        """(id, title) of the matching snippets, newest first; every word of the query matches as a prefix."""
+        words = query.split()
+        if not words:
+            sql, parameters = "SELECT id, title FROM snippets ORDER BY id DESC LIMIT ?", ()
+        elif self.full_text:
+            match = " ".join('"%s"*' % word.replace('"', '""') for word in words)
+            sql, parameters = "SELECT rowid, title FROM snippets_fts WHERE snippets_fts MATCH ? ORDER BY rowid DESC LIMIT ?", (match,)
+        else:
+            conditions = " AND ".join("body LIKE ? ESCAPE '\\'" for word in words)
+            parameters = tuple("%" + word.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%" for word in words)
+            sql = f"SELECT id, title FROM snippets WHERE {conditions} ORDER BY id DESC LIMIT ?"
+        return self.connection.execute(sql, parameters + (SNIPPET_LIST_LIMIT,)).fetchall()
+
+    def load(self, snippet_id):
+        row = self.connection.execute("SELECT body FROM snippets WHERE id = ?", (snippet_id,)).fetchone()
+        return row[0] if row else ""
+
+    def add(self, body):
+        """Store a snippet under its first line, return its id (the existing one for a duplicate)."""
+        row = self.connection.execute("SELECT id FROM snippets WHERE body = ?", (body,)).fetchone()
+        if row:
+            return row[0]
+        title = body.strip().splitlines()[0][:SNIPPET_TITLE_LENGTH]
+        with self.connection:
+            return self.connection.execute("INSERT INTO snippets (title, body) VALUES (?, ?)", (title, body)).lastrowid
+
+    def delete(self, snippet_id):
+        with self.connection:
+            self.connection.execute("DELETE FROM snippets WHERE id = ?", (snippet_id,))
+
+    def import_text_file(self, path):
+        """Add every paragraph (separated by blank lines) of a text file as a snippet, returns how many were new."""
+        with open(path, 'r', encoding="utf-8") as file:
+            paragraphs = [paragraph.strip() for paragraph in file.read().split("\n\n")]
+        count = self.connection.execute("SELECT count(*) FROM snippets").fetchone()[0]
+        with self.connection:
+            for paragraph in paragraphs:
+                if paragraph:
+                    self.add(paragraph)
+        return self.connection.execute("SELECT count(*) FROM snippets").fetchone()[0] - count
+
+
+class SnippetsWindow:
+    """Lists the stored snippets, looked up as you type; the text of a snippet is only loaded when it is selected."""
+
+    def __init__(self, holder):
+        self.holder = holder
+        self.store = SnippetStore(snippets_path)
+        self.snippet_ids = []
+
+        self.w = Window((420, 460), "Snippets", minSize=(420, 360), autosaveName="TextHolderSnippetsWindow")
+        self.w.getNSWindow().setLevel_(NSFloatingWindowLevel)
+
+        # Add a search field and the list of snippet titles
+        self.w.searchBox = SearchBox((10, 10, -10, 22), placeholder="Search snippets", callback=self.search_changed)
+        self.w.snippetList = List((10, 42, -10, -200), [], allowsMultipleSelection=False, selectionCallback=self.snippet_selected, doubleClickCallback=self.open_in_new_tab)
+
+        # Add a preview of the selected snippet
+        self.w.preview = TextEditor((10, -190, -10, -80), "", readOnly=True)
+
+        # Add buttons
+        self.w.newTabButton = Button((10, -70, 150, 30), "Open in New Tab", callback=self.open_in_new_tab)
+        self.w.addButton = Button((165, -70, 150, 30), "Add from Holder", callback=self.add_from_holder)
+        self.w.deleteButton = Button((10, -40, 150, 30), "Delete", callback=self.delete_snippet)
+        self.w.importButton = Button((165, -40, 150, 30), "Import Text File", callback=self.import_text_file)
+        self.w.status = TextBox((320, -33, -10, 17), "", sizeStyle="small")
+
+        self.w.open()
+        self.search_changed(None)
+        if not self.store.full_text:
+            self.w.status.set("No full-text index")
+
+    def search_changed(self, sender):
+        rows = self.store.search(self.w.searchBox.get())
+        self.snippet_ids = [snippet_id for snippet_id, title in rows]
+        self.w.snippetList.set([title for snippet_id, title in rows])
+        self.w.preview.set("")
+
+    def selected_snippet(self):
+        """(id, text) of the selected snippet, or (None, None)."""
+        selection = self.w.snippetList.getSelection()
+        if not selection:
+            return None, None
+        snippet_id = self.snippet_ids[selection[0]]
+        return snippet_id, self.store.load(snippet_id)
+
+    def snippet_selected(self, sender):
+        snippet_id, body = self.selected_snippet()
+        self.w.preview.set(body or "")
+
+    def open_in_new_tab(self, sender):
+        """Open the selected snippet in a new Edit tab of the frontmost font."""
+        snippet_id, body = self.selected_snippet()
+        if body is None:
+            return
+        if Glyphs.font is None:
+            Message(title="Text holder", message="Open a font first.", OKButton=None)
+            return
+        Glyphs.font.newTab(body)
+
+    def add_from_holder(self, sender):
+        """Store the text selected in the Text holder, or all of it."""
+        text_view = self.holder.w.textEditor.getNSTextView()
+        selected_range = text_view.selectedRange()
+        text_storage = text_view.textStorage()
+        if selected_range.length:
+            body = text_storage.attributedSubstringFromRange_(selected_range).string()
+        else:
+            body = text_storage.string()
+        if body.strip():
+            self.store.add(body)
+            self.search_changed(None)
+
+    def delete_snippet(self, sender):
+        snippet_id, body = self.selected_snippet()
+        if snippet_id is not None:
+            self.store.delete(snippet_id)
+            self.search_changed(None)
+
+    def import_text_file(self, sender):
+        """Import the paragraphs of Text holder.txt as snippets."""
+        if not os.path.exists(file_path):
+            self.w.status.set("No Text holder.txt")
+            return
+        count = self.store.import_text_file(file_path)
+        self.w.status.set(f"Imported {count} snippets")
+        self.search_changed(None)
+
+
+# Objective-C classes cannot be defined twice, so a second run of the script reuses the class of the first
+try:
+    TextHolderStorageDelegate = objc.lookUpClass("TextHolderStorageDelegate")
+except objc.nosuchclass_error:
+    class TextHolderStorageDelegate(NSObject):
+        """Reports character edits of the text storage to a Python callback."""
+
+        def textStorage_didProcessEditing_range_changeInLength_(self, text_storage, edited_mask, edited_range, delta):
+            callback = getattr(self, "callback", None)
+            if callback and edited_mask & NSTextStorageEditedCharacters:
+                callback(text_storage, edited_range, delta)
+
+
+class SearchIndex:
+    """Occurrences (location, length) of a search pattern in the text, updated around each edit instead of searching everything again."""
+
+    def __init__(self, pattern, use_regex):
+        if not use_regex:
+            pattern = NSRegularExpression.escapedPatternForString_(pattern)
+        self.use_regex = use_regex
+        self.regex, self.error = NSRegularExpression.regularExpressionWithPattern_options_error_(pattern, 0, None)
+        self.matches = []
+        self.longest = 0
+
+    def search(self, string, search_range):
+        """Non-empty matches inside search_range (UTF-16 location, length) of the whole string.
+        Lookarounds, \\b and ^/$ see the text around the range, as they would in a search of the whole string."""
+        matches = []
+        options = NSMatchingWithTransparentBounds | NSMatchingWithoutAnchoringBounds
+        for result in self.regex.matchesInString_options_range_(string, options, search_range):
+            match_range = result.range()
+            if match_range.length:
+                matches.append((match_range.location, match_range.length))
+                self.longest = max(self.longest, match_range.length)
+        return matches
+
+    def rebuild(self, text_storage):
+        self.matches = self.search(text_storage.string(), (0, text_storage.length()))
+
+    def update(self, text_storage, edited_range, delta):
+        """Update the index after an edit, returns the range that was searched again."""
+        context = max(SEARCH_CONTEXT, self.longest)
+        start = max(0, edited_range.location - context)
+        end = min(text_storage.length(), edited_range.location + edited_range.length + context)
+
+        # Old matches touching the searched range are dropped, the range grows to cover them completely
+        first = bisect_left(self.matches, (start,))
+        if first and sum(self.matches[first - 1]) > start:
+            first -= 1
+            start = self.matches[first][0]
+        last = bisect_left(self.matches, (end - delta,))
+        if last > first:
+            end = max(end, sum(self.matches[last - 1]) + delta)
+
+        found = self.search(text_storage.string(), (start, end - start))
+        self.matches[first:] = found + [(location + delta, length) for location, length in self.matches[last:]]
+        return (start, end - start)
+
+    def replacement(self, result, string, replace_text):
+        """Replacement for one match, with $1 etc. for groups in regex mode."""
+        template = replace_text if self.use_regex else NSRegularExpression.escapedTemplateForString_(replace_text)
+        return self.regex.replacementStringForResult_inString_offset_template_(result, string, 0, template)
+
 
 class TextHolderWindow:
     def __init__(self):
+        self.writer = BackgroundWriter(file_path)
+        self.autosave_timer = None
+        self.dirty = False  # edited since the last save
+        self.loading = False  # the rest of a large file is still being read
+        self.save_requested = False  # saved while loading, saved once loading has finished
+        self.closed = False
+        self.ignore_changes = False
+        self.search = None  # SearchIndex of the current find text, built on first use
+        self.highlighting = False  # all occurrences are highlighted
+
         # Load the existing content from the file
         self.content = self.load_file_content()
 
@@ -30,21 +322,43 @@ class TextHolderWindow:
         self.w.getNSWindow().setLevel_(NSFloatingWindowLevel)
 
         # Add a text editor box
-        self.w.textEditor = TextEditor((10, 10, -10, -150), self.content)
+        self.w.textEditor = TextEditor((10, 10, -10, -170), self.content, callback=self.text_changed)
+
+        # Keep the occurrence index up to date as the text changes
+        self.storage_delegate = TextHolderStorageDelegate.alloc().init()
+        self.storage_delegate.callback = self.text_storage_edited
+        self.w.textEditor.getNSTextView().textStorage().setDelegate_(self.storage_delegate)
+
+        # Add a status line for match counts
+        self.w.searchStatus = TextBox((10, -162, -10, 17), "", sizeStyle="small")
 
         # Add Find and Replace labels and fields
         self.w.findLabel = TextBox((10, -130, 50, 20), "Find:")
-        self.w.findText = EditText((60, -130, -10, 20), placeholder="Text to find")
+        self.w.findText = EditText((60, -130, -190, 20), placeholder="Text to find", callback=self.search_changed)
+        self.w.regex = CheckBox((-180, -130, 65, 20), "Regex", value=False, callback=self.search_changed)
+
+        # Add Previous and Next buttons
+        self.w.previousButton = Button((-110, -130, 48, 20), "◀", callback=self.find_previous)
+        self.w.nextButton = Button((-58, -130, 48, 20), "▶", callback=self.find_text)
 
         self.w.replaceLabel = TextBox((10, -100, 50, 20), "Replace:")
-        self.w.replaceText = EditText((60, -100, -10, 20), placeholder="Replacement text")
+        self.w.replaceText = EditText((60, -100, -120, 20), placeholder="Replacement text")
 
-        # Add Find button (finds and highlights the text)
+        # Add Find All button (counts and highlights all occurrences)
+        self.w.findAllButton = Button((-110, -100, 100, 20), "Find All", callback=self.find_all)
+
+        # Add Find button (finds and highlights the next occurrence)
         self.w.findButton = Button((165, -70, 150, 30), "Find", callback=self.find_text)
 
         # Add Find & Replace button
         self.w.replaceButton = Button((10, -70, 150, 30), "Find & Replace", callback=self.find_and_replace)
 
+        # Add Autosave option (saves in the background after a pause in typing)
+        self.w.autosave = CheckBox((325, -65, -95, 20), "Autosave", value=False)
+
+        # Add Snippets button (opens the snippet store)
+        self.w.snippetsButton = Button((-85, -70, 75, 30), "Snippets", callback=self.open_snippets)
+
         # Add Save button (saves without closing the window)
         self.w.saveButton = Button((10, -40, 150, 30), "Save", callback=self.save_content)
 
@@ -53,70 +367,219 @@ class TextHolderWindow:
         self.w.ignoreButton = Button((-180, -40, 150, 30), "Ignore & Close", callback=self.ignore_and_close)
 
         # Open the window
+        self.w.bind("close", self.window_closed)
         self.w.open()
 
     def load_file_content(self):
-        """Load the content of the file if it exists."""
+        """Load the first chunk of the file if it exists; the rest of a large file is read in the background."""
         if os.path.exists(file_path):
-            with open(file_path, 'r') as file:
-                return file.read()
+            file = open(file_path, 'r', encoding="utf-8")
+            content = file.read(LOAD_CHUNK_SIZE)
+            if len(content) < LOAD_CHUNK_SIZE:
+                file.close()
+            else:
+                self.loading = True
+                threading.Thread(target=self.load_remaining_content, args=(file,), daemon=True).start()
+            return content
         else:
             return ""
 
-    def find_text(self, sender):
-        """Find and highlight text in the main window."""
+    def load_remaining_content(self, file):
+        """Read the rest of the file chunk by chunk (background thread), appended to the text on the main thread."""
+        with file:
+            # A save requested before closing needs the whole file, so loading goes on
+            while not self.closed or self.save_requested:
+                chunk = file.read(LOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                callAfter(self.append_content, chunk)
+        callAfter(self.loading_finished)
+
+    def append_content(self, chunk):
+        if self.closed and not self.save_requested:
+            return
+        text_storage = self.w.textEditor.getNSTextView().textStorage()
+        text_storage.replaceCharactersInRange_withString_((text_storage.length(), 0), chunk)
+
+    def loading_finished(self):
+        self.loading = False
+        if self.save_requested:
+            self.save_requested = False
+            self.save_content(None)
+
+    def text_changed(self, sender):
+        """Mark the content as edited and restart the autosave countdown."""
+        self.dirty = True
+        if self.autosave_timer:
+            self.autosave_timer.cancel()
+        if self.w.autosave.get():
+            self.autosave_timer = threading.Timer(AUTOSAVE_DELAY, callAfter, args=(self.autosave,))
+            self.autosave_timer.daemon = True
+            self.autosave_timer.start()
+
+    def autosave(self):
+        if self.dirty and not self.closed and self.w.autosave.get():
+            self.save_content(None)
+
+    def search_changed(self, sender):
+        """The find text or mode changed: the index is built again on the next search."""
+        self.clear_highlights()
+        self.search = None
+        self.w.searchStatus.set("")
+
+    def search_index(self):
+        """The occurrence index of the find text, None if there is nothing (valid) to find."""
         find_text = self.w.findText.get()
+        if not find_text:
+            return None
+        if self.search is None:
+            search = SearchIndex(find_text, bool(self.w.regex.get()))
+            if search.regex is None:
+                self.w.searchStatus.set(f"Invalid regular expression: {search.error.localizedDescription()}")
+                return None
+            search.rebuild(self.w.textEditor.getNSTextView().textStorage())
+            self.search = search
+        return self.search
+
+    def text_storage_edited(self, text_storage, edited_range, delta):
+        """Update the occurrence index (and highlights) around an edit."""
+        if self.search is None or self.closed:
+            return
+        searched_range = self.search.update(text_storage, edited_range, delta)
+        if self.highlighting:
+            self.highlight_matches(searched_range)
+
+    def highlight_matches(self, searched_range=None):
+        """Highlight the occurrences in a range of the text, or in all of it."""
+        text_view = self.w.textEditor.getNSTextView()
+        layout_manager = text_view.layoutManager()
+        if searched_range is None:
+            searched_range = (0, text_view.textStorage().length())
+        layout_manager.removeTemporaryAttribute_forCharacterRange_(NSBackgroundColorAttributeName, searched_range)
+        start, length = searched_range
+        first = bisect_left(self.search.matches, (start,))
+        last = bisect_left(self.search.matches, (start + length,))
+        color = NSColor.findHighlightColor()
+        for match in self.search.matches[first:last]:
+            layout_manager.addTemporaryAttribute_value_forCharacterRange_(NSBackgroundColorAttributeName, color, match)
+
+    def clear_highlights(self):
+        if self.highlighting:
+            text_view = self.w.textEditor.getNSTextView()
+            text_view.layoutManager().removeTemporaryAttribute_forCharacterRange_(NSBackgroundColorAttributeName, (0, text_view.textStorage().length()))
+            self.highlighting = False
+
+    def select_match(self, index):
         text_editor = self.w.textEditor.getNSTextView()
-        content = self.w.textEditor.get()
-
-        if find_text:
-            # Find the range of the first occurrence of the text
-            range_start = content.find(find_text)
-            if range_start != -1:
-                # Highlight the found text
-                range_length = len(find_text)
-                text_editor.setSelectedRange_((range_start, range_length))
-                text_editor.scrollRangeToVisible_((range_start, range_length))
-            else:
-                print("Text not found.")
+        match = self.search.matches[index]
+        text_editor.setSelectedRange_(match)
+        text_editor.scrollRangeToVisible_(match)
+        self.w.searchStatus.set(f"{index + 1} of {len(self.search.matches)} matches")
+
+    def find_text(self, sender):
+        """Find and highlight the next occurrence after the selection, from the top after the last one."""
+        search = self.search_index()
+        if search is None:
+            return
+        if not search.matches:
+            self.w.searchStatus.set("Text not found.")
+            return
+        selected_range = self.w.textEditor.getNSTextView().selectedRange()
+        index = bisect_left(search.matches, (selected_range.location + selected_range.length,))
+        self.select_match(index % len(search.matches))
+
+    def find_previous(self, sender):
+        """Find and highlight the occurrence before the selection, from the bottom before the first one."""
+        search = self.search_index()
+        if search is None:
+            return
+        if not search.matches:
+            self.w.searchStatus.set("Text not found.")
+            return
+        selected_range = self.w.textEditor.getNSTextView().selectedRange()
+        index = bisect_left(search.matches, (selected_range.location,)) - 1
+        self.select_match(index % len(search.matches))
+
+    def find_all(self, sender):
+        """Count and highlight all occurrences."""
+        search = self.search_index()
+        if search is None:
+            return
+        self.highlight_matches()
+        self.highlighting = True
+        if search.matches:
+            self.w.textEditor.getNSTextView().scrollRangeToVisible_(search.matches[0])
+        self.w.searchStatus.set(f"{len(search.matches)} matches")
 
     def find_and_replace(self, sender):
-        """Find and replace text in the selected area or entire content."""
-        find_text = self.w.findText.get()
+        """Find and replace text in the selected area or entire content, in place and as one undo step."""
+        search = self.search_index()
+        if search is None:
+            return
         replace_text = self.w.replaceText.get()
         text_editor = self.w.textEditor.getNSTextView()
+        text_storage = text_editor.textStorage()
 
-        # Get the selected range
+        # Operate on the selected range, or on the entire content
         selected_range = text_editor.selectedRange()
-        content = self.w.textEditor.get()
-
-        if find_text:
-            if selected_range.length > 0:
-                # Operate on selected text
-                selected_text = content[selected_range.location:selected_range.location + selected_range.length]
-                new_selected_text = selected_text.replace(find_text, replace_text)
-                # Replace the selected text
-                text_editor.textStorage().replaceCharactersInRange_withString_(selected_range, new_selected_text)
-            else:
-                # Operate on the entire content
-                new_content = content.replace(find_text, replace_text)
-                self.w.textEditor.set(new_content)
+        if selected_range.length == 0:
+            selected_range = (0, text_storage.length())
+
+        content = text_storage.string()
+        ranges = []
+        replacements = []
+        for result in search.regex.matchesInString_options_range_(content, 0, selected_range):
+            if result.range().length:
+                ranges.append(NSValue.valueWithRange_(result.range()))
+                replacements.append(search.replacement(result, content, replace_text))
+        if not ranges:
+            self.w.searchStatus.set("Text not found.")
+            return
+
+        # Replace from the end, so earlier ranges stay valid; one editing block updates layout and index once
+        if text_editor.shouldChangeTextInRanges_replacementStrings_(ranges, replacements):
+            text_storage.beginEditing()
+            for replace_range, replacement in zip(reversed(ranges), reversed(replacements)):
+                text_storage.replaceCharactersInRange_withString_(replace_range.rangeValue(), replacement)
+            text_storage.endEditing()
+            text_editor.didChangeText()
+        self.w.searchStatus.set(f"Replaced {len(ranges)} matches.")
 
     def save_content(self, sender):
-        """Save the content of the window without closing it."""
-        content = self.w.textEditor.get()
-        with open(file_path, 'w') as file:
-            file.write(content)
-        print("Content saved.")
+        """Save the content of the window without closing it; the file is written in the background."""
+        if self.loading:
+            # Saving now would cut off the part of the file that is not loaded yet
+            self.save_requested = True
+            print("Text holder is still loading, it will be saved when loading has finished.")
+            return
+        self.dirty = False
+        self.writer.write(self.w.textEditor.get())
 
     def save_and_close(self, sender):
-        """Save the content to the file and close the window."""
+        """Save the content to the file and close the window; while loading, it is saved once loading has finished."""
         self.save_content(sender)
         self.w.close()
 
+    def open_snippets(self, sender):
+        SnippetsWindow(self)
+
     def ignore_and_close(self, sender):
         """Ignore changes and close the window."""
+        self.ignore_changes = True
         self.w.close()
 
+    def window_closed(self, sender):
+        """Stop autosaving and wait for the writes; pending autosave edits are still written.
+        While loading, a requested save lets the rest of the file load first, otherwise loading stops."""
+        if self.autosave_timer:
+            self.autosave_timer.cancel()
+        self.w.textEditor.getNSTextView().textStorage().setDelegate_(None)
+        if self.ignore_changes:
+            self.save_requested = False
+        elif self.dirty and self.w.autosave.get():
+            self.save_content(None)
+        self.closed = True
+        self.writer.flush()
+
 # Instantiate and open the window
 TextHolderWindow()
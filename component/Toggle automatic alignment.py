@@ -4,52 +4,142 @@ from __future__ import division, print_function, unicode_literals
 
 __doc__ = """
 Toggle automatic alignment for selected components in the Edit View, or for all components in all selected glyphs when nothing is selected.
+Hold Option to open the batch mode: set, clear or toggle automatic alignment font-wide for all components of chosen base glyphs.
 """
 
+from collections import defaultdict
 from GlyphsApp import Glyphs
+from rbHelpers import componentGraph
+from AppKit import NSEvent, NSEventModifierFlagOption
+import vanilla
+
+STATES = ["Toggle", "On", "Off"]
+
 
 # ---------------------
-# Variables
+# Helper Functions
 # ---------------------
-f = Glyphs.font
-selected_layers = f.selectedLayers
-edit_view_selection = f.currentTab and f.currentTab.selectedLayers
+def new_alignment(component, state):
+    """The alignment a component gets: the explicit state, or the opposite of its current one."""
+    return not component.automaticAlignment if state is None else state
+
+
+def set_automatic_alignment(components, state):
+    """Set or toggle automatic alignment, return how many components changed."""
+    changed = 0
+    for component in components:
+        alignment = new_alignment(component, state)
+        if component.automaticAlignment != alignment:
+            component.automaticAlignment = alignment
+            changed += 1
+    return changed
+
+
+def toggle_automatic_alignment_all_masters(glyph, component_names, state=None):
+    """Apply to the components named in component_names (all components if None) on all layers of a glyph."""
+    components = [
+        component for layer in glyph.layers for component in layer.components
+        if component_names is None or component.name in component_names
+    ]
+    return set_automatic_alignment(components, state)
+
+
+def apply_to_base_glyphs(font, base_names, state):
+    """Set or toggle automatic alignment font-wide for all components of the given base glyphs.
+    Returns the number of changed components and of changed glyphs."""
+    graph = componentGraph(font)
+    base_names = set(base_names)
+    usage = defaultdict(list)
+    for glyph_name in set().union(*(graph.usedBy(name) for name in base_names)):
+        for layer in font.glyphs[glyph_name].layers:
+            usage[glyph_name].extend(component for component in layer.components if component.name in base_names)
+
+    changed_components = changed_glyphs = 0
+    font.disableUpdateInterface()
+    try:
+        for glyph_name, components in usage.items():
+            glyph = font.glyphs[glyph_name]
+            glyph.beginUndo()
+            changed = set_automatic_alignment(components, state)
+            glyph.endUndo()
+            if changed:
+                changed_components += changed
+                changed_glyphs += 1
+    finally:
+        font.enableUpdateInterface()
+    return changed_components, changed_glyphs
 
 
 # ---------------------
-# Helper Functions
+# Batch mode
 # ---------------------
-def toggle_automatic_alignment_all_masters(layer, selected_components):
-    for layer in layer.parent.layers:  # Iterate through all masters
-        for component in layer.components:
-            if not selected_components or component.name in [sc.name for sc in selected_components]:
-                component.automaticAlignment = not component.automaticAlignment  # Toggle alignment
+class BatchAutomaticAlignment(object):
+    def __init__(self, font):
+        self.font = font
+        selected_names = []
+        for layer in font.selectedLayers:
+            for component in layer.components:
+                if component.name not in selected_names:
+                    selected_names.append(component.name)
+
+        self.w = vanilla.FloatingWindow((320, 135), "Batch automatic alignment")
+        self.w.text = vanilla.TextBox((10, 12, -10, 17), "Base glyphs (space separated):", sizeStyle="small")
+        self.w.baseGlyphs = vanilla.EditText((10, 32, -10, 22), " ".join(selected_names))
+        self.w.stateText = vanilla.TextBox((10, 67, 50, 17), "State:", sizeStyle="small")
+        self.w.state = vanilla.PopUpButton((60, 64, 100, 20), STATES)
+        self.w.apply = vanilla.Button((-110, 64, -10, 20), "Apply", callback=self.apply)
+        self.w.status = vanilla.TextBox((10, 100, -10, 17), "", sizeStyle="small")
+        self.w.open()
+
+    def apply(self, sender):
+        base_names = self.w.baseGlyphs.get().split()
+        state = [None, True, False][self.w.state.get()]
+        missing = [name for name in base_names if not self.font.glyphs[name]]
+        changed_components, changed_glyphs = apply_to_base_glyphs(self.font, base_names, state)
+        status = f"{changed_components} components changed in {changed_glyphs} glyphs."
+        if missing:
+            status += f" Not in font: {', '.join(missing)}"
+        self.w.status.set(status)
+        print(f"Batch automatic alignment ({STATES[self.w.state.get()]}) for {', '.join(base_names)}: {status}")
 
 
 # ---------------------
 # Engine
 # ---------------------
-for layer in selected_layers:
-    if layer.isMasterLayer:
+f = Glyphs.font
+keys_pressed = NSEvent.modifierFlags()
+
+if f and keys_pressed & NSEventModifierFlagOption == NSEventModifierFlagOption:
+    BatchAutomaticAlignment(f)
+elif f:
+    selected_layers = f.selectedLayers
+    done_glyphs = set()  # a glyph selected on several masters is only toggled once
+    toggle_state = None
+    for layer in selected_layers:
+        if not layer.isMasterLayer or layer.parent.name in done_glyphs or not layer.components:
+            continue
+        done_glyphs.add(layer.parent.name)
+
         # Check if there are selected components in the Edit View
         selected_components = [c for c in layer.components if c.selected]
-
         if selected_components:
             # Apply to selected components in the Edit View
-            toggle_automatic_alignment_all_masters(layer, selected_components)
+            toggle_automatic_alignment_all_masters(layer.parent, {c.name for c in selected_components})
             alignment_state = "enabled" if selected_components[0].automaticAlignment else "disabled"
             print(layer.parent.name, layer.name, f"----- Automatic alignment {alignment_state} (selected components)")
         else:
             # Apply to all components if nothing is selected
-            toggle_automatic_alignment_all_masters(layer, None)
+            toggle_automatic_alignment_all_masters(layer.parent, None)
             alignment_state = "enabled" if layer.components[0].automaticAlignment else "disabled"
             print(layer.parent.name, layer.name, f"----- Automatic alignment {alignment_state} (all components)")
+        if toggle_state is None:
+            toggle_state = alignment_state.capitalize()
 
-# Pop-up notification
-toggle_state = "Enabled" if selected_layers[0].components[0].automaticAlignment else "Disabled"
-Glyphs.showNotification("Toggle automatic alignment", f"Automatic alignment {toggle_state} in all masters.")
+    # Pop-up notification
+    if toggle_state:
+        Glyphs.showNotification("Toggle automatic alignment", f"Automatic alignment {toggle_state} in all masters.")
 
-# ---------------------
-# Test
-# ---------------------
-print("Done!")
+    # ---------------------
+    # Test
+    # ---------------------
+    print("Done!")
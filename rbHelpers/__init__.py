@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+from __future__ import division, print_function, unicode_literals
+
+__doc__ = """
+Helpers shared by the scripts, not meant to be run from the Scripts menu.
+"""
+
+from .componentGraph import ComponentGraph, componentGraph
+from .exportFiles import fontDigest, replaceIfChanged
+from .fontSnapshot import FontSnapshot, fontSnapshot
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+from __future__ import division, print_function, unicode_literals
+
+__doc__ = """
+Component dependency graph of a font: which glyphs use which base glyphs, on all layers.
+Transitive queries are cached, and the graph is updated layer by layer when glyphs change,
+so scripts can limit their work to the glyphs affected by an edit.
+
+    from rbHelpers import componentGraph
+    graph = componentGraph(Glyphs.font)
+    graph.dependents("acutecomb")  # every glyph that uses acutecomb, directly or nested
+
+componentGraph() reads only the components of each layer, never the outlines; after the first call,
+only glyphs edited since go through the object bridge again.
+A script that already keeps a complete font snapshot can build the graph from its records with ComponentGraph(font, snapshot).
+"""
+
+from collections import defaultdict, deque
+
+TEMP_DATA_KEY = "rbHelpersComponentGraph"
+
+
+class ComponentGraph(object):
+    def __init__(self, font, snapshot=None):
+        self.font = font
+        self.snapshot = snapshot  # read from the records of a font snapshot instead of the glyphs if given
+        self.layerComponents = {}  # (glyph name, layer ID): frozenset of base glyph names
+        self.glyphLayers = defaultdict(set)  # glyph name: IDs of its layers with components
+        self.stamps = {}  # glyph name: str(lastChange) when its layers were read
+        self.users = defaultdict(lambda: defaultdict(int))  # base name: {user name: number of layers using it}
+        self.bases = defaultdict(lambda: defaultdict(int))  # user name: {base name: number of layers using it}
+        self.dependentsCache = {}
+        self.orderCache = None
+        if snapshot is not None:
+            for record in snapshot.glyphs.values():
+                self.recordChanged(record)
+        else:
+            for glyph in font.glyphs:
+                self.glyphChanged(glyph)
+
+    # Updates
+
+    def layerChanged(self, layer):
+        """Re-read the components of one layer; returns True if its edges changed."""
+        return self.setLayerComponents(layer.parent.name, layer.layerId, frozenset(component.name for component in layer.components))
+
+    def setLayerComponents(self, glyphName, layerId, names):
+        key = (glyphName, layerId)
+        oldNames = self.layerComponents.get(key, frozenset())
+        if names == oldNames:
+            return False
+        for name in oldNames - names:
+            self.removeEdge(glyphName, name)
+        for name in names - oldNames:
+            self.addEdge(glyphName, name)
+        if names:
+            self.layerComponents[key] = names
+            self.glyphLayers[glyphName].add(layerId)
+        else:
+            self.layerComponents.pop(key, None)
+            self.glyphLayers[glyphName].discard(layerId)
+        self.invalidate(oldNames | names)
+        return True
+
+    def glyphChanged(self, glyph):
+        """Re-read all layers of a glyph, including layers that were deleted since the last read."""
+        changed = False
+        layerIds = set()
+        for layer in glyph.layers:
+            layerIds.add(layer.layerId)
+            changed = self.layerChanged(layer) or changed
+        changed = self.removeOtherLayers(glyph.name, layerIds) or changed
+        self.stamps[glyph.name] = str(glyph.lastChange)
+        return changed
+
+    def recordChanged(self, record):
+        """Like glyphChanged(), from the snapshot record of a glyph."""
+        changed = False
+        for layerId, layer in record.layers.items():
+            changed = self.setLayerComponents(record.name, layerId, frozenset(layer.components)) or changed
+        changed = self.removeOtherLayers(record.name, set(record.layers)) or changed
+        self.stamps[record.name] = record.lastChange
+        return changed
+
+    def removeOtherLayers(self, glyphName, layerIds):
+        changed = False
+        for layerId in self.glyphLayers.get(glyphName, set()) - layerIds:
+            changed = self.removeLayer((glyphName, layerId)) or changed
+        return changed
+
+    def refresh(self):
+        """Re-read the glyphs edited, added or removed since the last read; returns their names."""
+        changedNames = set()
+        if self.snapshot is not None:
+            self.snapshot.refresh(self.font)
+            glyphNames = set(self.snapshot.glyphs)
+            for record in self.snapshot.glyphs.values():
+                if self.stamps.get(record.name) != record.lastChange and self.recordChanged(record):
+                    changedNames.add(record.name)
+        else:
+            glyphNames = set()
+            for glyph in self.font.glyphs:
+                glyphNames.add(glyph.name)
+                if self.stamps.get(glyph.name) != str(glyph.lastChange) and self.glyphChanged(glyph):
+                    changedNames.add(glyph.name)
+        for glyphName in set(self.stamps) - glyphNames:
+            self.removeOtherLayers(glyphName, set())
+            self.glyphLayers.pop(glyphName, None)
+            del self.stamps[glyphName]
+            changedNames.add(glyphName)
+        return changedNames
+
+    def removeLayer(self, key):
+        names = self.layerComponents.pop(key, frozenset())
+        self.glyphLayers[key[0]].discard(key[1])
+        for name in names:
+            self.removeEdge(key[0], name)
+        self.invalidate(names)
+        return bool(names)
+
+    def addEdge(self, userName, baseName):
+        self.users[baseName][userName] += 1
+        self.bases[userName][baseName] += 1
+
+    def removeEdge(self, userName, baseName):
+        for edges, fromName, toName in ((self.users, baseName, userName), (self.bases, userName, baseName)):
+            edges[fromName][toName] -= 1
+            if not edges[fromName][toName]:
+                del edges[fromName][toName]
+                if not edges[fromName]:
+                    del edges[fromName]
+
+    def invalidate(self, baseNames):
+        """Drop the cached dependents of the changed bases and of everything nested inside them."""
+        self.orderCache = None
+        for name in self.components(*baseNames) | set(baseNames):
+            self.dependentsCache.pop(name, None)
+
+    # Queries
+
+    def usedBy(self, name):
+        """Glyphs that use the glyph as a component directly, on any layer."""
+        return set(self.users.get(name, ()))
+
+    def uses(self, name):
+        """Base glyphs the glyph uses as components directly, on any layer."""
+        return set(self.bases.get(name, ()))
+
+    def dependents(self, name):
+        """Every glyph that uses the glyph, directly or through nested components (cached)."""
+        if name not in self.dependentsCache:
+            self.dependentsCache[name] = frozenset(self.walk([name], self.users))
+        return self.dependentsCache[name]
+
+    def components(self, *names):
+        """Every base glyph the glyphs are built from, directly or nested."""
+        return self.walk(names, self.bases)
+
+    def affectedGlyphs(self, names):
+        """The glyphs themselves plus everything that depends on them."""
+        affected = set(names)
+        for name in names:
+            affected |= self.dependents(name)
+        return affected
+
+    def walk(self, names, edges):
+        found = set()
+        queue = deque(names)
+        while queue:
+            for nextName in edges.get(queue.popleft(), ()):
+                if nextName not in found:
+                    found.add(nextName)
+                    queue.append(nextName)
+        return found
+
+    def topologicalOrder(self, names=None):
+        """Glyph names with every base glyph before the glyphs using it (font order otherwise).
+        Limited to the given names if any; glyphs in a component cycle come last."""
+        if self.orderCache is None:
+            glyphNames = [glyph.name for glyph in self.font.glyphs]
+            inFont = set(glyphNames)
+            waiting = {name: len(inFont.intersection(self.bases.get(name, ()))) for name in glyphNames}
+            queue = deque(name for name in glyphNames if not waiting[name])
+            order = []
+            while queue:
+                name = queue.popleft()
+                order.append(name)
+                for userName in self.users.get(name, ()):
+                    if userName in waiting:
+                        waiting[userName] -= 1
+                        if not waiting[userName]:
+                            queue.append(userName)
+            ordered = set(order)
+            order.extend(name for name in glyphNames if name not in ordered)
+            self.orderCache = order
+        if names is None:
+            return list(self.orderCache)
+        names = set(names)
+        return [name for name in self.orderCache if name in names]
+
+
+def componentGraph(font):
+    """The component graph of a font, kept in its tempData and refreshed from the glyphs changed since the last call."""
+    graph = font.tempData[TEMP_DATA_KEY]
+    if graph is None or graph.font != font:
+        graph = ComponentGraph(font)
+        font.tempData[TEMP_DATA_KEY] = graph
+    else:
+        graph.refresh()
+    return graph
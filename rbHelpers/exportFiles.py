@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+from __future__ import division, print_function, unicode_literals
+
+__doc__ = """
+Writing exported font files: compare them table by table and only replace files whose content changed.
+Shared by the “Export To All Formats” scripts.
+
+    from rbHelpers import replaceIfChanged
+    replaced = replaceIfChanged(finalPath, lambda tempPath: shutil.copyfile(compiledPath, tempPath))
+"""
+
+import os
+import hashlib
+import tempfile
+
+try:
+    from fontTools.ttLib import TTFont
+except ImportError:
+    TTFont = None
+
+
+def fontDigest(path):
+    """Digest of a font file’s tables. The modification date and checksum adjustment in head are ignored,
+    so a recompiled but otherwise identical font compares equal. Other files are compared byte by byte."""
+    digest = hashlib.sha256()
+    if TTFont:
+        try:
+            font = TTFont(path, lazy=True)
+            try:
+                for tag in sorted(font.reader.keys()):
+                    data = font.reader[tag]
+                    if tag == "head":
+                        data = data[:8] + bytes(4) + data[12:28] + bytes(8) + data[36:]
+                    digest.update(tag.encode("latin-1"))
+                    digest.update(data)
+            finally:
+                font.close()
+            return digest.hexdigest()
+        except Exception:
+            digest = hashlib.sha256()
+    with open(path, "rb") as fontFile:
+        digest.update(fontFile.read())
+    return digest.hexdigest()
+
+
+def replaceIfChanged(finalPath, writeFile):
+    """Write a file with writeFile(tempPath) next to finalPath, then atomically replace finalPath,
+    unless the existing file already has the same content. Returns False if finalPath was left in place."""
+    fileHandle, tempPath = tempfile.mkstemp(prefix=".", suffix=".partial", dir=os.path.dirname(finalPath))
+    os.close(fileHandle)
+    try:
+        writeFile(tempPath)
+        if os.path.exists(finalPath) and fontDigest(finalPath) == fontDigest(tempPath):
+            os.remove(tempPath)
+            return False
+        os.replace(tempPath, finalPath)
+        return True
+    except Exception:
+        if os.path.exists(tempPath):
+            os.remove(tempPath)
+        raise
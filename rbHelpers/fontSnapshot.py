@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+from __future__ import division, print_function, unicode_literals
+
+__doc__ = """
+Compact snapshot of a font for analysis scripts: glyph names, kerning groups, component references
+and node type arrays, read once through the object bridge.
+The snapshot is kept in the font’s tempData during a session and on disk between sessions
+(node types as one memory-mapped .npy file, metadata as JSON, keyed by font path and modification time).
+Only glyphs whose lastChange moved are read again.
+
+Saving rewrites the whole snapshot, so callers save once when they are done (e.g. when a panel closes),
+not after every refresh. The disk copy only helps until the font file is saved again:
+a new modification time makes it stale, and the next session reads the font through the bridge once more.
+
+    from rbHelpers import fontSnapshot
+    snapshot = fontSnapshot(Glyphs.font)
+    snapshot.glyphs["adieresis"].layers[masterId].components
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+TEMP_DATA_KEY = "rbHelpersFontSnapshot"
+SNAPSHOT_VERSION = 2
+
+# Node types as small integers, so a layer’s nodes fit into one compact array
+NODE_TYPES = {"line": 1, "curve": 2, "qcurve": 2, "offcurve": 3}
+
+
+def nodeTypes(layer):
+    """Node types (uint8) of all paths of a layer, read in one pass; a plain list without NumPy.
+    Positions are not read, no script counts them."""
+    types = [NODE_TYPES.get(node.type, 0) for path in layer.paths for node in path.nodes]
+    if numpy is None:
+        return types
+    return numpy.array(types, dtype=numpy.uint8)
+
+
+class LayerRecord(object):
+    __slots__ = ("layerId", "name", "isMaster", "components", "pathCount", "types")
+
+    def __init__(self, layerId, name, isMaster, components, pathCount, types):
+        self.layerId = layerId
+        self.name = name
+        self.isMaster = isMaster
+        self.components = components  # tuple of base glyph names
+        self.pathCount = pathCount
+        self.types = types
+
+    @classmethod
+    def fromLayer(cls, layer):
+        return cls(
+            layer.layerId,
+            layer.name,
+            bool(layer.isMasterLayer),
+            tuple(component.name for component in layer.components),
+            len(layer.paths),
+            nodeTypes(layer),
+        )
+
+
+class GlyphRecord(object):
+    __slots__ = ("name", "leftKerningGroup", "rightKerningGroup", "export", "lastChange", "layers")
+
+    def __init__(self, name, leftKerningGroup, rightKerningGroup, export, lastChange, layers):
+        self.name = name
+        self.leftKerningGroup = leftKerningGroup
+        self.rightKerningGroup = rightKerningGroup
+        self.export = export
+        self.lastChange = lastChange  # str(glyph.lastChange) when the glyph was read
+        self.layers = layers  # layer ID: LayerRecord
+
+    @classmethod
+    def fromGlyph(cls, glyph, stamp):
+        return cls(
+            glyph.name,
+            glyph.leftKerningGroup,
+            glyph.rightKerningGroup,
+            bool(glyph.export),
+            stamp,
+            {layer.layerId: LayerRecord.fromLayer(layer) for layer in glyph.layers},
+        )
+
+
+def snapshotFolder():
+    from GlyphsApp import GSGlyphsInfo
+
+    folder = os.path.join(GSGlyphsInfo.applicationSupportPath(), "Font Snapshots")
+    if not os.path.exists(folder):
+        os.makedirs(folder)
+    return folder
+
+
+def replaceAtomically(path, writeFile):
+    """Write through writeFile(file) into a temporary file next to path, then rename it into place."""
+    with tempfile.NamedTemporaryFile("wb", dir=os.path.dirname(path), suffix=".tmp", delete=False) as file:
+        tempPath = file.name
+        try:
+            writeFile(file)
+        except BaseException:
+            file.close()
+            os.remove(tempPath)
+            raise
+    os.replace(tempPath, path)
+
+
+class FontSnapshot(object):
+    def __init__(self, fontPath=None):
+        self.fontPath = fontPath
+        self.glyphs = {}  # glyph name: GlyphRecord, in glyph order after refresh()
+        self.changed = False  # records changed since the snapshot was loaded or saved
+
+    def glyphRecord(self, glyph):
+        """Record of a glyph, read again through the bridge only if the glyph changed since it was read."""
+        stamp = str(glyph.lastChange)
+        record = self.glyphs.get(glyph.name)
+        if record is None or record.lastChange != stamp:
+            record = GlyphRecord.fromGlyph(glyph, stamp)
+            self.glyphs[glyph.name] = record
+            self.changed = True
+        return record
+
+    def refresh(self, font):
+        """Bring the records of all glyphs up to date; returns the names of the glyphs that changed, were added or removed."""
+        changedNames = set()
+        glyphOrder = []
+        for glyph in font.glyphs:
+            glyphOrder.append(glyph.name)
+            oldRecord = self.glyphs.get(glyph.name)
+            if self.glyphRecord(glyph) is not oldRecord:
+                changedNames.add(glyph.name)
+        removedNames = set(self.glyphs) - set(glyphOrder)
+        if removedNames:
+            changedNames |= removedNames
+            self.changed = True
+        if removedNames or list(self.glyphs) != glyphOrder:
+            self.glyphs = {name: self.glyphs[name] for name in glyphOrder}
+        return changedNames
+
+    # Files
+
+    def filePaths(self, folder):
+        """Metadata and node type files of the snapshot, named after the font path."""
+        baseName = os.path.join(folder, hashlib.sha1(self.fontPath.encode("utf-8")).hexdigest())
+        return baseName + ".json", baseName + ".types.npy"
+
+    def save(self, folder=None):
+        """Write the snapshot to disk if it changed; the node types of all layers go into one buffer.
+        This rewrites the whole snapshot, call it once at the end of a session with the font, not per edit."""
+        if not self.changed or not self.fontPath or numpy is None or not os.path.exists(self.fontPath):
+            return
+        metadataPath, typesPath = self.filePaths(folder or snapshotFolder())
+        glyphs = []
+        types = []
+        offset = 0
+        for record in self.glyphs.values():
+            layers = []
+            for layer in record.layers.values():
+                layers.append([layer.layerId, layer.name, layer.isMaster, list(layer.components), layer.pathCount, offset, len(layer.types)])
+                types.append(numpy.asarray(layer.types, dtype=numpy.uint8))
+                offset += len(layer.types)
+            glyphs.append([record.name, record.leftKerningGroup, record.rightKerningGroup, record.export, record.lastChange, layers])
+
+        metadata = {
+            "version": SNAPSHOT_VERSION,
+            "fontPath": self.fontPath,
+            "modificationTime": os.path.getmtime(self.fontPath),
+            "glyphs": glyphs,
+        }
+        replaceAtomically(typesPath, lambda file: numpy.save(file, numpy.concatenate(types) if types else numpy.zeros(0, dtype=numpy.uint8)))
+        replaceAtomically(metadataPath, lambda file: file.write(json.dumps(metadata).encode("utf-8")))
+        self.changed = False
+
+    @classmethod
+    def load(cls, fontPath, folder=None):
+        """The saved snapshot of a font file, None if there is none or the font file was modified since.
+        Node types are memory-mapped views, nothing is read before it is used."""
+        snapshot = cls(fontPath)
+        if numpy is None or not os.path.exists(fontPath):
+            return None
+        metadataPath, typesPath = snapshot.filePaths(folder or snapshotFolder())
+        try:
+            with open(metadataPath, "r", encoding="utf-8") as file:
+                metadata = json.load(file)
+            if metadata["version"] != SNAPSHOT_VERSION or metadata["fontPath"] != fontPath or metadata["modificationTime"] != os.path.getmtime(fontPath):
+                return None
+            types = numpy.load(typesPath, mmap_mode="r")
+        except (OSError, KeyError, TypeError, ValueError):
+            return None
+
+        for name, leftKerningGroup, rightKerningGroup, export, lastChange, layers in metadata["glyphs"]:
+            snapshot.glyphs[name] = GlyphRecord(name, leftKerningGroup, rightKerningGroup, export, lastChange, {
+                layerId: LayerRecord(layerId, layerName, isMaster, tuple(components), pathCount, types[start:start + count])
+                for layerId, layerName, isMaster, components, pathCount, start, count in layers
+            })
+        return snapshot
+
+
+def fontSnapshot(font, complete=True):
+    """The snapshot of a font, kept in its tempData and loaded from disk when the font file is unchanged.
+    With complete, all glyphs are brought up to date; otherwise records are read as glyphRecord() asks for them."""
+    snapshot = font.tempData[TEMP_DATA_KEY]
+    if snapshot is None:
+        fontPath = font.filepath
+        snapshot = (FontSnapshot.load(fontPath) if fontPath else None) or FontSnapshot(fontPath)
+        font.tempData[TEMP_DATA_KEY] = snapshot
+    if complete:
+        snapshot.refresh(font)
+    return snapshot
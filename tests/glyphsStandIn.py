@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+Stand-ins for the Glyphs objects the shared helpers (rbHelpers) read, and a synthetic font of any size.
+Only the attributes the helpers use are there: glyph names, kerning groups, lastChange, layers with
+paths, node types and components, and the font’s tempData and file path. Nothing of the app is imitated,
+timings taken on these objects measure the helpers’ own Python work, not the Objective-C bridge.
+"""
+
+import itertools
+
+
+class TempData(dict):
+    """font.tempData: missing keys read as None."""
+
+    def __getitem__(self, key):
+        return self.get(key)
+
+
+class Node(object):
+    def __init__(self, x, y, type="line"):
+        self.x, self.y, self.type = x, y, type
+
+
+class Path(object):
+    def __init__(self, nodes):
+        self.nodes = nodes
+
+
+class Component(object):
+    def __init__(self, name, transform=(1, 0, 0, 1, 0, 0)):
+        self.name = name
+        self.transform = transform
+
+
+class Layer(object):
+    def __init__(self, layerId, name, isMasterLayer=True, paths=(), components=()):
+        self.layerId = layerId
+        self.name = name
+        self.isMasterLayer = isMasterLayer
+        self.paths = list(paths)
+        self.components = list(components)
+        self.parent = None
+
+
+class Glyph(object):
+    _changes = itertools.count(1)
+
+    def __init__(self, name, layers, leftKerningGroup=None, rightKerningGroup=None, export=True):
+        self.name = name
+        self.leftKerningGroup = leftKerningGroup
+        self.rightKerningGroup = rightKerningGroup
+        self.export = export
+        self.layers = []
+        for layer in layers:
+            self.addLayer(layer)
+        self.lastChange = next(Glyph._changes)
+
+    def addLayer(self, layer):
+        layer.parent = self
+        self.layers.append(layer)
+        self.touch()
+
+    def touch(self):
+        """Mark the glyph as edited, as Glyphs does by updating lastChange."""
+        self.lastChange = next(Glyph._changes)
+
+
+class GlyphList(list):
+    """font.glyphs: a list that can also be indexed by glyph name (None if there is no such glyph)."""
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return next((glyph for glyph in self if glyph.name == key), None)
+        return list.__getitem__(self, key)
+
+
+class Font(object):
+    def __init__(self, glyphs, masterIds, filepath=None):
+        self.glyphs = GlyphList(glyphs)
+        self.masterIds = masterIds
+        self.filepath = filepath
+        self.tempData = TempData()
+
+
+def outline(size):
+    """A closed path with lines and one curve; size varies the node count between glyphs."""
+    nodes = [Node(0, 0), Node(100, 0)]
+    for i in range(size):
+        nodes.extend((Node(100, 10 * i, "offcurve"), Node(90, 10 * i + 5, "offcurve"), Node(80, 10 * i + 10, "curve")))
+    nodes.append(Node(0, 100))
+    return Path(nodes)
+
+
+def syntheticFont(glyphCount, masterCount=2, filepath=None):
+    """A font of glyphCount glyphs on masterCount masters. Every fourth glyph is a composite of the two glyphs
+    before it; every eighth also uses the composite before it (nested) and has a brace layer.
+    Glyphs share kerning groups in runs of five."""
+    masterIds = ["m%i" % i for i in range(masterCount)]
+    glyphs = []
+    for i in range(glyphCount):
+        name = "glyph%05i" % i
+        layers = []
+        for masterId in masterIds + (["brace%i" % i] if i % 8 == 7 else []):
+            isMaster = masterId in masterIds
+            if i % 4 == 3:
+                baseNames = [glyphs[i - 1].name, glyphs[i - 2].name] + ([glyphs[i - 4].name] if i % 8 == 7 else [])
+                layer = Layer(masterId, masterId, isMaster, components=[Component(baseName) for baseName in baseNames])
+            else:
+                layer = Layer(masterId, masterId, isMaster, paths=[outline(i % 7), outline(1)])
+            layers.append(layer)
+        group = "group%i" % (i // 5)
+        glyphs.append(Glyph(name, layers, leftKerningGroup=group, rightKerningGroup=group))
+    return Font(glyphs, masterIds, filepath)
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks of the shared helpers (rbHelpers) on synthetic fonts of growing size, with pytest-benchmark.
+The peak memory of one run is recorded in the extra info of each benchmark.
+The stand-in objects are plain Python, so these track the helpers’ own work (graph updates, snapshot refreshes,
+array building, file writes), not the object bridge to Glyphs.
+
+    python -m pytest tests/test_benchmarks.py --benchmark-only
+    python -m pytest tests/test_benchmarks.py --benchmark-only --benchmark-save=baseline
+    python -m pytest tests/test_benchmarks.py --benchmark-only --benchmark-compare
+"""
+
+import os
+import sys
+import tracemalloc
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+
+from glyphsStandIn import syntheticFont
+from rbHelpers import ComponentGraph, FontSnapshot, replaceIfChanged
+
+GLYPH_COUNTS = [1000, 10000]
+MASTER_COUNTS = [2, 8]
+
+
+def peakMemory(function, *args):
+    """Peak memory in bytes allocated while running function once."""
+    tracemalloc.start()
+    try:
+        function(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.mark.parametrize("masterCount", MASTER_COUNTS)
+@pytest.mark.parametrize("glyphCount", GLYPH_COUNTS)
+def test_build_component_graph(benchmark, glyphCount, masterCount):
+    font = syntheticFont(glyphCount, masterCount)
+    benchmark.extra_info["peakMemory"] = peakMemory(ComponentGraph, font)
+    graph = benchmark(ComponentGraph, font)
+    assert graph.dependents("glyph00001")
+
+
+@pytest.mark.parametrize("glyphCount", GLYPH_COUNTS)
+def test_refresh_component_graph_after_one_edit(benchmark, glyphCount):
+    font = syntheticFont(glyphCount)
+    graph = ComponentGraph(font)
+
+    def editAndRefresh():
+        font.glyphs[glyphCount // 2].touch()
+        return graph.refresh()
+
+    benchmark(editAndRefresh)
+
+
+@pytest.mark.parametrize("glyphCount", GLYPH_COUNTS)
+def test_component_graph_queries(benchmark, glyphCount):
+    font = syntheticFont(glyphCount)
+    graph = ComponentGraph(font)
+    names = [glyph.name for glyph in font.glyphs[::50]]
+
+    def query():
+        graph.dependentsCache.clear()
+        graph.orderCache = None
+        return graph.affectedGlyphs(names), graph.topologicalOrder()
+
+    benchmark(query)
+
+
+@pytest.mark.parametrize("masterCount", MASTER_COUNTS)
+@pytest.mark.parametrize("glyphCount", GLYPH_COUNTS)
+def test_snapshot_first_refresh(benchmark, glyphCount, masterCount):
+    font = syntheticFont(glyphCount, masterCount)
+    benchmark.extra_info["peakMemory"] = peakMemory(FontSnapshot().refresh, font)
+    benchmark(lambda: FontSnapshot().refresh(font))
+
+
+@pytest.mark.parametrize("glyphCount", GLYPH_COUNTS)
+def test_snapshot_refresh_after_one_edit(benchmark, glyphCount):
+    font = syntheticFont(glyphCount)
+    snapshot = FontSnapshot()
+    snapshot.refresh(font)
+
+    def editAndRefresh():
+        font.glyphs[glyphCount // 2].touch()
+        return snapshot.refresh(font)
+
+    benchmark(editAndRefresh)
+
+
+@pytest.mark.parametrize("glyphCount", GLYPH_COUNTS)
+def test_snapshot_save_and_load(benchmark, tmp_path, glyphCount):
+    pytest.importorskip("numpy")
+    fontPath = tmp_path / "Family.glyphs"
+    fontPath.write_text("{}")
+    font = syntheticFont(glyphCount, filepath=str(fontPath))
+    snapshot = FontSnapshot(str(fontPath))
+    snapshot.refresh(font)
+
+    def saveAndLoad():
+        snapshot.changed = True
+        snapshot.save(str(tmp_path))
+        return FontSnapshot.load(str(fontPath), str(tmp_path))
+
+    benchmark.extra_info["peakMemory"] = peakMemory(saveAndLoad)
+    assert benchmark(saveAndLoad) is not None
+
+
+@pytest.mark.parametrize("size", [100 * 1024, 4 * 1024 * 1024])
+def test_replace_unchanged_file(benchmark, tmp_path, size):
+    finalPath = str(tmp_path / "Family-Regular.otf")
+    content = os.urandom(size)
+
+    def writeFile(tempPath):
+        with open(tempPath, "wb") as file:
+            file.write(content)
+
+    replaceIfChanged(finalPath, writeFile)
+    assert benchmark(replaceIfChanged, finalPath, writeFile) is False
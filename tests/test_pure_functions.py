@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the functions of the scripts that do not need Glyphs.
+The scripts import GlyphsApp and vanilla and run when loaded, so only their imports, constants and
+function definitions are executed here; optional dependencies fall back as they do in Glyphs.
+
+    python -m pytest tests
+"""
+
+import ast
+import os
+
+import pytest
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_MODULES = ("GlyphsApp", "vanilla", "AppKit", "Foundation", "PyObjCTools", "objc", "rbHelpers")
+
+
+def isAppImport(node):
+    if isinstance(node, ast.Import):
+        return any(alias.name.split(".")[0] in APP_MODULES for alias in node.names)
+    if isinstance(node, ast.ImportFrom):
+        return (node.module or "").split(".")[0] in APP_MODULES
+    return False
+
+
+def loadScript(relativePath, classNames=()):
+    """Namespace with the imports, constants and functions (and the given classes) of a script."""
+    with open(os.path.join(REPO, relativePath), encoding="utf-8") as scriptFile:
+        tree = ast.parse(scriptFile.read())
+    kept = []
+    for node in tree.body:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            if not isAppImport(node):
+                kept.append(node)
+        elif isinstance(node, ast.Try):
+            # optional imports: try/except ImportError
+            if not any(isAppImport(child) for child in node.body):
+                kept.append(node)
+        elif isinstance(node, ast.Assign):
+            names = [name for target in node.targets for name in (target.elts if isinstance(target, ast.Tuple) else [target])]
+            if all(isinstance(name, ast.Name) and name.id.isupper() for name in names):
+                kept.append(node)
+        elif isinstance(node, ast.FunctionDef):
+            kept.append(node)
+        elif isinstance(node, ast.ClassDef) and node.name in classNames:
+            kept.append(node)
+    namespace = {"__name__": "scriptUnderTest"}
+    exec(compile(ast.Module(body=kept, type_ignores=[]), relativePath, "exec"), namespace)
+    return namespace
+
+
+class Axis(object):
+    def __init__(self, name, axisTag, axisId):
+        self.name = name
+        self.axisTag = axisTag
+        self.axisId = axisId
+
+
+# Set Intermediate Layer
+
+@pytest.fixture(scope="module")
+def intermediateLayer():
+    return loadScript("Glyph/Set Intermediate Layer.py", classNames=("GlyphInterpolator",))
+
+
+AXES = [Axis("Weight", "wght", "A1"), Axis("Width", "wdth", "A2")]
+
+
+def test_parseLocations_bare_number_sets_first_axis(intermediateLayer):
+    locations, invalidLines = intermediateLayer["parseLocations"]("500\n\n  650  ", AXES)
+    assert locations == [{"A1": 500.0}, {"A1": 650.0}]
+    assert invalidLines == []
+
+
+def test_parseLocations_axis_names_and_tags(intermediateLayer):
+    locations, invalidLines = intermediateLayer["parseLocations"]("wght=800, Width=75", AXES)
+    assert locations == [{"A1": 800.0, "A2": 75.0}]
+    assert invalidLines == []
+
+
+def test_parseLocations_grid(intermediateLayer):
+    locations, invalidLines = intermediateLayer["parseLocations"]("wght=300 700, wdth=75 100", AXES)
+    assert locations == [{"A1": 300.0, "A2": 75.0}, {"A1": 300.0, "A2": 100.0}, {"A1": 700.0, "A2": 75.0}, {"A1": 700.0, "A2": 100.0}]
+    assert invalidLines == []
+
+
+def test_parseLocations_invalid_lines(intermediateLayer):
+    locations, invalidLines = intermediateLayer["parseLocations"]("opsz=12\nwght=bold\nwght=400", AXES)
+    assert locations == [{"A1": 400.0}]
+    assert invalidLines == ["opsz=12", "wght=bold"]
+
+
+def test_normalize_is_clamped(intermediateLayer):
+    interpolator = intermediateLayer["GlyphInterpolator"].__new__(intermediateLayer["GlyphInterpolator"])
+    interpolator.axisRanges = {"A1": (100, 400, 900), "A2": (75, 100, 100)}
+    assert interpolator.normalize({"A1": 400, "A2": 100}) == {"A1": 0.0, "A2": 0.0}
+    assert interpolator.normalize({"A1": 250, "A2": 75}) == {"A1": -0.5, "A2": -1.0}
+    assert interpolator.normalize({"A1": 1000, "A2": 125}) == {"A1": 1.0, "A2": 0.0}
+    assert interpolator.normalize({"A1": 0}) == {"A1": -1.0}
+    assert interpolator.inRange({"A1": 900, "A2": 75})
+    assert not interpolator.inRange({"A1": 1000})
+
+
+def test_roundToGrid_rounds_coordinates_not_scales(intermediateLayer):
+    numpy = intermediateLayer["numpy"]
+    if numpy is None:
+        pytest.skip("NumPy or fontTools is not installed")
+    structure = (((1, 1),), ("top",), ("acutecomb",))  # two nodes, one anchor, one component
+    values = numpy.array([10.4, 20.6, 30.5, 40.2, 250.7, 700.1, 0.95, 0.0, 0.0, 1.05, 12.6, -3.2, 500.4])
+    rounded = intermediateLayer["roundToGrid"](values, structure, 1)
+    assert rounded.tolist() == [10, 21, 30, 40, 251, 700, 0.95, 0.0, 0.0, 1.05, 13, -3, 500]
+    assert intermediateLayer["roundToGrid"](values, structure, 0) is values
+    assert intermediateLayer["roundToGrid"](values, structure, 5)[:2].tolist() == [10, 20]
+
+
+# Kerning Group Audit
+
+@pytest.fixture(scope="module")
+def kerningAudit():
+    return loadScript("Kerning/Kerning Group Audit.py")
+
+
+def test_pairPosSize_empty(kerningAudit):
+    assert kerningAudit["pairPosSize"]({}, {}, {}) == (6, 0)
+
+
+def test_pairPosSize_glyph_pairs(kerningAudit):
+    glyphOrder = {"A": 1, "V": 2, "W": 3}
+    size, subtables = kerningAudit["pairPosSize"]({("A", "V"): -50, ("A", "W"): -40, ("V", "A"): -50}, {}, glyphOrder)
+    # format 1: header, two pair sets, three pair value records, coverage of A and V
+    pairSets = (2 + 2 + 2 * (2 + 2)) + (2 + 2 + 1 * (2 + 2))
+    assert subtables == 1
+    assert size == 6 + 2 + 10 + pairSets + kerningAudit["coverageSize"]([1, 2])
+
+
+def test_pairPosSize_group_pairs_are_expanded_to_members(kerningAudit):
+    glyphOrder = {"A": 1, "Aacute": 2, "V": 3}
+    groups = {"@MMK_L_A": ["A", "Aacute"]}
+    expanded = kerningAudit["pairPosSize"]({("@MMK_L_A", "V"): -50}, groups, glyphOrder)
+    written = kerningAudit["pairPosSize"]({("A", "V"): -50, ("Aacute", "V"): -50}, {}, glyphOrder)
+    assert expanded == written
+
+
+def test_pairPosSize_class_pairs_are_split(kerningAudit):
+    glyphOrder = {}
+    groups = {}
+    matrix = {}
+    for i in range(300):
+        leftKey, rightKey = "@MMK_L_%i" % i, "@MMK_R_%i" % i
+        groups[leftKey] = ["left%i" % i]
+        groups[rightKey] = ["right%i" % i]
+        glyphOrder["left%i" % i] = len(glyphOrder)
+        glyphOrder["right%i" % i] = len(glyphOrder)
+    for i in range(300):
+        for j in range(300):
+            matrix[("@MMK_L_%i" % i, "@MMK_R_%i" % j)] = -10
+    size, subtables = kerningAudit["pairPosSize"](matrix, groups, glyphOrder)
+    # 301 × 301 class records of 2 bytes do not fit into one subtable
+    assert subtables > 1
+    assert size > 301 * 301 * 2
+
+
+def test_pairPosSize_glyph_pairs_are_split(kerningAudit):
+    # 200 left glyphs kerned against 100 right glyphs: 200 pair sets of 404 bytes do not fit into 64K
+    glyphOrder = {"glyph%i" % i: i for i in range(300)}
+    matrix = {("glyph%i" % left, "glyph%i" % right): -10 for left in range(200) for right in range(200, 300)}
+    size, subtables = kerningAudit["pairPosSize"](matrix, {}, glyphOrder)
+    assert subtables == 2
+    assert size > 200 * (2 + 2 + 100 * 4)
+
+
+def test_coverage_and_classdef_pick_the_smaller_format(kerningAudit):
+    assert kerningAudit["coverageSize"](range(100)) == 4 + 6  # one range
+    assert kerningAudit["coverageSize"]([1, 5, 9]) == 4 + 2 * 3  # glyph list
+    assert kerningAudit["classDefSize"]({}) == 4
+    assert kerningAudit["classDefSize"]({10: 1, 11: 1, 12: 2}) == min(6 + 2 * 3, 4 + 6 * 2)
+
+
+# Point Counter
+
+@pytest.fixture(scope="module")
+def pointCounter():
+    return loadScript("Path/Point Counter.py")
+
+
+@pytest.fixture(params=["numpy", "plain"])
+def pointCounterVariant(request, pointCounter, monkeypatch):
+    """Point Counter functions with NumPy if it is installed, and with the plain Python fallback."""
+    if request.param == "numpy":
+        if pointCounter["numpy"] is None:
+            pytest.skip("NumPy is not installed")
+    else:
+        monkeypatch.setitem(pointCounter, "numpy", None)
+    return pointCounter
+
+
+def test_countNodeTypes(pointCounterVariant):
+    LINE, CURVE, OFFCURVE = pointCounterVariant["LINE"], pointCounterVariant["CURVE"], pointCounterVariant["OFFCURVE"]
+    types = [LINE, OFFCURVE, OFFCURVE, CURVE, LINE, LINE, OFFCURVE, OFFCURVE, CURVE]
+    if pointCounterVariant["numpy"] is not None:
+        types = pointCounterVariant["numpy"].array(types, dtype=pointCounterVariant["numpy"].uint8)
+    assert pointCounterVariant["countNodeTypes"](types) == (3, 2, 4)
+
+
+def test_countNodeTypes_empty(pointCounterVariant):
+    types = [] if pointCounterVariant["numpy"] is None else pointCounterVariant["numpy"].zeros(0, dtype=pointCounterVariant["numpy"].uint8)
+    assert pointCounterVariant["countNodeTypes"](types) == (0, 0, 0)
+
+
+def test_heavyThreshold(pointCounterVariant):
+    heavyThreshold = pointCounterVariant["heavyThreshold"]
+    assert heavyThreshold([]) is None
+    assert heavyThreshold([120]) is None
+    assert heavyThreshold([100, 100, 100]) == pytest.approx(100)
+    # mean 150, population standard deviation 50
+    assert heavyThreshold([100, 200]) == pytest.approx(150 + pointCounterVariant["HEAVY_DEVIATIONS"] * 50)
+
+
+def test_runningThreshold_matches_heavyThreshold(pointCounterVariant):
+    values = [120, 80, 95, 400, 110, 101]
+    total, squares = sum(values), sum(value * value for value in values)
+    assert pointCounterVariant["runningThreshold"](len(values), total, squares) == pytest.approx(pointCounterVariant["heavyThreshold"](values))
+    assert pointCounterVariant["runningThreshold"](1, 120, 120 * 120) is None
+
+
+def test_heavyIndex(pointCounter):
+    values = [(10, ("a", "m1")), (20, ("b", "m1")), (20, ("c", "m1")), (35, ("d", "m1"))]
+    assert pointCounter["heavyIndex"](values, None) == 4
+    assert pointCounter["heavyIndex"](values, 19.5) == 1
+    assert pointCounter["heavyIndex"](values, 20) == 3
+    assert pointCounter["heavyIndex"](values, 5) == 0
+
+
+def test_updateByteColumns_keeps_totals_and_flags_in_step():
+    namespace = loadScript("Path/Point Counter.py", classNames=("PointCounter",))
+    counter = namespace["PointCounter"].__new__(namespace["PointCounter"])
+    rows = [{"glyf bytes": 100, "CFF bytes": 50, "Heavy": ""} for i in range(20)]
+    counter.rowIndex = {("glyph%i" % i, "m1"): i for i in range(20)}
+    counter.rows = rows
+    counter.totals, counter.squares, counter.thresholds = {}, {}, {}
+    counter.w = type("Window", (), {"profileBytes": type("CheckBox", (), {"get": lambda self: True})()})()  # byte columns on
+    counter.flagHeavyGlyphs()
+    assert counter.heavyCount == 0
+
+    # One glyph gets much heavier: it is flagged, totals follow without a recount
+    newRow = {"glyf bytes": 2000, "CFF bytes": 50, "Heavy": ""}
+    key = ("glyph3", "m1")
+    keys = counter.updateByteColumns([(key, rows[3], newRow)])
+    rows[3] = newRow
+    for changedKey in keys:
+        counter.flagRow(rows[counter.rowIndex[changedKey]])
+    assert counter.totals["glyf bytes"] == 19 * 100 + 2000
+    assert rows[3]["Heavy"] == "glyf"
+    assert counter.heavyCount == 1
+
+    # Same result as counting from scratch
+    totals, thresholds = dict(counter.totals), dict(counter.thresholds)
+    counter.flagHeavyGlyphs()
+    assert counter.totals == totals
+    assert counter.thresholds == pytest.approx(thresholds)
+    assert counter.heavyCount == 1
+
+
+# Same Kerning Groups
+
+def test_buildGroupIndex_skips_glyphs_without_groups():
+    buildGroupIndex = loadScript("Kerning/Same Kerning Groups.py")["buildGroupIndex"]
+    index = buildGroupIndex(["A", "Aacute", "V", "space"], ["A", "A", "V", None], ["A", "A", "V", ""])
+    assert index == {"left": {"A": ["A", "Aacute"], "V": ["V"]}, "right": {"A": ["A", "Aacute"], "V": ["V"]}}
@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the shared helpers (rbHelpers), on the stand-in objects of glyphsStandIn.
+
+    python -m pytest tests
+"""
+
+import os
+import sys
+
+import pytest
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+
+from glyphsStandIn import Component, Glyph, Layer, outline, syntheticFont
+from rbHelpers import ComponentGraph, FontSnapshot, componentGraph, fontSnapshot, replaceIfChanged
+
+
+def addGlyph(font, name, *baseNames):
+    """Add a glyph to the font, a composite of baseNames on every master (outlines without)."""
+    layers = []
+    for masterId in font.masterIds:
+        if baseNames:
+            layers.append(Layer(masterId, masterId, components=[Component(baseName) for baseName in baseNames]))
+        else:
+            layers.append(Layer(masterId, masterId, paths=[outline(1)]))
+    glyph = Glyph(name, layers)
+    font.glyphs.append(glyph)
+    return glyph
+
+
+# Component graph
+
+@pytest.fixture
+def accentFont():
+    font = syntheticFont(0)
+    for name in ("A", "E", "acutecomb", "dieresiscomb", "ogonekcomb"):
+        addGlyph(font, name)
+    addGlyph(font, "Aacute", "A", "acutecomb")
+    addGlyph(font, "Eogonek", "E", "ogonekcomb")
+    addGlyph(font, "Eogonekacute", "Eogonek", "acutecomb")
+    return font
+
+
+def test_componentGraph_direct_and_nested(accentFont):
+    graph = ComponentGraph(accentFont)
+    assert graph.usedBy("acutecomb") == {"Aacute", "Eogonekacute"}
+    assert graph.uses("Eogonekacute") == {"Eogonek", "acutecomb"}
+    assert graph.dependents("E") == {"Eogonek", "Eogonekacute"}
+    assert graph.components("Eogonekacute") == {"Eogonek", "E", "ogonekcomb", "acutecomb"}
+    assert graph.affectedGlyphs({"ogonekcomb"}) == {"ogonekcomb", "Eogonek", "Eogonekacute"}
+
+
+def test_componentGraph_counts_edges_per_layer(accentFont):
+    graph = ComponentGraph(accentFont)
+    aacute = accentFont.glyphs["Aacute"]
+
+    # Removed from one master only: still used on the other one
+    aacute.layers[0].components = [Component("A")]
+    aacute.touch()
+    assert graph.refresh() == {"Aacute"}
+    assert "Aacute" in graph.usedBy("acutecomb")
+
+    aacute.layers[1].components = [Component("A")]
+    aacute.touch()
+    graph.refresh()
+    assert graph.usedBy("acutecomb") == {"Eogonekacute"}
+    assert graph.uses("Aacute") == {"A"}
+
+
+def test_componentGraph_invalidates_cached_dependents(accentFont):
+    graph = ComponentGraph(accentFont)
+    assert graph.dependents("E") == {"Eogonek", "Eogonekacute"}
+
+    # A new nested user, and a deleted one
+    addGlyph(accentFont, "Eogonekdieresis", "Eogonek", "dieresiscomb")
+    accentFont.glyphs.remove(accentFont.glyphs["Eogonekacute"])
+    assert graph.refresh() == {"Eogonekdieresis", "Eogonekacute"}
+    assert graph.dependents("E") == {"Eogonek", "Eogonekdieresis"}
+    assert graph.usedBy("acutecomb") == {"Aacute"}
+
+    # Edits that do not touch components are not reported
+    accentFont.glyphs["Aacute"].touch()
+    assert graph.refresh() == set()
+
+
+def test_componentGraph_topological_order_and_cycles(accentFont):
+    graph = ComponentGraph(accentFont)
+    order = graph.topologicalOrder()
+    assert sorted(order) == sorted(glyph.name for glyph in accentFont.glyphs)
+    for glyph in accentFont.glyphs:
+        for baseName in graph.uses(glyph.name):
+            assert order.index(baseName) < order.index(glyph.name)
+    assert graph.topologicalOrder(["Eogonekacute", "E", "Eogonek"]) == ["E", "Eogonek", "Eogonekacute"]
+
+    # A component cycle does not stop the order, the glyphs in it come last
+    addGlyph(accentFont, "loopA", "loopB")
+    addGlyph(accentFont, "loopB", "loopA")
+    graph.refresh()
+    assert graph.topologicalOrder()[-2:] == ["loopA", "loopB"]
+    assert graph.dependents("loopA") == {"loopA", "loopB"}
+
+
+def test_componentGraph_is_kept_in_tempData(accentFont):
+    graph = componentGraph(accentFont)
+    assert componentGraph(accentFont) is graph
+    addGlyph(accentFont, "Adieresis", "A", "dieresiscomb")
+    assert "Adieresis" in componentGraph(accentFont).dependents("A")
+
+
+def test_componentGraph_from_snapshot_matches(accentFont):
+    snapshot = FontSnapshot()
+    snapshot.refresh(accentFont)
+    fromSnapshot, fromGlyphs = ComponentGraph(accentFont, snapshot), ComponentGraph(accentFont)
+    assert dict(fromSnapshot.users) == dict(fromGlyphs.users)
+    assert fromSnapshot.topologicalOrder() == fromGlyphs.topologicalOrder()
+
+
+# Font snapshot
+
+def test_snapshot_refresh_reads_only_changed_glyphs():
+    font = syntheticFont(40)
+    snapshot = FontSnapshot()
+    assert snapshot.refresh(font) == {glyph.name for glyph in font.glyphs}
+    assert snapshot.refresh(font) == set()
+
+    edited = font.glyphs[5]
+    record = snapshot.glyphs[edited.name]
+    edited.layers[0].paths.append(outline(2))
+    edited.touch()
+    removed = font.glyphs.pop(9)
+    assert snapshot.refresh(font) == {edited.name, removed.name}
+    assert snapshot.glyphs[edited.name] is not record
+    assert snapshot.glyphs[edited.name].layers["m0"].pathCount == 3
+    assert list(snapshot.glyphs) == [glyph.name for glyph in font.glyphs]
+
+
+def test_snapshot_records(accentFont):
+    snapshot = FontSnapshot()
+    snapshot.refresh(accentFont)
+    layer = snapshot.glyphs["Aacute"].layers["m0"]
+    assert layer.components == ("A", "acutecomb")
+    assert layer.isMaster
+    # one closed outline(1): two lines, two handles and a curve, and the closing line
+    assert list(snapshot.glyphs["A"].layers["m0"].types) == [1, 1, 3, 3, 2, 1]
+
+
+def test_snapshot_save_and_load(tmp_path):
+    numpy = pytest.importorskip("numpy")
+    fontPath = tmp_path / "Family.glyphs"
+    fontPath.write_text("{}")
+    font = syntheticFont(30, filepath=str(fontPath))
+    snapshot = FontSnapshot(str(fontPath))
+    snapshot.refresh(font)
+    snapshot.save(str(tmp_path))
+    assert not snapshot.changed
+
+    loaded = FontSnapshot.load(str(fontPath), str(tmp_path))
+    assert list(loaded.glyphs) == list(snapshot.glyphs)
+    for name, record in snapshot.glyphs.items():
+        loadedRecord = loaded.glyphs[name]
+        assert (loadedRecord.leftKerningGroup, loadedRecord.lastChange) == (record.leftKerningGroup, record.lastChange)
+        for layerId, layer in record.layers.items():
+            assert loadedRecord.layers[layerId].components == layer.components
+            assert numpy.array_equal(loadedRecord.layers[layerId].types, layer.types)
+
+    # Nothing changed since: the loaded snapshot reads no glyph again
+    assert loaded.refresh(font) == set()
+
+    # Saving the font file makes the snapshot stale
+    os.utime(fontPath, (0, 0))
+    assert FontSnapshot.load(str(fontPath), str(tmp_path)) is None
+
+
+def test_fontSnapshot_is_kept_in_tempData():
+    font = syntheticFont(10)
+    snapshot = fontSnapshot(font)
+    assert len(snapshot.glyphs) == 10
+    font.glyphs[0].touch()
+    assert fontSnapshot(font) is snapshot
+    assert fontSnapshot(font, complete=False).refresh(font) == set()
+
+
+# Export files
+
+def test_replaceIfChanged(tmp_path):
+    finalPath = str(tmp_path / "Family-Regular.woff2")
+
+    def writer(content):
+        def writeFile(tempPath):
+            with open(tempPath, "wb") as file:
+                file.write(content)
+        return writeFile
+
+    assert replaceIfChanged(finalPath, writer(b"first"))
+    modified = os.stat(finalPath).st_mtime_ns
+    os.utime(finalPath, ns=(modified - 10 ** 9, modified - 10 ** 9))
+
+    # Same content: the file is left in place
+    assert not replaceIfChanged(finalPath, writer(b"first"))
+    assert os.stat(finalPath).st_mtime_ns == modified - 10 ** 9
+
+    assert replaceIfChanged(finalPath, writer(b"second"))
+    with open(finalPath, "rb") as file:
+        assert file.read() == b"second"
+    assert os.listdir(tmp_path) == ["Family-Regular.woff2"]
+
+
+def test_replaceIfChanged_cleans_up_after_errors(tmp_path):
+    finalPath = str(tmp_path / "Family-Regular.otf")
+
+    def failingWrite(tempPath):
+        with open(tempPath, "wb") as file:
+            file.write(b"half")
+        raise OSError("disk full")
+
+    with pytest.raises(OSError):
+        replaceIfChanged(finalPath, failingWrite)
+    assert os.listdir(tmp_path) == []
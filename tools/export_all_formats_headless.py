@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+from __future__ import division, print_function, unicode_literals
+import os
+import sys
+import shutil
+import argparse
+import importlib.util
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+__doc__ = """
+Export to all formats without Glyphs (command line, e.g. on a Linux build machine).
+Reads .glyphs/.glyphspackage files with glyphsLib and compiles them with fontmake,
+using the same formats and folder layout as “Export To All Formats with Options”.
+Glyphs lists every .py file of the Scripts folder, this one too (under tools); chosen from the Scripts menu,
+it only prints how to run it, without touching Glyphs’ own arguments.
+Only needs glyphsLib, fontmake and fontTools, nothing from this repository (no rbHelpers), so it runs from any directory.
+
+    python tools/export_all_formats_headless.py MyFamily.glyphs Other.glyphspackage -o fonts -j 4
+"""
+
+FORMATS = ("OTF", "TTF", "WEB", "Variable")
+
+
+def createSubfolder(parentPath, subfolderName):
+    """Create subfolder if it doesn't exist."""
+    folderPath = os.path.join(parentPath, subfolderName)
+    if not os.path.exists(folderPath):
+        os.makedirs(folderPath)
+    return folderPath
+
+
+def moveFonts(sourceFolder, extension, destinationFolder):
+    """Move the compiled fonts with the given extension into place, return their new paths."""
+    movedPaths = []
+    for fileName in sorted(os.listdir(sourceFolder)):
+        if fileName.endswith(extension):
+            movedPaths.append(shutil.move(os.path.join(sourceFolder, fileName), os.path.join(destinationFolder, fileName)))
+    return movedPaths
+
+
+def wrapWebFonts(fontPaths, webPaths):
+    """Write a WOFF and WOFF2 file for every compiled font, without compiling again."""
+    from fontTools.ttLib import TTFont
+
+    for fontPath in fontPaths:
+        baseName = os.path.splitext(os.path.basename(fontPath))[0]
+        compiledFont = TTFont(fontPath)
+        for container, folder in webPaths.items():
+            compiledFont.flavor = container.lower()
+            compiledFont.save(os.path.join(folder, f"{baseName}.{compiledFont.flavor}"))
+        compiledFont.close()
+
+
+def exportFont(sourcePath, exportPath, formats, useSubfolders=True, autohint=False, removeOverlaps=True, psOutlines=True):
+    """Export one .glyphs/.glyphspackage file in the chosen formats. Returns a summary line."""
+    import glyphsLib
+    from fontmake.font_project import FontProject
+
+    familyName = glyphsLib.GSFont(sourcePath).familyName
+    fontExportPath = createSubfolder(exportPath, familyName)
+    scratchFolder = tempfile.mkdtemp(prefix="ExportToAllFormats-")
+    options = {
+        "remove_overlaps": removeOverlaps,
+        "autohint": "" if autohint else None,
+        "master_dir": os.path.join(scratchFolder, "master_ufo"),
+        "instance_dir": os.path.join(scratchFolder, "instance_ufo"),
+    }
+
+    try:
+        # Compile each static outline flavor once; the web fonts are wrapped from the same binaries
+        webFormat = "otf" if psOutlines else "ttf"
+        staticOutputs = []
+        if "OTF" in formats or ("WEB" in formats and webFormat == "otf"):
+            staticOutputs.append("otf")
+        if "TTF" in formats or ("WEB" in formats and webFormat == "ttf"):
+            staticOutputs.append("ttf")
+
+        staticFolder = os.path.join(scratchFolder, "static")
+        if staticOutputs:
+            FontProject().run_from_glyphs(sourcePath, output=staticOutputs, output_dir=staticFolder, interpolate=True, **options)
+
+        # Export WEB (WOFF/WOFF2)
+        if "WEB" in formats:
+            woffPath = createSubfolder(fontExportPath, "WOFF") if useSubfolders else fontExportPath
+            woff2Path = createSubfolder(fontExportPath, "WOFF2") if useSubfolders else fontExportPath
+            webFonts = [os.path.join(staticFolder, f) for f in sorted(os.listdir(staticFolder)) if f.endswith("." + webFormat)]
+            wrapWebFonts(webFonts, {"WOFF": woffPath, "WOFF2": woff2Path})
+
+        # Export OTF and TTF
+        for formatType in ("OTF", "TTF"):
+            if formatType in formats:
+                instancePath = createSubfolder(fontExportPath, formatType) if useSubfolders else fontExportPath
+                moveFonts(staticFolder, "." + formatType.lower(), instancePath)
+
+        # Export Variable (as TTF, WOFF, and WOFF2)
+        if "Variable" in formats:
+            variablePathTTF = createSubfolder(fontExportPath, "Variable/TTF") if useSubfolders else fontExportPath
+            variablePathWOFF = createSubfolder(fontExportPath, "Variable/WOFF") if useSubfolders else fontExportPath
+            variablePathWOFF2 = createSubfolder(fontExportPath, "Variable/WOFF2") if useSubfolders else fontExportPath
+            variableFolder = os.path.join(scratchFolder, "variable")
+            FontProject().run_from_glyphs(sourcePath, output=["variable"], output_dir=variableFolder, **options)
+            variableFonts = moveFonts(variableFolder, ".ttf", variablePathTTF)
+            wrapWebFonts(variableFonts, {"WOFF": variablePathWOFF, "WOFF2": variablePathWOFF2})
+    finally:
+        shutil.rmtree(scratchFolder, ignore_errors=True)
+
+    return f"{os.path.basename(sourcePath)}: exported {', '.join(f for f in FORMATS if f in formats)} to {fontExportPath}"
+
+
+def runningInGlyphs():
+    """True inside Glyphs (e.g. chosen from the Scripts menu), where sys.argv is Glyphs’ own."""
+    return importlib.util.find_spec("GlyphsApp") is not None
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Export .glyphs/.glyphspackage files to all formats.")
+    parser.add_argument("sources", nargs="+", help=".glyphs or .glyphspackage files")
+    parser.add_argument("-o", "--output", help="export folder (default: the folder of each source file)")
+    parser.add_argument("-f", "--formats", nargs="+", choices=FORMATS, default=list(FORMATS), help="formats to export (default: all)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 2, help="number of fonts exported at once")
+    parser.add_argument("--no-subfolders", action="store_true", help="put all files into the family folder")
+    parser.add_argument("--autohint", action="store_true", help="autohint the fonts")
+    parser.add_argument("--keep-overlaps", action="store_true", help="do not remove overlaps")
+    parser.add_argument("--tt-outlines-for-web", action="store_true", help="export TT instead of PS outlines for WOFF/WOFF2")
+    args = parser.parse_args(arguments)
+
+    # Export all fonts at once, one process per font
+    with ProcessPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        futures = [
+            pool.submit(
+                exportFont,
+                os.path.abspath(sourcePath),
+                os.path.abspath(args.output or os.path.dirname(os.path.abspath(sourcePath))),
+                args.formats,
+                useSubfolders=not args.no_subfolders,
+                autohint=args.autohint,
+                removeOverlaps=not args.keep_overlaps,
+                psOutlines=not args.tt_outlines_for_web,
+            )
+            for sourcePath in args.sources
+        ]
+
+        # Report in the order the fonts were given
+        failed = 0
+        for sourcePath, future in zip(args.sources, futures):
+            try:
+                print(future.result())
+            except Exception as e:
+                failed += 1
+                print(f"{os.path.basename(sourcePath)}: export failed: {e}", file=sys.stderr)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    if runningInGlyphs():
+        print("Export all formats headless is a command line tool, run it in Terminal:\n    python tools/export_all_formats_headless.py MyFamily.glyphs -o fonts")
+    else:
+        sys.exit(main())